@@ -0,0 +1,62 @@
+"""One ``generate-batch`` run versus one ``shift-agent generate`` process per store.
+
+    python benchmarks/bench_batch.py --stores 20 --workers 1 2
+
+Every store is a small synthetic roster written to a temp directory, so most of the
+per-process cost is interpreter start-up and imports, which the batch pays once per
+worker.
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from shift_scheduling_agent.batch import load_jobs, solve_many
+from shift_scheduling_agent.config_io import save_config
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stores", type=int, default=20)
+    ap.add_argument("--employees", type=int, default=15)
+    ap.add_argument("--shifts", type=int, default=28)
+    ap.add_argument("--iterations", type=int, default=200)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1])
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "stores"
+        root.mkdir()
+        for k in range(args.stores):
+            config = synthetic_config(args.employees, args.shifts, shifts_per_day=4, seed=k)
+            save_config(config.with_solver(max_iterations=args.iterations), root / f"store{k:03d}.json")
+
+        t0 = time.perf_counter()
+        for path in sorted(root.iterdir()):
+            subprocess.run(
+                [sys.executable, "-m", "shift_scheduling_agent.cli", "generate", "--config", str(path),
+                 "--out", str(Path(tmp) / "single" / path.name)],
+                check=True,
+                capture_output=True,
+            )
+        t_single = time.perf_counter() - t0
+        print(f"{'per-process CLI':>16}: {t_single:7.2f} s ({args.stores / t_single:6.1f} stores/s)", flush=True)
+
+        for workers in args.workers:
+            t0 = time.perf_counter()
+            rows = list(solve_many(load_jobs(root), Path(tmp) / f"batch{workers}", workers=workers))
+            t_batch = time.perf_counter() - t0
+            solved = sum(r["status"] == "solved" for r in rows)
+            print(
+                f"{'batch x' + str(workers):>16}: {t_batch:7.2f} s ({args.stores / t_batch:6.1f} stores/s, {solved} solved)",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Throughput of ``ConstraintSuite.validate`` versus ``validate_batch`` on many candidates.
+
+    python benchmarks/bench_batch_validate.py --employees 200 --shifts 1000 --schedules 200
+
+Candidates are perturbations of one greedy schedule (a few random reassignments each),
+like the neighbourhood a search or an evaluation harness would score.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.solver import _greedy_construct
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _candidates(config, base, n, rnd):
+    eids = list(config.employees)
+    sids = [sid for sid, eids_ in base.assignments.items() if eids_]
+    out = []
+    for _ in range(n):
+        cand = base.copy()
+        for sid in rnd.sample(sids, min(10, len(sids))):
+            row = cand.assignments[sid]
+            e = rnd.choice(eids)
+            if e not in row:
+                row[rnd.randrange(len(row))] = e
+        out.append(cand)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=200)
+    ap.add_argument("--shifts", type=int, default=1000)
+    ap.add_argument("--schedules", type=int, default=200)
+    args = ap.parse_args()
+
+    config = synthetic_config(args.employees, args.shifts, seed=0)
+    base = _greedy_construct(config, random.Random(0))
+    schedules = _candidates(config, base, args.schedules, random.Random(1))
+    suite = ConstraintSuite.default()
+    suite.validate_batch(config, schedules[:1])  # build the shared encoding once
+
+    t0 = time.perf_counter()
+    scalar = [len(suite.validate(config, s).violations) for s in schedules]
+    t_scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = [r.total for r in suite.validate_batch(config, schedules)]
+    t_batch = time.perf_counter() - t0
+
+    assert scalar == batch
+    n = len(schedules)
+    print(f"validate       {n / t_scalar:10.1f} schedules/s")
+    print(f"validate_batch {n / t_batch:10.1f} schedules/s   ({t_scalar / t_batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
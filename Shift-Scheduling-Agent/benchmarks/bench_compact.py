@@ -0,0 +1,75 @@
+"""Per-move cost of copying a ``Schedule`` versus in-place ``CompactSchedule`` moves.
+
+    python benchmarks/bench_compact.py --employees 400 --shifts 2000 --moves 2000
+
+The copy path mirrors the previous swap loop (``Schedule.copy()`` plus two rebuilt
+lists per proposal); the compact path does two ``set`` calls and an ``undo``.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from shift_scheduling_agent.compact import CompactSchedule
+from shift_scheduling_agent.solver import _greedy_construct
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _copy_moves(schedule, pairs) -> None:
+    for s1, s2 in pairs:
+        a1, a2 = schedule.assignments[s1], schedule.assignments[s2]
+        if not a1 or not a2:
+            continue
+        e1, e2 = a1[0], a2[0]
+        cand = schedule.copy()
+        cand.assignments[s1] = [e2 if x == e1 else x for x in a1]
+        cand.assignments[s2] = [e1 if x == e2 else x for x in a2]
+
+
+def _compact_moves(compact, pairs) -> None:
+    for s1, s2 in pairs:
+        if not compact.count(s1) or not compact.count(s2):
+            continue
+        mark = compact.mark()
+        e1, e2 = compact.get(s1, 0), compact.get(s2, 0)
+        compact.set(s1, 0, e2)
+        compact.set(s2, 0, e1)
+        compact.undo(mark)
+
+
+def _measure(label, fn, *args) -> None:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(args[-1])
+    print(f"{label:<8} {elapsed / n * 1e6:10.1f} us/move   peak {peak / 1024:10.1f} KiB")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=400)
+    ap.add_argument("--shifts", type=int, default=2000)
+    ap.add_argument("--moves", type=int, default=2000)
+    args = ap.parse_args()
+
+    config = synthetic_config(args.employees, args.shifts, seed=0)
+    schedule = _greedy_construct(config, random.Random(0))
+    compact = CompactSchedule.from_schedule(config, schedule)
+
+    rnd = random.Random(1)
+    sids = list(config.shifts)
+    pairs = [tuple(rnd.sample(sids, 2)) for _ in range(args.moves)]
+    pos = compact.ids.shift_pos
+    int_pairs = [(pos[a], pos[b]) for a, b in pairs]
+
+    _measure("copy", _copy_moves, schedule, pairs)
+    _measure("compact", _compact_moves, compact, int_pairs)
+
+
+if __name__ == "__main__":
+    main()
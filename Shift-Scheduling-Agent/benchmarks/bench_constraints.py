@@ -0,0 +1,47 @@
+"""Full validation: one fused pass over all constraint specs versus one pass per spec.
+
+    python benchmarks/bench_constraints.py --employees 300 --shifts 3000 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.solver import _greedy_construct
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=300)
+    ap.add_argument("--shifts", type=int, default=3000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    config = synthetic_config(args.employees, args.shifts, shifts_per_day=12, seed=1)
+    schedule = _greedy_construct(config, random.Random(0))
+    suite = ConstraintSuite.default()
+    entries = suite.entries(config)
+    fused = suite.validate(config, schedule).violations
+    assert fused == [v for _, fn in entries for v in fn(config, schedule)]
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        for _, fn in entries:
+            fn(config, schedule)
+    t_separate = (time.perf_counter() - t0) / args.repeat
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        suite.validate(config, schedule)
+    t_fused = (time.perf_counter() - t0) / args.repeat
+
+    print(f"{len(config.shifts)} shifts, {len(entries)} constraints, {len(fused)} violations")
+    print(f"one pass per spec {t_separate * 1000:8.2f} ms")
+    print(f"fused             {t_fused * 1000:8.2f} ms   ({t_separate / t_fused:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
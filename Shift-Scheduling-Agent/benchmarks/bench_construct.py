@@ -0,0 +1,65 @@
+"""Regret construction versus the original greedy, before any search.
+
+    python benchmarks/bench_construct.py --seeds 5 --tightness 0.3 0.5 0.7
+
+For each synthetic roster both constructions run once; the table reports how many
+start schedules are already valid, the mean violation count and the mean time.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.construct import regret_construct
+from shift_scheduling_agent.flow import flow_construct
+from shift_scheduling_agent.solver import _greedy_construct
+from shift_scheduling_agent.synthetic import synthetic_config
+
+CONSTRUCTIONS = {"greedy": _greedy_construct, "regret": regret_construct, "flow": flow_construct}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=100)
+    ap.add_argument("--shifts", type=int, default=300)
+    ap.add_argument("--shifts-per-day", type=int, default=8)
+    ap.add_argument("--availability", type=float, default=0.8)
+    ap.add_argument("--tightness", type=float, nargs="+", default=[0.3, 0.5, 0.7])
+    ap.add_argument("--seeds", type=int, default=5)
+    args = ap.parse_args()
+
+    suite = ConstraintSuite.default()
+    print(f"{'tightness':>9} {'construct':>9} {'valid':>7} {'violations':>10} {'ms':>8}")
+    for tightness in args.tightness:
+        configs = [
+            synthetic_config(
+                args.employees,
+                args.shifts,
+                shifts_per_day=args.shifts_per_day,
+                available_days_ratio=args.availability,
+                tightness=tightness,
+                seed=seed,
+            )
+            for seed in range(args.seeds)
+        ]
+        for name, construct in CONSTRUCTIONS.items():
+            valid = violations = 0
+            seconds = 0.0
+            for seed, config in enumerate(configs):
+                t0 = time.perf_counter()
+                schedule = construct(config, random.Random(seed))
+                seconds += time.perf_counter() - t0
+                report = suite.validate(config, schedule)
+                valid += report.ok
+                violations += len(report.violations)
+            n = len(configs)
+            print(
+                f"{tightness:>9.2f} {name:>9} {valid:>3}/{n:<3} {violations / n:>10.1f} {1000 * seconds / n:>8.1f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
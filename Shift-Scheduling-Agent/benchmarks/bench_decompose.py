@@ -0,0 +1,50 @@
+"""Monolithic solve versus decomposition as the horizon grows.
+
+    python benchmarks/bench_decompose.py --sites 3 --weeks 1 2 4 8
+
+Each site is its own synthetic roster (own staff and skills), so the eligibility graph
+has one component per site. Search effort is held per shift (``--iterations-per-shift``);
+the decomposed run also rolls over weekly windows.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from shift_scheduling_agent.decompose import solve_decomposed
+from shift_scheduling_agent.scoring import score_schedule
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import multi_site_config
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sites", type=int, default=3)
+    ap.add_argument("--employees", type=int, default=60, help="Per site.")
+    ap.add_argument("--shifts-per-day", type=int, default=8)
+    ap.add_argument("--weeks", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--iterations-per-shift", type=float, default=1.0)
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'weeks':>5} {'shifts':>7} {'mono s':>8} {'ok':>5} {'score':>8} {'decomp s':>9} {'ok':>5} {'score':>8}")
+    for weeks in args.weeks:
+        config = multi_site_config(args.sites, args.employees, weeks * 7, shifts_per_day=args.shifts_per_day)
+        n = len(config.shifts)
+        config = config.with_solver(max_seconds=600.0, max_iterations=max(1, int(n * args.iterations_per_shift)))
+
+        t0 = time.perf_counter()
+        mono = solve(config)
+        t_mono = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        dec = solve_decomposed(config.with_solver(decompose=True, window_days=7), workers=args.workers)
+        t_dec = time.perf_counter() - t0
+        print(
+            f"{weeks:>5} {n:>7} {t_mono:8.2f} {mono.ok!s:>5} {score_schedule(config, mono.schedule).total:8.3f}"
+            f" {t_dec:9.2f} {dec.ok!s:>5} {score_schedule(config, dec.schedule).total:8.3f}",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
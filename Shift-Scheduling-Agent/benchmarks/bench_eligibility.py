@@ -0,0 +1,63 @@
+"""Greedy construction time with the eligibility index on a large synthetic roster.
+
+    python benchmarks/bench_eligibility.py --employees 5000 --shifts 10000
+
+The pre-index eligibility scan is O(shifts x employees x windows); it is timed on a
+sample of shifts and extrapolated (greedy construction called it twice per shift).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from shift_scheduling_agent.domain import Config
+from shift_scheduling_agent.eligibility import EligibilityIndex
+from shift_scheduling_agent.solver import _greedy_construct
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _legacy_eligible(config: Config, shift_id: str) -> list:
+    shift = config.shifts[shift_id]
+    out = []
+    for eid, emp in config.employees.items():
+        if shift.required_skills and not shift.required_skills.issubset(emp.skills):
+            continue
+        if not any(w.contains(shift.start, shift.end) for w in emp.availability):
+            continue
+        out.append(eid)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=5000)
+    ap.add_argument("--shifts", type=int, default=10000)
+    ap.add_argument("--legacy-sample", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    config = synthetic_config(args.employees, args.shifts, seed=args.seed)
+    print(f"generate config            {time.perf_counter() - t0:8.3f}s")
+
+    t0 = time.perf_counter()
+    EligibilityIndex.for_config(config)
+    print(f"build EligibilityIndex     {time.perf_counter() - t0:8.3f}s")
+
+    t0 = time.perf_counter()
+    schedule = _greedy_construct(config, random.Random(args.seed))
+    print(f"greedy construct (indexed) {time.perf_counter() - t0:8.3f}s")
+    print(f"  assigned slots           {sum(len(v) for v in schedule.assignments.values())}")
+
+    sample = list(config.shifts)[: args.legacy_sample]
+    t0 = time.perf_counter()
+    for sid in sample:
+        _legacy_eligible(config, sid)
+    per_call = (time.perf_counter() - t0) / max(1, len(sample))
+    print(f"legacy eligibility / shift {per_call * 1000:8.3f}ms")
+    print(f"legacy construct (est.)    {per_call * 2 * len(config.shifts):8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
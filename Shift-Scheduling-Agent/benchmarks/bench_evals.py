@@ -0,0 +1,66 @@
+"""Wall time of a 500-case eval dataset: serial per-case loading versus the harness.
+
+    python benchmarks/bench_evals.py --cases 500 --configs 25 --workers 4
+
+Cases are spread over ``--configs`` synthetic rosters and a few seeds each, like a
+dataset that checks several expectations against the same fixtures. The serial
+baseline is the previous harness loop (load_config + solve + validate per case).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from shift_scheduling_agent.config_io import load_config, save_config
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.evals.harness import load_cases, run_cases
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=500)
+    ap.add_argument("--configs", type=int, default=25)
+    ap.add_argument("--seeds", type=int, default=4, help="Distinct seeds drawn per config.")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.configs):
+            config = synthetic_config(30, 60, shifts_per_day=4, available_days_ratio=0.8, seed=i)
+            config = config.with_solver(max_iterations=200, max_seconds=10.0)
+            paths.append(Path(tmp) / f"c{i}.json")
+            save_config(config, paths[-1])
+        dataset = Path(tmp) / "cases.jsonl"
+        with dataset.open("w", encoding="utf-8") as f:
+            for i in range(args.cases):
+                case = {"id": f"case{i}", "config_path": str(rnd.choice(paths)), "seeds": [rnd.randrange(args.seeds)]}
+                f.write(json.dumps(case) + "\n")
+        cases = load_cases(dataset)
+
+        t0 = time.perf_counter()
+        for case in cases:
+            config = load_config(case.config_path).with_solver(random_seed=case.seeds[0])
+            ConstraintSuite.default().validate(config, solve(config).schedule)
+        t_serial = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        run_cases(cases, workers=args.workers)
+        t_harness = time.perf_counter() - t0
+
+    distinct = len({(c.config_path, c.seeds[0]) for c in cases})
+    print(f"{args.cases} cases, {distinct} distinct (config, seed) runs, {args.workers} worker(s)")
+    print(f"serial   {t_serial:8.2f} s")
+    print(f"harness  {t_harness:8.2f} s   ({t_serial / t_harness:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Min-cost-flow construction versus regret construction and the swap loop.
+
+    python benchmarks/bench_flow.py --employees 1000 --shifts 5000
+
+Each construction runs once per seed on a synthetic roster with preferences; the
+table reports valid starts, violations, score and time. ``swap`` is a full solve
+(regret start plus swap hill-climbing) given the time budget in ``--swap-seconds``.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import replace
+
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.construct import regret_construct
+from shift_scheduling_agent.flow import MinCostStaffing, flow_construct
+from shift_scheduling_agent.scoring import score_schedule
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _with_preferences(config, seed: int):
+    rnd = random.Random(seed)
+    shift_ids = list(config.shifts)
+    prefs = {
+        eid: {
+            "prefer_skill": [rnd.choice(("cashier", "stock", "lead", "deli"))],
+            "avoid_shift": rnd.sample(shift_ids, 3),
+        }
+        for eid in config.employees
+    }
+    return replace(config, preferences=replace(config.preferences, employee_shift_preferences=prefs))
+
+
+def _run(name: str, config, seed: int, swap_seconds: float):
+    if name == "regret":
+        return regret_construct(config, random.Random(seed))
+    if name == "flow":
+        return flow_construct(config, random.Random(seed))
+    return solve(config.with_solver(max_seconds=swap_seconds, max_iterations=10**9, random_seed=seed)).schedule
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=1000)
+    ap.add_argument("--shifts", type=int, default=5000)
+    ap.add_argument("--shifts-per-day", type=int, default=48)
+    ap.add_argument("--seeds", type=int, default=2)
+    ap.add_argument("--swap-seconds", type=float, default=30.0)
+    args = ap.parse_args()
+
+    suite = ConstraintSuite.default()
+    print(f"{'seed':>4} {'method':>8} {'valid':>5} {'violations':>10} {'score':>9} {'seconds':>8}")
+    for seed in range(args.seeds):
+        config = _with_preferences(
+            synthetic_config(args.employees, args.shifts, shifts_per_day=args.shifts_per_day, seed=seed), seed
+        )
+        t0 = time.perf_counter()
+        MinCostStaffing(config).solve()
+        print(f"{seed:>4} {'mcf only':>8} {'':>5} {'':>10} {'':>9} {time.perf_counter() - t0:>8.2f}", flush=True)
+        for name in ("regret", "flow", "swap"):
+            t0 = time.perf_counter()
+            schedule = _run(name, config, seed, args.swap_seconds)
+            seconds = time.perf_counter() - t0
+            report = suite.validate(config, schedule)
+            score = score_schedule(config, schedule).total
+            print(
+                f"{seed:>4} {name:>8} {'yes' if report.ok else 'no':>5} {len(report.violations):>10} "
+                f"{score:>9.2f} {seconds:>8.2f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Load time and peak RSS of the config loaders on a large synthetic roster.
+
+    python benchmarks/bench_loader.py --shifts 1000000 --employees 2000 --shifts-per-day 2740
+
+Each loader runs in a fresh child process so peak RSS is its own. ``legacy`` mirrors
+the previous loader (``json.loads`` of the whole file, ``fromisoformat`` and a new set
+per record); ``eager``/``stream`` are ``load_config(stream=False/True)``; ``csv``
+streams the same shifts from a CSV side file.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_TEMPLATES = ((6, 8), (9, 8), (14, 8), (17, 6))
+_SKILLS = ("cashier", "stock", "lead", "deli")
+
+
+def _write_inputs(directory: Path, n_employees: int, n_shifts: int, per_day: int) -> None:
+    start = datetime(2026, 1, 5)
+    days = -(-n_shifts // per_day)
+    shift_rows = []
+    for i in range(n_shifts):
+        day, slot = divmod(i, per_day)
+        hour, length = _TEMPLATES[slot % 4]
+        s = start + timedelta(days=day, hours=hour)
+        shift_rows.append((f"s{i}", s.isoformat(), (s + timedelta(hours=length)).isoformat(), 1 + i % 2, _SKILLS[i % 4]))
+    employees = [
+        {
+            "id": f"e{i}",
+            "skills": [_SKILLS[i % 4]],
+            "availability": [
+                {"start": (start + timedelta(days=d, hours=6)).isoformat(), "end": (start + timedelta(days=d, hours=22)).isoformat()}
+                for d in range(0, days, 2)
+            ],
+        }
+        for i in range(n_employees)
+    ]
+
+    with (directory / "inline.json").open("w", encoding="utf-8") as f:
+        f.write('{"meta": {"name": "bench"}, "employees": ')
+        json.dump(employees, f)
+        f.write(', "shifts": [')
+        for i, (sid, s, e, hc, skill) in enumerate(shift_rows):
+            if i:
+                f.write(",")
+            json.dump({"id": sid, "start": s, "end": e, "required_headcount": hc, "required_skills": [skill]}, f)
+        f.write("]}")
+
+    with (directory / "shifts.csv").open("w", encoding="utf-8") as f:
+        f.write("id,start,end,required_headcount,required_skills\n")
+        for row in shift_rows:
+            f.write(",".join(map(str, row)) + "\n")
+    (directory / "side.json").write_text(
+        json.dumps({"meta": {"name": "bench"}, "employees": employees, "shifts": [], "shifts_path": "shifts.csv"})
+    )
+
+
+def _legacy(path: Path):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    employees = {
+        e["id"]: (
+            set(e.get("skills", [])),
+            [(datetime.fromisoformat(w["start"]), datetime.fromisoformat(w["end"])) for w in e.get("availability", [])],
+        )
+        for e in data["employees"]
+    }
+    shifts = {
+        s["id"]: (datetime.fromisoformat(s["start"]), datetime.fromisoformat(s["end"]), set(s.get("required_skills", [])))
+        for s in data["shifts"]
+    }
+    return employees, shifts
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM resets on exec; ru_maxrss can carry the parent's peak across fork+exec.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(mode: str, directory: Path) -> None:
+    from shift_scheduling_agent.config_io import load_config
+
+    t0 = time.perf_counter()
+    if mode == "legacy":
+        _, shifts = _legacy(directory / "inline.json")
+    elif mode == "csv":
+        shifts = load_config(directory / "side.json").shifts
+    else:
+        shifts = load_config(directory / "inline.json", stream=(mode == "stream")).shifts
+    elapsed = time.perf_counter() - t0
+    rss_mb = _peak_rss_mb()
+    print(json.dumps({"mode": mode, "seconds": elapsed, "peak_rss_mb": rss_mb, "shifts": len(shifts)}))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--shifts", type=int, default=1_000_000)
+    ap.add_argument("--employees", type=int, default=2000)
+    ap.add_argument("--shifts-per-day", type=int, default=2740, help="Default: 1M shifts ≈ one year.")
+    ap.add_argument("--child", nargs=2, metavar=("MODE", "DIR"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        _child(args.child[0], Path(args.child[1]))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        _write_inputs(directory, args.employees, args.shifts, args.shifts_per_day)
+        size_mb = (directory / "inline.json").stat().st_size / 1e6
+        print(f"{args.shifts} shifts, {args.employees} employees, {size_mb:.0f} MB JSON")
+        for mode in ("legacy", "eager", "stream", "csv"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, tmp], capture_output=True, text=True, check=True
+            )
+            r = json.loads(out.stdout)
+            print(f"{mode:<7} {r['seconds']:7.2f} s   peak RSS {r['peak_rss_mb']:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compiled score model versus the previous per-call scoring.
+
+    python benchmarks/bench_scoring.py --employees 400 --shifts 2000
+
+Every employee gets a ``prefer_skill``; with ``--rich`` half of them also get
+preferred/avoided shifts, a time of day and days off (which the previous scoring
+ignored). Reports full scores/sec for both and swap deltas/sec of the evaluator.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import replace
+from statistics import pstdev
+
+from shift_scheduling_agent.domain import Config, Schedule
+from shift_scheduling_agent.incremental import IncrementalEvaluator
+from shift_scheduling_agent.scoring import ScoreModel, score_schedule
+from shift_scheduling_agent.solver import _greedy_construct
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def previous_score(config: Config, schedule: Schedule) -> float:
+    # score_schedule before the compiled model (fairness + prefer_skill only)
+    emp_to = schedule.employee_shifts()
+    counts = [len(emp_to.get(eid, [])) for eid in config.employees.keys()]
+    fairness = -pstdev(counts) if len(counts) >= 2 else 0.0
+    pref_points = 0.0
+    for sid, eids in schedule.assignments.items():
+        shift = config.shifts.get(sid)
+        if shift is None:
+            continue
+        for eid in eids:
+            prefs = config.preferences.employee_shift_preferences.get(eid, {})
+            prefer_skill = set(prefs.get("prefer_skill", []))
+            if prefer_skill and shift.required_skills and (shift.required_skills & prefer_skill):
+                pref_points += 1.0
+    return fairness * config.preferences.fairness_weight + pref_points * config.preferences.preference_weight
+
+
+def _rate(fn, seconds: float = 1.0) -> float:
+    n, t0 = 0, time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        fn()
+        n += 1
+    return n / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=400)
+    ap.add_argument("--shifts", type=int, default=2000)
+    ap.add_argument("--rich", action="store_true")
+    args = ap.parse_args()
+
+    rnd = random.Random(0)
+    config = synthetic_config(args.employees, args.shifts, seed=0)
+    shift_ids = list(config.shifts)
+    prefs = {}
+    for k, eid in enumerate(config.employees):
+        prefs[eid] = {"prefer_skill": [rnd.choice(("cashier", "stock", "lead", "deli"))]}
+        if args.rich and k % 2:
+            prefs[eid].update(
+                prefer_shift=rnd.sample(shift_ids, 3),
+                avoid_shift=rnd.sample(shift_ids, 3),
+                prefer_time=[rnd.choice(("morning", "afternoon", "evening"))],
+                days_off=[rnd.choice(("sat", "sun"))],
+            )
+    config = replace(config, preferences=replace(config.preferences, employee_shift_preferences=prefs))
+    schedule = _greedy_construct(config, random.Random(0))
+
+    t0 = time.perf_counter()
+    ScoreModel.for_config(config)
+    print(f"compile:          {1000 * (time.perf_counter() - t0):8.1f} ms")
+    print(f"previous scoring: {_rate(lambda: previous_score(config, schedule)):8.1f} scores/s")
+    print(f"compiled scoring: {_rate(lambda: score_schedule(config, schedule)):8.1f} scores/s")
+
+    ev = IncrementalEvaluator(config, schedule)
+    state = ev.state
+    busy = [s for s in range(len(shift_ids)) if state.count(s)]
+
+    def swap() -> None:
+        s1, s2 = rnd.choice(busy), rnd.choice(busy)
+        e1, e2 = state.get(s1, 0), state.get(s2, 0)
+        if s1 != s2 and e1 != e2:
+            ev.propose_swap(s1, e1, s2, e2)
+            ev.rollback()
+
+    print(f"swap deltas:      {_rate(swap):8.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
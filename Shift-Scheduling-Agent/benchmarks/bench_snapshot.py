@@ -0,0 +1,94 @@
+"""Load time and peak RSS: JSON versus mmapped ``.ssa`` snapshots.
+
+    python benchmarks/bench_snapshot.py --employees 1000 --shifts 200000
+
+Each measurement runs in a fresh child process; RSS is the peak above the
+post-import baseline. ``ssa`` only maps the file and indexes ids; ``ssa+touch``
+also decodes every shift and employee record.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+MODES = ("config-json", "config-ssa", "config-ssa+touch", "schedule-json", "schedule-ssa")
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM resets on exec; ru_maxrss can carry the parent's peak across fork+exec.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _child(mode: str, directory: Path) -> None:
+    from shift_scheduling_agent.config_io import load_config, load_schedule
+
+    base = _peak_rss_mb()
+    t0 = time.perf_counter()
+    if mode.startswith("schedule"):
+        load_schedule(directory / ("schedule.json" if mode == "schedule-json" else "schedule.ssa"))
+    else:
+        config = load_config(directory / ("config.json" if mode == "config-json" else "config.ssa"))
+        if mode.endswith("+touch"):
+            for _ in config.shifts.values():
+                pass
+            for _ in config.employees.values():
+                pass
+    elapsed = time.perf_counter() - t0
+    rss = _peak_rss_mb() - base
+    print(json.dumps({"seconds": elapsed, "rss_mb": rss}))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=1000)
+    ap.add_argument("--shifts", type=int, default=200_000)
+    ap.add_argument("--child", nargs=2, metavar=("MODE", "DIR"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        _child(args.child[0], Path(args.child[1]))
+        return
+
+    from shift_scheduling_agent.config_io import save_config, save_schedule
+    from shift_scheduling_agent.domain import Schedule
+    from shift_scheduling_agent.snapshot import save_config_snapshot, save_schedule_snapshot
+    from shift_scheduling_agent.synthetic import synthetic_config
+
+    config = synthetic_config(args.employees, args.shifts, shifts_per_day=500, seed=0)
+    rnd = random.Random(0)
+    eids = list(config.employees)
+    schedule = Schedule(
+        assignments={sid: rnd.sample(eids, sh.required_headcount) for sid, sh in config.shifts.items()}
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        d = Path(tmp)
+        save_config(config, d / "config.json")
+        save_config_snapshot(config, d / "config.ssa")
+        save_schedule(schedule, d / "schedule.json")
+        save_schedule_snapshot(schedule, d / "schedule.ssa")
+        for name in ("config.json", "config.ssa", "schedule.json", "schedule.ssa"):
+            print(f"{name:<14} {(d / name).stat().st_size / 1e6:8.1f} MB")
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, tmp], capture_output=True, text=True, check=True
+            )
+            r = json.loads(out.stdout)
+            print(f"{mode:<17} {r['seconds'] * 1000:9.1f} ms   +RSS {r['rss_mb']:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Employee equivalence classes on and off, on rosters with many interchangeable staff.
+
+    python benchmarks/bench_symmetry.py --profiles 8 --seeds 20
+
+``exact``: complete search on small rosters whose employees share a handful of skill
+profiles and are always available (caps, rest and runs decide feasibility); reports
+proved instances (feasible or infeasible within the backtrack budget) and search
+nodes. ``swap``: the swap hill-climber on a 400x800 roster drawn from ``--profiles``
+profiles (shifts no profile can staff are trimmed); reports evaluated moves and time
+for the same iterations.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import replace
+from datetime import datetime
+
+from shift_scheduling_agent.domain import TimeWindow
+from shift_scheduling_agent.exact import exact_search
+from shift_scheduling_agent.feasibility import coverage_bound
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.symmetry import EmployeeClasses
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def exact_case(seed: int):
+    rnd = random.Random(seed)
+    config = synthetic_config(rnd.randint(6, 14), rnd.randint(8, 28), shifts_per_day=4, skills=("a", "b"), seed=seed)
+    always = [TimeWindow(datetime(2026, 1, 1), datetime(2026, 3, 1))]
+    return replace(
+        config,
+        employees={k: replace(e, availability=always) for k, e in config.employees.items()},
+        policies=replace(config.policies, max_shifts_per_week=rnd.randint(2, 5), max_consecutive_shifts=rnd.randint(1, 3)),
+    )
+
+
+def swap_case(profiles: int, seed: int):
+    config = synthetic_config(400, 800, shifts_per_day=8, available_days_ratio=0.8, profiles=profiles, seed=seed)
+    short = coverage_bound(config).short
+    shifts = {sid: replace(sh, required_headcount=sh.required_headcount - short.get(sid, 0)) for sid, sh in config.shifts.items()}
+    return replace(config, shifts=shifts)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seeds", type=int, default=20)
+    ap.add_argument("--profiles", type=int, default=8)
+    ap.add_argument("--backtracks", type=int, default=50_000)
+    args = ap.parse_args()
+
+    print(f"{'exact':>8} {'proved':>7} {'nodes':>10} {'seconds':>8}")
+    for symmetry in (False, True):
+        proved = nodes = 0
+        seconds = 0.0
+        for seed in range(args.seeds):
+            config = exact_case(seed).with_solver(symmetry=symmetry, backtracking_limit=args.backtracks, max_seconds=60.0)
+            result = exact_search(config)
+            proved += result.status != "unknown"
+            nodes += result.nodes
+            seconds += result.seconds
+        print(f"{'on' if symmetry else 'off':>8} {proved:>3}/{args.seeds:<3} {nodes:>10} {seconds:>8.2f}", flush=True)
+
+    print(f"{'swap':>8} {'classes':>7} {'score':>10} {'moves':>8} {'seconds':>8}")
+    for seed in range(2):
+        config = swap_case(args.profiles, seed)
+        for symmetry in (False, True):
+            t0 = time.perf_counter()
+            result = solve(config.with_solver(max_iterations=3000, max_seconds=120.0, symmetry=symmetry, random_seed=seed))
+            print(
+                f"{'on' if symmetry else 'off':>8} {len(EmployeeClasses.for_config(config)):>7} "
+                f"{result.trace[-1].score:>10.3f} {result.moves:>8} {time.perf_counter() - t0:>8.2f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
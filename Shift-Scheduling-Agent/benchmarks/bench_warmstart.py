@@ -0,0 +1,52 @@
+"""Re-solve after one sick call: cold solve versus warm start from the published schedule.
+
+    python benchmarks/bench_warmstart.py --employees 400 --shifts 2000
+
+The busiest employee loses all availability; churn counts assignments that differ
+from the published schedule.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import time
+
+from shift_scheduling_agent.scoring import churn
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--employees", type=int, default=400)
+    ap.add_argument("--shifts", type=int, default=2000)
+    ap.add_argument("--max-seconds", type=float, default=5.0)
+    args = ap.parse_args()
+
+    config = synthetic_config(args.employees, args.shifts, seed=0).with_solver(
+        max_seconds=args.max_seconds, max_iterations=2000
+    )
+    published = solve(config).schedule
+    load = {eid: 0 for eid in config.employees}
+    for eids in published.assignments.values():
+        for eid in eids:
+            load[eid] += 1
+    sick = max(load, key=load.__getitem__)
+    employees = dict(config.employees)
+    employees[sick] = dataclasses.replace(employees[sick], availability=[])
+    changed = dataclasses.replace(config, employees=employees)
+
+    t0 = time.perf_counter()
+    cold = solve(changed)
+    t_cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    warm = solve(changed, initial=published)
+    t_warm = time.perf_counter() - t0
+
+    print(f"sick employee {sick} had {load[sick]} shift(s)")
+    print(f"cold  {t_cold * 1000:9.1f} ms  ok={cold.ok}  churn={churn(cold.schedule, published)}")
+    print(f"warm  {t_warm * 1000:9.1f} ms  ok={warm.ok}  churn={warm.churn}")
+
+
+if __name__ == "__main__":
+    main()
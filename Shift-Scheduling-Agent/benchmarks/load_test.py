@@ -0,0 +1,130 @@
+"""Load test for ``shift-agent serve``: p50/p99 latency and requests/s.
+
+    python benchmarks/load_test.py --concurrency 16 --seconds 10
+    python benchmarks/load_test.py --url http://127.0.0.1:8765 --generate
+
+Without ``--url`` a local server is started on a free port and stopped afterwards.
+Clients keep connections alive and cycle validate/score/explain calls on one config;
+``--generate`` also keeps one generate request in flight the whole time, to check
+that the fast tools are not queued behind solves.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+TOOLS = ("schedule_validate", "schedule_score", "schedule_explain")
+
+
+class _Client:
+    def __init__(self, host: str, port: int) -> None:
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def post(self, path: str, payload) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode()
+        self.writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            k, _, v = line.decode().partition(":")
+            if k.lower() == "content-length":
+                length = int(v)
+        await self.reader.readexactly(length)
+        return status
+
+
+async def _worker(client, config, schedule, deadline, latencies, errors, i) -> None:
+    while time.perf_counter() < deadline:
+        tool = TOOLS[i % len(TOOLS)]
+        i += 1
+        t0 = time.perf_counter()
+        status = await client.post(f"/tools/{tool}", {"config_path": config, "schedule": schedule})
+        latencies.append(time.perf_counter() - t0)
+        if status != 200:
+            errors.append(status)
+
+
+async def _generator(client, config, deadline, counts) -> None:
+    while time.perf_counter() < deadline:
+        await client.post("/tools/schedule_generate", {"config_path": config})
+        counts.append(1)
+
+
+async def _run(args, host: str, port: int) -> None:
+    gen = await _Client(host, port).post("/tools/schedule_generate", {"config_path": args.config})
+    if gen != 200:
+        raise SystemExit(f"warm-up generate failed with HTTP {gen}")
+    schedule = {"assignments": {}}
+
+    latencies, errors, generated = [], [], []
+    deadline = time.perf_counter() + args.seconds
+    jobs = [
+        _worker(_Client(host, port), args.config, schedule, deadline, latencies, errors, i)
+        for i in range(args.concurrency)
+    ]
+    if args.generate:
+        jobs.append(_generator(_Client(host, port), args.config, deadline, generated))
+    t0 = time.perf_counter()
+    await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000  # noqa: E731
+    print(f"requests   {len(latencies)} in {elapsed:.1f}s ({len(errors)} errors)")
+    print(f"throughput {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency    p50 {pct(0.50):.1f} ms   p99 {pct(0.99):.1f} ms   max {latencies[-1] * 1000:.1f} ms")
+    if args.generate:
+        print(f"generate   {len(generated)} solves completed alongside")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="", help="Existing server; default starts a local one.")
+    ap.add_argument("--config", default="configs/sample_week.json")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--generate", action="store_true", help="Keep a generate request in flight.")
+    args = ap.parse_args()
+
+    proc = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        host, port = "127.0.0.1", _free_port()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "shift_scheduling_agent.cli", "serve", "--port", str(port)],
+            stdout=subprocess.PIPE,
+        )
+        proc.stdout.readline()  # "serving on ..."
+    try:
+        asyncio.run(_run(args, host, port))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
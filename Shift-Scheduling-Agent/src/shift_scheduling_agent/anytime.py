@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .compact import CompactSchedule
+from .domain import Config, Schedule
+
+# The control of the solve running in this thread/task, or None. Like the profiler,
+# search loops fetch it once per call and skip all checks when it is None.
+_CURRENT: ContextVar[Optional["SolveControl"]] = ContextVar("shift_agent_solve_control", default=None)
+
+
+def active() -> Optional["SolveControl"]:
+    return _CURRENT.get()
+
+
+class CancelToken:
+    """Thread-safe flag a caller sets to stop a running solve at the next iteration."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass(frozen=True)
+class Incumbent:
+    schedule: Schedule
+    score: float
+    violations: int
+    iteration: int
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.violations == 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "score": self.score,
+            "violations": self.violations,
+            "iteration": self.iteration,
+            "seconds": self.seconds,
+            "schedule": {"assignments": self.schedule.assignments},
+        }
+
+
+class SolveControl:
+    """Stop rules and incumbent hand-off for one solve.
+
+    The search reports every new incumbent (``offer``) and asks ``should_stop`` once
+    per iteration. It stops when the token is cancelled, the deadline passes, a valid
+    incumbent reaches ``target_score``, or ``stagnation_moves`` move proposals go by
+    without a new incumbent. Offers only keep the latest state; a reader that is
+    slower than the search sees the newest incumbent, not every one.
+    """
+
+    def __init__(
+        self,
+        cancel: Optional[CancelToken] = None,
+        target_score: Optional[float] = None,
+        stagnation_moves: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> None:
+        self.cancel = cancel or CancelToken()
+        self.target_score = target_score
+        self.stagnation_moves = stagnation_moves
+        self.deadline = deadline
+        self.reason: Optional[str] = None
+        self._start = time.time()
+        self._last_moves = 0
+        self._best: Optional[tuple] = None  # (violations, score)
+        self._latest: Optional[tuple] = None  # (state, score, violations, iteration, seconds)
+        self._changed = threading.Condition()
+
+    def offer(self, state: CompactSchedule, score: float, violations: int, iteration: int, moves: int) -> None:
+        """Record an incumbent; ``state`` must not be mutated afterwards (pass a copy)."""
+        best = self._best
+        if best is not None and (violations > best[0] or (violations == best[0] and score <= best[1] + 1e-12)):
+            return
+        self._best = (violations, score)
+        self._last_moves = moves
+        with self._changed:
+            self._latest = (state, score, violations, iteration, time.time() - self._start)
+            self._changed.notify_all()
+
+    def should_stop(self, moves: int) -> bool:
+        if self.reason is not None:
+            return True
+        if self.cancel.cancelled:
+            self.reason = "cancelled"
+        elif self.deadline is not None and time.time() >= self.deadline:
+            self.reason = "deadline"
+        elif (
+            self.target_score is not None
+            and self._best is not None
+            and self._best[0] == 0
+            and self._best[1] >= self.target_score
+        ):
+            self.reason = "target score reached"
+        elif self.stagnation_moves is not None and moves - self._last_moves >= self.stagnation_moves:
+            self.reason = f"no improvement in {self.stagnation_moves} moves"
+        return self.reason is not None
+
+    def take(self, timeout: Optional[float] = None) -> Optional[Incumbent]:
+        """Wait up to ``timeout`` for an incumbent not taken yet (None if there is none)."""
+        with self._changed:
+            if self._latest is None:
+                self._changed.wait(timeout)
+            latest, self._latest = self._latest, None
+        if latest is None:
+            return None
+        state, score, violations, iteration, seconds = latest
+        return Incumbent(state.to_schedule(), score, violations, iteration, seconds)
+
+    def wake(self) -> None:
+        with self._changed:
+            self._changed.notify_all()
+
+
+@contextmanager
+def controlled(control: SolveControl) -> Iterator[SolveControl]:
+    """Apply ``control`` to solves in the enclosed block (this thread/task)."""
+    token = _CURRENT.set(control)
+    try:
+        yield control
+    finally:
+        _CURRENT.reset(token)
+
+
+def solve_iter(
+    config: Config,
+    control: Optional[SolveControl] = None,
+    initial: Optional[Schedule] = None,
+    frozen: Iterable[str] = (),
+) -> Iterator[Dict[str, Any]]:
+    """Solve in a background thread, yielding each improved incumbent as it is found.
+
+    Rows are ``{"event": "incumbent", "ok", "score", "violations", "iteration",
+    "seconds", "schedule"}``; the last one is ``{"event": "final", ...}`` with the
+    validated result (``ok``, ``notes``, ``stopped``: the stop reason or None).
+    Closing the generator early cancels the solve.
+    """
+    from .solver import solve  # solver imports this module
+
+    ctl = control or SolveControl()
+    box: Dict[str, Any] = {}
+
+    def run() -> None:
+        try:
+            with controlled(ctl):
+                box["result"] = solve(config, initial=initial, frozen=frozen)
+        except BaseException as exc:  # re-raised in the caller
+            box["error"] = exc
+        finally:
+            box["done"] = True
+            ctl.wake()
+
+    # Copy the caller's context so an enclosing ``profiled()`` still applies.
+    worker = threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True)
+    worker.start()
+    try:
+        while not box.get("done"):
+            inc = ctl.take(timeout=0.1)
+            if inc is not None:
+                yield {"event": "incumbent", **inc.to_dict()}
+        inc = ctl.take(timeout=0)
+        if inc is not None:
+            yield {"event": "incumbent", **inc.to_dict()}
+    finally:
+        ctl.cancel.cancel()
+        worker.join()
+    if "error" in box:
+        raise box["error"]
+    result = box["result"]
+    yield {
+        "event": "final",
+        "ok": result.ok,
+        "iterations": result.iterations,
+        "seconds": result.seconds,
+        "notes": result.notes,
+        "stopped": ctl.reason,
+        "schedule": {"assignments": result.schedule.assignments},
+    }
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+from .config_io import load_config, save_schedule
+from .constraints import ConstraintSuite
+from .decompose import solve_decomposed
+from .scoring import score_schedule
+from .solver import solve
+
+# Config files picked up when a batch source is a directory.
+CONFIG_SUFFIXES = (".json", ".ssa")
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    id: str
+    config_path: str
+    # per-store solver budget (seconds); None keeps the config's solver.max_seconds
+    max_seconds: Optional[float] = None
+
+
+def load_jobs(source: str | Path) -> List[BatchJob]:
+    """Jobs from a directory of configs (id = file stem, sorted) or a JSONL manifest.
+
+    Manifest lines are ``{"id": ..., "config_path": ..., "max_seconds": ...}``; relative
+    paths resolve against the manifest's directory, ``id`` defaults to the file stem.
+    """
+    src = Path(source)
+    if src.is_dir():
+        paths = sorted(p for p in src.iterdir() if p.suffix in CONFIG_SUFFIXES and p.is_file())
+        return [BatchJob(id=p.stem, config_path=str(p)) for p in paths]
+    jobs: List[BatchJob] = []
+    for line in src.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        raw = json.loads(line)
+        path = Path(raw["config_path"])
+        if not path.is_absolute():
+            path = src.parent / path
+        seconds = raw.get("max_seconds")
+        jobs.append(
+            BatchJob(
+                id=str(raw.get("id") or path.stem),
+                config_path=str(path),
+                max_seconds=None if seconds is None else float(seconds),
+            )
+        )
+    ids = [j.id for j in jobs]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate job ids in {src}")
+    return jobs
+
+
+def completed_ids(checkpoint: str | Path) -> Set[str]:
+    """Ids already solved according to a summary/checkpoint JSONL (failed and skipped
+    jobs are retried). A truncated last line from an interrupted run is ignored."""
+    p = Path(checkpoint)
+    if not p.exists():
+        return set()
+    done: Set[str] = set()
+    for line in p.read_text(encoding="utf-8").splitlines():
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if row.get("status") == "solved":
+            done.add(row["id"])
+    return done
+
+
+def run_job(job: BatchJob, out_dir: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Solve one store and write ``<out_dir>/<id>.json``; never raises.
+
+    The solver budget is the job's ``max_seconds`` (or the config's), capped by what is
+    left before the batch ``deadline``; a job that starts after it is skipped.
+    """
+    started = time.time()
+    row: Dict[str, Any] = {"id": job.id, "config_path": job.config_path}
+    if deadline is not None and started >= deadline:
+        return {**row, "status": "skipped", "error": "batch time budget exhausted"}
+    try:
+        config = load_config(job.config_path)
+        budget = config.solver.max_seconds if job.max_seconds is None else job.max_seconds
+        if deadline is not None:
+            budget = min(budget, deadline - started)
+        config = config.with_solver(max_seconds=budget, workers=1)
+        result = solve_decomposed(config, workers=1) if config.solver.decompose else solve(config)
+        out = Path(out_dir) / f"{job.id}.json"
+        save_schedule(result.schedule, out)
+        report = ConstraintSuite.default().validate(config, result.schedule)
+        row.update(
+            status="solved",
+            ok=report.ok,
+            violations=len(report.violations),
+            score=score_schedule(config, result.schedule).total,
+            iterations=result.iterations,
+            budget_seconds=budget,
+            schedule_path=str(out),
+        )
+    except Exception as exc:  # isolate the store: report and keep going
+        row.update(status="failed", error=f"{type(exc).__name__}: {exc}", traceback=traceback.format_exc(limit=5))
+    row["seconds"] = time.time() - started
+    return row
+
+
+def solve_many(
+    jobs: Sequence[BatchJob],
+    out_dir: str | Path,
+    workers: int = 1,
+    max_seconds: Optional[float] = None,
+    store_seconds: Optional[float] = None,
+    checkpoint: Optional[str | Path] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Solve many configs, yielding one summary row per job as it completes.
+
+    ``max_seconds`` is a global wall-clock budget for the whole batch and
+    ``store_seconds`` the per-store deadline for jobs without their own. Rows are
+    appended to ``checkpoint`` (JSONL) as they arrive, and jobs it already records as
+    solved are not run again, so an interrupted batch resumes where it stopped.
+    Each worker process pays imports once and solves stores back to back.
+    If a worker process dies, the stores in flight are rerun one per process, so
+    only the one that killed it is reported failed.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    done = completed_ids(checkpoint) if checkpoint is not None else set()
+    pending = [
+        replace(j, max_seconds=store_seconds) if j.max_seconds is None and store_seconds is not None else j
+        for j in jobs
+        if j.id not in done
+    ]
+    deadline = None if max_seconds is None else time.time() + max_seconds
+
+    sink = None
+    if checkpoint is not None:
+        Path(checkpoint).parent.mkdir(parents=True, exist_ok=True)
+        sink = open(checkpoint, "a", encoding="utf-8")
+    try:
+        for row in _run(pending, str(out), workers, deadline):
+            if sink is not None:
+                sink.write(json.dumps(row) + "\n")
+                sink.flush()
+                os.fsync(sink.fileno())
+            yield row
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+def _run(jobs: List[BatchJob], out_dir: str, workers: int, deadline: Optional[float]) -> Iterator[Dict[str, Any]]:
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield run_job(job, out_dir, deadline)
+        return
+    # Keep at most 2 jobs per worker queued so a stop (or the deadline) doesn't leave
+    # hundreds of submitted stores behind.
+    queue = list(reversed(jobs))
+    running: Dict[Future, BatchJob] = {}
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while queue or running:
+            while queue and len(running) < 2 * workers:
+                job = queue.pop()
+                running[pool.submit(run_job, job, out_dir, deadline)] = job
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            suspects: List[BatchJob] = []
+            for fut in finished:
+                row = _collect(fut, running.pop(fut), suspects)
+                if row is not None:
+                    yield row
+            if not suspects:
+                continue
+            # A worker died (a crash or an OOM kill) and broke the pool, failing every
+            # job in flight alike: rerun those one per process so only the culprit
+            # fails, then carry on with a fresh pool.
+            finished, _ = wait(running)
+            for fut in finished:
+                row = _collect(fut, running.pop(fut), suspects)
+                if row is not None:
+                    yield row
+            pool.shutdown()
+            for job in suspects:
+                yield _run_isolated(job, out_dir, deadline)
+            pool = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _collect(fut: Future, job: BatchJob, suspects: List[BatchJob]) -> Optional[Dict[str, Any]]:
+    # The job's row, or None (and the job added to ``suspects``) if the pool broke.
+    try:
+        return fut.result()
+    except BrokenProcessPool:
+        suspects.append(job)
+        return None
+    except Exception as exc:
+        return _failed(job, exc)
+
+
+def _run_isolated(job: BatchJob, out_dir: str, deadline: Optional[float]) -> Dict[str, Any]:
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(run_job, job, out_dir, deadline).result()
+        except Exception as exc:  # the worker process died
+            return _failed(job, exc)
+
+
+def _failed(job: BatchJob, exc: BaseException) -> Dict[str, Any]:
+    return {"id": job.id, "config_path": job.config_path, "status": "failed", "error": repr(exc)}
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .compact import RosterIds
+from .domain import Config, Schedule
+from .eligibility import EligibilityIndex, iter_bits
+from .timeline import epoch_seconds
+
+CODES = (
+    "UNDER_COVERAGE",
+    "NOT_AVAILABLE",
+    "MISSING_SKILL",
+    "MAX_SHIFTS_WEEK",
+    "MIN_REST",
+    "MAX_CONSECUTIVE",
+)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    ok: bool
+    counts: Dict[str, int]
+    violations: Optional[List] = None
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+class BatchValidator:
+    """Violation counts for many schedules against one config.
+
+    Shifts are re-indexed by start time with epoch-second start/end arrays, and each
+    candidate is encoded as one shift bitset per employee (the employee × shift
+    matrix, row-wise). Availability and skills are bit tests against the eligibility
+    index; weekly caps are popcounts; rest and consecutive runs walk set bits in
+    time order with integer gaps. No Shift/datetime objects are touched per schedule.
+
+    Schedules the encoding can't represent (unknown ids, an employee listed twice on
+    one shift, an employee on two shifts with the same start, whose order the scalar
+    path takes from the schedule) return ``None`` from ``counts`` so callers use the
+    scalar path.
+    """
+
+    def __init__(self, config: Config) -> None:
+        ids = RosterIds.for_config(config)
+        index = EligibilityIndex.for_config(config)
+        shifts = list(config.shifts.values())
+        order = sorted(range(len(shifts)), key=lambda s: (shifts[s].start, s))
+
+        self.employee_pos = ids.employee_pos
+        self.n_employees = len(ids.employee_ids)
+        # per shift id: (time-ordered position, shift index)
+        self.shift_pos: Dict[str, tuple] = {}
+        for p, s in enumerate(order):
+            self.shift_pos[ids.shift_ids[s]] = (p, s)
+        self.required = [sh.required_headcount for sh in shifts]
+        self.start = [epoch_seconds(shifts[s].start) for s in order]
+        self.end = [epoch_seconds(shifts[s].end) for s in order]
+        self.available = index.available_by_shift
+        self.skills = index.skills_by_shift
+        self.needs_skills = [bool(sh.required_skills) for sh in shifts]
+
+        pol = config.policies
+        self.cap = pol.max_shifts_per_week
+        self.max_run = pol.max_consecutive_shifts
+        self.min_rest = pol.min_rest_hours * 3600
+        self.consecutive_gap = 18 * 3600
+
+    @staticmethod
+    def for_config(config: Config) -> "BatchValidator":
+        return config.derived("batch_validator", BatchValidator)
+
+    def counts(self, schedule: Schedule) -> Optional[Dict[str, int]]:
+        not_available = missing_skill = 0
+        rows = [0] * self.n_employees
+        filled = [0] * len(self.required)
+        available, skills, needs_skills = self.available, self.skills, self.needs_skills
+        employee_pos = self.employee_pos
+
+        for sid, eids in schedule.assignments.items():
+            key = self.shift_pos.get(sid)
+            if key is None:
+                return None
+            p, s = key
+            bit = 1 << p
+            filled[s] = len(eids)
+            for eid in eids:
+                e = employee_pos.get(eid)
+                if e is None or rows[e] & bit:
+                    return None
+                rows[e] |= bit
+                if not available[s] >> e & 1:
+                    not_available += 1
+                if needs_skills[s] and not skills[s] >> e & 1:
+                    missing_skill += 1
+
+        under = sum(1 for s, req in enumerate(self.required) if filled[s] < req)
+
+        over_cap = min_rest = consecutive = 0
+        start, end = self.start, self.end
+        for row in rows:
+            if not row:
+                continue
+            if row.bit_count() > self.cap:
+                over_cap += 1
+            prev = -1
+            run = 1
+            flagged = False
+            for p in iter_bits(row):
+                if prev >= 0:
+                    if start[p] == start[prev]:
+                        return None
+                    gap = start[p] - end[prev]
+                    if gap < self.min_rest:
+                        min_rest += 1
+                    run = run + 1 if gap <= self.consecutive_gap else 1
+                    if run > self.max_run and not flagged:
+                        consecutive += 1
+                        flagged = True
+                prev = p
+
+        return {
+            "UNDER_COVERAGE": under,
+            "NOT_AVAILABLE": not_available,
+            "MISSING_SKILL": missing_skill,
+            "MAX_SHIFTS_WEEK": over_cap,
+            "MIN_REST": min_rest,
+            "MAX_CONSECUTIVE": consecutive,
+        }
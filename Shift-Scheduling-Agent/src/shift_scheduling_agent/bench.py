@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .config_io import load_config, save_config
+from .constraints import ConstraintSuite
+from .construct import regret_construct
+from .feasibility import _coverage_bound
+from .scoring import score_schedule
+from .solver import _greedy_construct, solve
+from .synthetic import synthetic_config
+
+# The suite ships with the project (benchmarks/ next to src/), not the package.
+SUITE = Path(__file__).resolve().parents[2] / "benchmarks" / "suite.json"
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    employees: int
+    shifts: int
+    shifts_per_day: int = 24
+    skills: int = 4
+    skill_sparsity: Optional[float] = None
+    availability: float = 0.6
+    tightness: Optional[float] = None
+    seed: int = 0
+    strategy: str = "swap"
+    max_seconds: float = 5.0
+    max_iterations: int = 2000
+
+
+@dataclass
+class BenchResult:
+    case: str
+    timings: Dict[str, float] = field(default_factory=dict)
+    throughput: Dict[str, float] = field(default_factory=dict)
+    solve: Dict[str, Any] = field(default_factory=dict)
+
+
+def load_suite(path: str | Path) -> List[BenchCase]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [BenchCase(**c) for c in data["cases"]]
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def _rate(fn: Callable[[], Any], min_seconds: float = 0.5, max_calls: int = 1000) -> float:
+    # Calls per second over at least ``min_seconds`` (or ``max_calls``).
+    n = 0
+    t0 = time.perf_counter()
+    while n < max_calls:
+        fn()
+        n += 1
+        if time.perf_counter() - t0 >= min_seconds:
+            break
+    return n / (time.perf_counter() - t0)
+
+
+def run_case(case: BenchCase, workdir: Path) -> BenchResult:
+    """Time every pipeline stage on one synthetic roster."""
+    result = BenchResult(case=case.name)
+    config = synthetic_config(
+        case.employees,
+        case.shifts,
+        skills=[f"skill{i}" for i in range(case.skills)],
+        shifts_per_day=case.shifts_per_day,
+        available_days_ratio=case.availability,
+        seed=case.seed,
+        skill_sparsity=case.skill_sparsity,
+        tightness=case.tightness,
+    )
+    path = workdir / f"{case.name}.json"
+    save_config(config, path)
+
+    config, result.timings["load_config"] = _timed(lambda: load_config(path, stream=False))
+    config = config.with_solver(
+        strategy=case.strategy, max_seconds=case.max_seconds, max_iterations=case.max_iterations, random_seed=case.seed
+    )
+    schedule, result.timings["greedy_construct"] = _timed(lambda: _greedy_construct(config, random.Random(case.seed)))
+    _, result.timings["regret_construct"] = _timed(lambda: regret_construct(config, random.Random(case.seed)))
+    _, result.timings["coverage_bound"] = _timed(lambda: _coverage_bound(config))
+
+    suite = ConstraintSuite.default()
+    _, result.timings["validate"] = _timed(lambda: suite.validate(config, schedule))
+    _, result.timings["score_schedule"] = _timed(lambda: score_schedule(config, schedule))
+    result.throughput["validations_per_sec"] = _rate(lambda: suite.validate(config, schedule))
+    result.throughput["scores_per_sec"] = _rate(lambda: score_schedule(config, schedule))
+
+    solved, result.timings["solve"] = _timed(lambda: solve(config))
+    report = suite.validate(config, solved.schedule)
+    result.throughput["moves_per_sec"] = solved.moves / max(solved.seconds, 1e-9)
+    result.solve = {
+        "ok": solved.ok,
+        "violations": len(report.violations),
+        "score": score_schedule(config, solved.schedule).total,
+        "iterations": solved.iterations,
+        "moves": solved.moves,
+    }
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(cases: Sequence[BenchCase], progress: Optional[Callable[[BenchResult], None]] = None) -> Dict[str, Any]:
+    """Run ``cases`` and return the machine-readable results document."""
+    results: List[BenchResult] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in cases:
+            r = run_case(case, Path(tmp))
+            results.append(r)
+            if progress is not None:
+                progress(r)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "cases": {r.case: {**asdict(r), "params": asdict(c)} for r, c in zip(results, cases)},
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Human-readable per-metric deltas for cases present in both result files."""
+    lines: List[str] = []
+    for name, cur in current["cases"].items():
+        old = baseline.get("cases", {}).get(name)
+        if old is None:
+            continue
+        for group in ("timings", "throughput"):
+            for metric, value in cur[group].items():
+                before = old[group].get(metric)
+                if not before:
+                    continue
+                lines.append(f"{name:<20} {metric:<20} {before:12.4g} -> {value:12.4g}  ({(value / before - 1) * 100:+6.1f}%)")
+        for metric in ("ok", "violations", "score"):
+            if old["solve"].get(metric) != cur["solve"].get(metric):
+                lines.append(f"{name:<20} {metric:<20} {old['solve'].get(metric)!s:>12} -> {cur['solve'].get(metric)!s:>12}")
+    return lines
+
+
+def format_result(r: BenchResult) -> str:
+    t, tp, s = r.timings, r.throughput, r.solve
+    return (
+        f"{r.case:<20} load {t['load_config']:.3f}s  greedy {t['greedy_construct']:.3f}s  "
+        f"validate {tp['validations_per_sec']:.1f}/s  score {tp['scores_per_sec']:.1f}/s  "
+        f"solve {t['solve']:.2f}s ({tp['moves_per_sec']:.0f} moves/s)  "
+        f"ok={s['ok']} violations={s['violations']} score={s['score']:.3f}"
+    )
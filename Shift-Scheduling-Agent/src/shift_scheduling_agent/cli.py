@@ -2,13 +2,23 @@ from __future__ import annotations
 
 import argparse
 import json
+import signal
+from contextlib import nullcontext
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
 from .agent import AgentState, ShiftSchedulingAgent
-from .config_io import load_schedule, save_schedule
+from .anytime import CancelToken, SolveControl, solve_iter
+from .batch import load_jobs, solve_many
+from .bench import SUITE, compare, format_result, load_suite, run_suite
+from .config_io import load_config, load_schedule, save_schedule
 from .domain import Schedule
-from .tools import default_registry
+from .profiling import profiled
+from .server import serve
+from .snapshot import save_config_snapshot, save_schedule_snapshot
+from .tools import CONFIG_CACHE, default_registry
+from .warmstart import started_before
 
 
 def _load_schedule_dict(path: str | Path) -> Dict[str, Any]:
@@ -16,6 +26,26 @@ def _load_schedule_dict(path: str | Path) -> Dict[str, Any]:
     return {"assignments": sch.assignments}
 
 
+def _generate_stream(args: argparse.Namespace, warm: Dict[str, Any]) -> None:
+    token = CancelToken()
+    control = SolveControl(cancel=token, target_score=args.target_score, stagnation_moves=args.stagnation_moves)
+    signal.signal(signal.SIGINT, lambda *_: token.cancel())
+    initial = warm.get("initial")
+    rows = solve_iter(
+        CONFIG_CACHE.get(args.config),
+        control,
+        initial=None if initial is None else Schedule(assignments=initial["assignments"]),
+        frozen=warm.get("frozen", ()),
+    )
+    with profiled() if args.profile else nullcontext() as prof:
+        for row in rows:
+            print(json.dumps(row), flush=True)
+            if row["event"] == "final":
+                save_schedule(Schedule(assignments=row["schedule"]["assignments"]), args.out)
+    if args.profile:
+        prof.save(args.profile)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(prog="shift-agent")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -23,6 +53,33 @@ def main() -> None:
     p_gen = sub.add_parser("generate", help="Generate a schedule from a config.")
     p_gen.add_argument("--config", required=True)
     p_gen.add_argument("--out", required=True)
+    p_gen.add_argument("--workers", type=int, default=0, help="Parallel portfolio processes (default: config).")
+    p_gen.add_argument(
+        "--window-days", type=int, default=None, help="Decompose and solve in rolling windows of N days (0: components only)."
+    )
+    p_gen.add_argument("--initial", default="", help="Published schedule to re-solve from (warm start).")
+    p_gen.add_argument(
+        "--freeze-before", default="", help="With --initial: keep shifts starting before this ISO time unchanged."
+    )
+    p_gen.add_argument(
+        "--profile", default="", help="Write phase timings/counters (JSON) here plus a Chrome trace (<name>.trace.json)."
+    )
+    p_gen.add_argument(
+        "--stream", action="store_true", help="Print each improved incumbent as a JSON line (Ctrl-C stops and keeps the best)."
+    )
+    p_gen.add_argument("--target-score", type=float, default=None, help="With --stream: stop at a valid schedule this good.")
+    p_gen.add_argument(
+        "--stagnation-moves", type=int, default=None, help="With --stream: stop after this many moves without improvement."
+    )
+
+    p_batch = sub.add_parser("generate-batch", help="Generate schedules for many configs (stores) in one run.")
+    p_batch.add_argument("--configs", required=True, help="Directory of configs or a JSONL manifest.")
+    p_batch.add_argument("--out-dir", required=True, help="Schedules are written here as <id>.json.")
+    p_batch.add_argument("--summary", default="", help="JSONL summary/checkpoint (default: <out-dir>/summary.jsonl).")
+    p_batch.add_argument("--workers", type=int, default=1, help="Stores solved in parallel.")
+    p_batch.add_argument("--max-seconds", type=float, default=None, help="Global budget for the whole batch.")
+    p_batch.add_argument("--store-seconds", type=float, default=None, help="Per-store budget (default: config).")
+    p_batch.add_argument("--resume", action="store_true", help="Skip stores the summary already records as solved.")
 
     p_val = sub.add_parser("validate", help="Validate a schedule.")
     p_val.add_argument("--config", required=True)
@@ -37,19 +94,78 @@ def main() -> None:
     p_exp.add_argument("--schedule", required=True)
     p_exp.add_argument("--out", default="", help="Optional output markdown path.")
 
+    p_check = sub.add_parser("check", help="Max-flow coverage bound: can every slot be staffed, and if not, where?")
+    p_check.add_argument("--config", required=True)
+
     p_chat = sub.add_parser("chat", help="Run an offline agent-like chat loop.")
     p_chat.add_argument("--config", required=True)
     p_chat.add_argument("--schedule-path", default="outputs/last_schedule.json")
 
+    p_comp = sub.add_parser("compile", help="Write a memory-mappable binary snapshot (.ssa).")
+    src = p_comp.add_mutually_exclusive_group(required=True)
+    src.add_argument("--config")
+    src.add_argument("--schedule")
+    p_comp.add_argument("--out", required=True)
+
+    p_bench = sub.add_parser("bench", help="Run the performance suite on synthetic rosters.")
+    p_bench.add_argument("--suite", default=str(SUITE))
+    p_bench.add_argument("--case", action="append", default=[], help="Only run these case names.")
+    p_bench.add_argument("--out", default="", help="Write machine-readable results (JSON).")
+    p_bench.add_argument("--baseline", default="", help="Previous results to compare against.")
+
+    p_serve = sub.add_parser("serve", help="Serve the tools over JSON/HTTP with warm configs.")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--workers", type=int, default=2, help="Processes for generate calls.")
+    p_serve.add_argument("--timeout", type=float, default=60.0, help="Default per-request budget (seconds).")
+
     args = parser.parse_args()
     reg = default_registry()
 
     if args.cmd == "generate":
-        out = reg.call("schedule_generate", config_path=args.config)
+        warm: Dict[str, Any] = {}
+        if args.freeze_before and not args.initial:
+            parser.error("--freeze-before needs --initial (the published schedule to keep)")
+        if args.initial:
+            warm["initial"] = _load_schedule_dict(args.initial)
+            if args.freeze_before:
+                cutoff = datetime.fromisoformat(args.freeze_before)
+                warm["frozen"] = started_before(CONFIG_CACHE.get(args.config), cutoff)
+        if args.stream:
+            if args.workers > 1 or args.window_days is not None:
+                parser.error("--stream runs a single solver; drop --workers/--window-days")
+            _generate_stream(args, warm)
+            return
+        with profiled() if args.profile else nullcontext() as prof:
+            out = reg.call(
+                "schedule_generate", config_path=args.config, workers=args.workers or None, window_days=args.window_days, **warm
+            )
         schedule_dict = out["schedule"]
         save_schedule(Schedule(assignments=schedule_dict["assignments"]), args.out)
         print(json.dumps({k: v for k, v in out.items() if k != "schedule"}, indent=2))
         print(f"Wrote schedule to: {args.out}")
+        if args.profile:
+            summary, trace = prof.save(args.profile)
+            print(f"Wrote profile to: {summary} (Chrome trace: {trace})")
+        return
+
+    if args.cmd == "generate-batch":
+        summary = Path(args.summary or Path(args.out_dir) / "summary.jsonl")
+        if not args.resume and summary.exists():
+            summary.unlink()
+        counts: Dict[str, int] = {}
+        rows = solve_many(
+            load_jobs(args.configs),
+            args.out_dir,
+            workers=args.workers,
+            max_seconds=args.max_seconds,
+            store_seconds=args.store_seconds,
+            checkpoint=summary,
+        )
+        for row in rows:
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+            print(json.dumps({k: v for k, v in row.items() if k != "traceback"}), flush=True)
+        print(json.dumps({"summary": str(summary), **counts}))
         return
 
     if args.cmd in {"validate", "score", "explain"}:
@@ -72,6 +188,37 @@ def main() -> None:
             print(json.dumps(out, indent=2))
         return
 
+    if args.cmd == "check":
+        out = reg.call("coverage_check", config_path=args.config)
+        for note in out["notes"] or ["Coverage is feasible: every slot can be staffed."]:
+            print(note)
+        print(json.dumps({k: out[k] for k in ("feasible", "demand", "max_coverage", "short", "seconds")}, indent=2))
+        return
+
+    if args.cmd == "compile":
+        if args.config:
+            save_config_snapshot(load_config(args.config), args.out)
+        else:
+            save_schedule_snapshot(load_schedule(args.schedule), args.out)
+        print(f"Wrote snapshot to: {args.out}")
+        return
+
+    if args.cmd == "bench":
+        cases = [c for c in load_suite(args.suite) if not args.case or c.name in args.case]
+        results = run_suite(cases, progress=lambda r: print(format_result(r), flush=True))
+        if args.out:
+            Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+            Path(args.out).write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+            print(f"Wrote: {args.out}")
+        if args.baseline:
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+            print("\n".join(compare(baseline, results)))
+        return
+
+    if args.cmd == "serve":
+        serve(host=args.host, port=args.port, workers=args.workers, timeout=args.timeout)
+        return
+
     if args.cmd == "chat":
         agent = ShiftSchedulingAgent(registry=reg)
         state = AgentState(config_path=args.config, last_schedule_path=Path(args.schedule_path))
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, List, Sequence
+
+from .domain import Config, Schedule
+
+# journal ops (4 ints per entry: op, shift, position, employee)
+_SET, _INSERT, _DELETE = 0, 1, 2
+
+
+class RosterIds:
+    """Dense integer ids for a config's employees and shifts (config order)."""
+
+    def __init__(self, config: Config) -> None:
+        self.employee_ids: List[str] = list(config.employees.keys())
+        self.employee_pos: Dict[str, int] = {eid: i for i, eid in enumerate(self.employee_ids)}
+        self.shift_ids: List[str] = list(config.shifts.keys())
+        self.shift_pos: Dict[str, int] = {sid: i for i, sid in enumerate(self.shift_ids)}
+
+    @staticmethod
+    def for_config(config: Config) -> "RosterIds":
+        return config.derived("ids", RosterIds)
+
+
+class CompactSchedule:
+    """Array-backed schedule used inside the solver.
+
+    Shift ``s`` owns ``slots[offsets[s]:offsets[s] + capacity(s)]``; the first
+    ``counts[s]`` entries are its assigned employee ids, in assignment order. Moves
+    mutate in place and append a fixed-size record to ``journal``; ``undo(mark)``
+    reverts everything after ``mark()``. Converts losslessly to and from ``Schedule``
+    (including key order) for schedules that reference known ids.
+    """
+
+    def __init__(self, ids: RosterIds, capacity: Sequence[int]) -> None:
+        self.ids = ids
+        self.offsets = array("i", [0])
+        for cap in capacity:
+            self.offsets.append(self.offsets[-1] + cap)
+        self.slots = array("i", [-1]) * self.offsets[-1]
+        self.counts = array("i", [0]) * len(capacity)
+        self.present = bytearray(len(capacity))
+        self.key_order: List[int] = []
+        self.journal = array("i")
+
+    @classmethod
+    def from_schedule(cls, config: Config, schedule: Schedule) -> "CompactSchedule":
+        ids = RosterIds.for_config(config)
+        capacity = [shift.required_headcount for shift in config.shifts.values()]
+        rows: List[List[int]] = []
+        for sid, eids in schedule.assignments.items():
+            s = ids.shift_pos.get(sid)
+            if s is None:
+                raise ValueError(f"Unknown shift: {sid}")
+            row = []
+            for eid in eids:
+                e = ids.employee_pos.get(eid)
+                if e is None:
+                    raise ValueError(f"Unknown employee: {eid}")
+                row.append(e)
+            capacity[s] = max(capacity[s], len(row))
+            rows.append(row)
+
+        out = cls(ids, capacity)
+        for sid, row in zip(schedule.assignments, rows):
+            s = ids.shift_pos[sid]
+            out._mark_present(s)
+            base = out.offsets[s]
+            out.slots[base : base + len(row)] = array("i", row)
+            out.counts[s] = len(row)
+        return out
+
+    def to_schedule(self) -> Schedule:
+        shift_ids, employee_ids = self.ids.shift_ids, self.ids.employee_ids
+        return Schedule(
+            assignments={shift_ids[s]: [employee_ids[e] for e in self.members(s)] for s in self.key_order}
+        )
+
+    def copy(self) -> "CompactSchedule":
+        out = CompactSchedule.__new__(CompactSchedule)
+        out.ids = self.ids
+        out.offsets = self.offsets
+        out.slots = array("i", self.slots)
+        out.counts = array("i", self.counts)
+        out.present = bytearray(self.present)
+        out.key_order = list(self.key_order)
+        out.journal = array("i")
+        return out
+
+    def ensure_keys(self) -> None:
+        # Every config shift becomes a key (like ``assignments.setdefault(sid, [])``).
+        for s in range(len(self.counts)):
+            self._mark_present(s)
+
+    # -- reads ---------------------------------------------------------------
+
+    def capacity(self, s: int) -> int:
+        return self.offsets[s + 1] - self.offsets[s]
+
+    def count(self, s: int) -> int:
+        return self.counts[s]
+
+    def get(self, s: int, k: int) -> int:
+        return self.slots[self.offsets[s] + k]
+
+    def members(self, s: int) -> array:
+        base = self.offsets[s]
+        return self.slots[base : base + self.counts[s]]
+
+    def contains(self, s: int, e: int) -> bool:
+        base = self.offsets[s]
+        return e in self.slots[base : base + self.counts[s]]
+
+    # -- in-place moves ------------------------------------------------------
+
+    def set(self, s: int, k: int, e: int) -> None:
+        pos = self.offsets[s] + k
+        self.journal.extend((_SET, s, k, self.slots[pos]))
+        self.slots[pos] = e
+
+    def insert(self, s: int, e: int) -> None:
+        if self.counts[s] == self.capacity(s):
+            self._grow(s)
+        k = self.counts[s]
+        self.slots[self.offsets[s] + k] = e
+        self.counts[s] = k + 1
+        self._mark_present(s)
+        self.journal.extend((_INSERT, s, k, e))
+
+    def delete(self, s: int, k: int) -> None:
+        base = self.offsets[s]
+        n = self.counts[s]
+        e = self.slots[base + k]
+        self.slots[base + k : base + n - 1] = self.slots[base + k + 1 : base + n]
+        self.slots[base + n - 1] = -1
+        self.counts[s] = n - 1
+        self.journal.extend((_DELETE, s, k, e))
+
+    def mark(self) -> int:
+        return len(self.journal)
+
+    def undo(self, mark: int = 0) -> None:
+        j = self.journal
+        while len(j) > mark:
+            op, s, k, e = j[-4:]
+            del j[-4:]
+            base = self.offsets[s]
+            if op == _SET:
+                self.slots[base + k] = e
+            elif op == _INSERT:
+                self.slots[base + k] = -1
+                self.counts[s] -= 1
+            else:
+                n = self.counts[s]
+                self.slots[base + k + 1 : base + n + 1] = self.slots[base + k : base + n]
+                self.slots[base + k] = e
+                self.counts[s] = n + 1
+
+    def forget(self) -> None:
+        # Accept all journaled moves.
+        del self.journal[:]
+
+    def _mark_present(self, s: int) -> None:
+        if not self.present[s]:
+            self.present[s] = 1
+            self.key_order.append(s)
+
+    def _grow(self, s: int) -> None:
+        # Rare: a shift needs more slots than it was sized for; rebuild with headroom.
+        extra = max(1, self.capacity(s))
+        end = self.offsets[s + 1]
+        self.slots[end:end] = array("i", [-1]) * extra
+        self.offsets = array("i", self.offsets)
+        for i in range(s + 1, len(self.offsets)):
+            self.offsets[i] += extra
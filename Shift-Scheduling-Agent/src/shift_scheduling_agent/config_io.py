@@ -1,42 +1,85 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import asdict
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Set
 
-from .domain import Config, Employee, Preferences, Policies, Schedule, Shift, SolverConfig, TimeWindow
+from .constraint_specs import spec_from_dict
+from .domain import Config, Employee, Preferences, Policies, Schedule, Shift, SolverConfig
+from .profiling import active, phase
+from .snapshot import is_snapshot, load_config_snapshot, load_schedule_snapshot
+from .streaming import RecordBuilder, group_availability, iter_config_items, iter_records
 
 
-def _dt(s: str) -> datetime:
-    # ISO without timezone → naive datetime
-    return datetime.fromisoformat(s)
+# Above this size load_config parses employees/shifts element by element.
+STREAM_THRESHOLD_BYTES = 32 * 1024 * 1024
 
 
-def load_config(path: str | Path) -> Config:
+def load_config(path: str | Path, stream: bool | None = None) -> Config:
+    """Load a JSON config.
+
+    ``stream`` (default: automatic above ``STREAM_THRESHOLD_BYTES``) parses the
+    ``employees``/``shifts`` arrays incrementally instead of materializing the whole
+    document. ``shifts_path`` / ``availability_path`` may point at ``.jsonl`` or
+    ``.csv`` side files, relative to the config. Binary snapshots written by
+    ``shift-agent compile`` are detected by their magic bytes and memory-mapped.
+    """
     p = Path(path)
-    data = json.loads(p.read_text(encoding="utf-8"))
+    if is_snapshot(p):
+        with phase("load_config.snapshot"):
+            return load_config_snapshot(p)
+    if stream is None:
+        stream = p.stat().st_size > STREAM_THRESHOLD_BYTES
+    if not stream:
+        with phase("load_config.json"):
+            return _parse_config(json.loads(p.read_text(encoding="utf-8")), p.parent)
+    with phase("load_config.stream"):
+        return _load_streamed(p)
 
-    employees: Dict[str, Employee] = {}
-    for e in data["employees"]:
-        availability = [TimeWindow(_dt(w["start"]), _dt(w["end"])) for w in e.get("availability", [])]
-        employees[e["id"]] = Employee(
-            id=e["id"],
-            name=e.get("name", e["id"]),
-            skills=set(e.get("skills", [])),
-            availability=availability,
-        )
 
+def _load_streamed(p: Path) -> Config:
+    builder = RecordBuilder()
+    employees: Dict[str, Employee] = {}
     shifts: Dict[str, Shift] = {}
-    for s in data["shifts"]:
-        shifts[s["id"]] = Shift(
-            id=s["id"],
-            start=_dt(s["start"]),
-            end=_dt(s["end"]),
-            required_headcount=int(s.get("required_headcount", 1)),
-            required_skills=set(s.get("required_skills", [])),
-        )
+    data: Dict[str, Any] = {}
+    with p.open(encoding="utf-8") as f:
+        for key, value in iter_config_items(f):
+            if key == "employees":
+                employees[value["id"]] = builder.employee(value)
+            elif key == "shifts":
+                shifts[value["id"]] = builder.shift(value)
+            else:
+                data[key] = value
+    return _assemble(data, employees, shifts, builder, p.parent)
+
+
+def _parse_config(data: Dict[str, Any], base: Path) -> Config:
+    builder = RecordBuilder()
+    employees = {e["id"]: builder.employee(e) for e in data.get("employees", [])}
+    shifts = {s["id"]: builder.shift(s) for s in data.get("shifts", [])}
+    return _assemble(data, employees, shifts, builder, base)
+
+
+def _assemble(
+    data: Dict[str, Any],
+    employees: Dict[str, Employee],
+    shifts: Dict[str, Shift],
+    builder: RecordBuilder,
+    base: Path,
+) -> Config:
+    if data.get("shifts_path"):
+        for row in iter_records(base / data["shifts_path"]):
+            shifts[row["id"]] = builder.shift(row)
+    if data.get("availability_path"):
+        extra = group_availability(builder, iter_records(base / data["availability_path"]))
+        for eid, windows in extra.items():
+            if eid not in employees:
+                raise ValueError(f"Availability for unknown employee: {eid}")
+            employees[eid].availability.extend(windows)
 
     pol = data.get("policies", {})
     policies = Policies(
@@ -49,6 +92,7 @@ def load_config(path: str | Path) -> Config:
     preferences = Preferences(
         fairness_weight=float(pref.get("fairness_weight", 1.0)),
         preference_weight=float(pref.get("preference_weight", 0.3)),
+        churn_weight=float(pref.get("churn_weight", 1.0)),
         employee_shift_preferences=pref.get("employee_shift_preferences", {}) or {},
     )
 
@@ -58,9 +102,21 @@ def load_config(path: str | Path) -> Config:
         max_iterations=int(sol.get("max_iterations", 800)),
         random_seed=int(sol.get("random_seed", 7)),
         backtracking_limit=int(sol.get("backtracking_limit", 3000)),
+        strategy=str(sol.get("strategy", "swap")),
+        construction=str(sol.get("construction", "regret")),
+        penalty_weight=float(sol.get("penalty_weight", 10.0)),
+        initial_temperature=float(sol.get("initial_temperature", 2.0)),
+        cooling_rate=float(sol.get("cooling_rate", 0.999)),
+        tabu_tenure=int(sol.get("tabu_tenure", 20)),
+        workers=int(sol.get("workers", 1)),
+        decompose=bool(sol.get("decompose", False)),
+        window_days=int(sol.get("window_days", 0)),
+        window_overlap_days=int(sol.get("window_overlap_days", 1)),
+        symmetry=bool(sol.get("symmetry", True)),
     )
 
     meta = data.get("meta", {}) or {}
+    constraints = tuple(spec_from_dict(raw) for raw in data.get("constraints", []) or [])
 
     return Config(
         employees=employees,
@@ -69,11 +125,93 @@ def load_config(path: str | Path) -> Config:
         preferences=preferences,
         solver=solver,
         meta=meta,
+        constraints=constraints,
     )
 
 
+@dataclass
+class _CacheEntry:
+    mtime_ns: int
+    size: int
+    digest: str
+    config: Config
+
+
+class ConfigCache:
+    """Bounded LRU of parsed configs keyed by resolved path.
+
+    A lookup stats the file: unchanged (mtime, size) is a hit without reading it;
+    otherwise the content hash decides (a touched but identical file is still a hit).
+    Side files named by ``shifts_path``/``availability_path`` are not tracked; call
+    ``invalidate`` after changing them.
+    The cached ``Config`` carries its derived indexes, so those are reused too.
+    Callers must treat returned configs as read-only.
+    """
+
+    def __init__(self, maxsize: int = 16) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str | Path) -> Config:
+        p = Path(path).resolve()
+        key = str(p)
+        st = p.stat()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.mtime_ns, entry.size) == (st.st_mtime_ns, st.st_size):
+                return self._hit(key, entry)
+
+        h = hashlib.sha256()
+        with p.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.digest == digest:
+                entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+                return self._hit(key, entry)
+            self.misses += 1
+        prof = active()
+        if prof is not None:
+            prof.count("config_cache.misses")
+
+        config = load_config(p)
+        with self._lock:
+            self._entries[key] = _CacheEntry(st.st_mtime_ns, st.st_size, digest, config)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return config
+
+    def _hit(self, key: str, entry: _CacheEntry) -> Config:
+        self.hits += 1
+        prof = active()
+        if prof is not None:
+            prof.count("config_cache.hits")
+        self._entries.move_to_end(key)
+        return entry.config
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        """Drop one path, or everything when ``path`` is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(path).resolve()), None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
 def load_schedule(path: str | Path) -> Schedule:
     p = Path(path)
+    if is_snapshot(p):
+        return load_schedule_snapshot(p)
     data = json.loads(p.read_text(encoding="utf-8"))
     return Schedule(assignments={k: list(v) for k, v in data.get("assignments", {}).items()})
 
@@ -83,3 +221,41 @@ def save_schedule(schedule: Schedule, path: str | Path) -> None:
     payload = {"assignments": schedule.assignments}
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def config_to_dict(config: Config) -> Dict[str, Any]:
+    """Inverse of ``load_config``: the JSON layout with every record inline."""
+    out: Dict[str, Any] = {
+        "meta": config.meta,
+        "solver": asdict(config.solver),
+        "policies": asdict(config.policies),
+        "preferences": asdict(config.preferences),
+        "employees": [
+            {
+                "id": e.id,
+                "name": e.name,
+                "skills": sorted(e.skills),
+                "availability": [{"start": w.start.isoformat(), "end": w.end.isoformat()} for w in e.availability],
+            }
+            for e in config.employees.values()
+        ],
+        "shifts": [
+            {
+                "id": sh.id,
+                "start": sh.start.isoformat(),
+                "end": sh.end.isoformat(),
+                "required_headcount": sh.required_headcount,
+                "required_skills": sorted(sh.required_skills),
+            }
+            for sh in config.shifts.values()
+        ],
+    }
+    if config.constraints:
+        out["constraints"] = [asdict(spec) for spec in config.constraints]
+    return out
+
+
+def save_config(config: Config, path: str | Path) -> None:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps(config_to_dict(config), indent=2), encoding="utf-8")
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .compact import RosterIds
+from .domain import Config, ConstraintSpec, Schedule
+from .eligibility import EligibilityIndex
+from .timeline import CONSECUTIVE_GAP, ShiftTimes
+
+
+@dataclass(frozen=True)
+class Violation:
+    code: str
+    message: str
+    shift_id: str | None = None
+    employee_id: str | None = None
+
+
+# kind -> (scope, default code); ``max_shifts`` with ``window_days`` becomes
+# employee_window scoped.
+KINDS: Dict[str, Tuple[str, str]] = {
+    "headcount": ("shift", "UNDER_COVERAGE"),
+    "min_skilled": ("shift", "MIN_SKILLED"),
+    "availability": ("assignment", "NOT_AVAILABLE"),
+    "skills": ("assignment", "MISSING_SKILL"),
+    "max_shifts": ("employee", "MAX_SHIFTS_WEEK"),
+    "max_hours": ("employee_window", "MAX_HOURS"),
+    "min_rest": ("employee", "MIN_REST"),
+    "max_consecutive": ("employee", "MAX_CONSECUTIVE"),
+}
+
+BUILTIN_SPECS: Tuple[ConstraintSpec, ...] = (
+    ConstraintSpec("coverage", "headcount"),
+    ConstraintSpec("availability", "availability"),
+    ConstraintSpec("skills", "skills"),
+    ConstraintSpec("max_shifts_per_week", "max_shifts"),
+    ConstraintSpec("min_rest_hours", "min_rest"),
+    ConstraintSpec("max_consecutive_shifts", "max_consecutive"),
+)
+
+SEVERITIES = ("hard", "soft")
+
+
+def spec_from_dict(raw: Dict[str, Any]) -> ConstraintSpec:
+    """Parse a ``constraints`` entry of a config file."""
+    spec = ConstraintSpec(
+        name=str(raw.get("name") or raw["kind"]),
+        kind=str(raw["kind"]),
+        params=dict(raw.get("params", {}) or {}),
+        code=str(raw.get("code", "")),
+        severity=str(raw.get("severity", "hard")),
+    )
+    scope_of(spec)
+    return spec
+
+
+def scope_of(spec: ConstraintSpec) -> str:
+    if spec.kind not in KINDS:
+        raise ValueError(f"Constraint {spec.name!r}: unknown kind {spec.kind!r} (expected one of {sorted(KINDS)})")
+    if spec.severity not in SEVERITIES:
+        raise ValueError(f"Constraint {spec.name!r}: severity must be 'hard' or 'soft'")
+    scope = KINDS[spec.kind][0]
+    if spec.kind == "max_shifts" and spec.params.get("window_days"):
+        return "employee_window"
+    return scope
+
+
+def code_of(spec: ConstraintSpec) -> str:
+    return spec.code or KINDS[spec.kind][1]
+
+
+# Checker signatures, per scope (``out`` collects the spec's violations):
+#   shift:      fn(s, sid, filled, members, out)       members: known employee positions
+#   assignment: per-shift employee masks; bit clear -> violation via message(sid, eid)
+#   employee:   fn(eid, timeline, total, gaps, out)    timeline sorted by start;
+#               gaps[i] is the rest between timeline[i] and timeline[i + 1]
+ShiftCheck = Callable[[int, str, int, List[int], List[Violation]], None]
+EmployeeCheck = Callable[[str, List[int], int, List[int], List[Violation]], None]
+
+
+class CompiledConstraints:
+    """Constraint specs compiled against one config into fused checkers.
+
+    ``check`` validates a schedule in one pass over its assignments (assignment-scope
+    specs are per-shift bitmask tests against the ``EligibilityIndex``), one pass over
+    the shifts and one pass over employee timelines; each timeline is sorted and its
+    gaps computed once for every employee-scoped spec. ``employee_count`` and
+    ``shift_count`` re-check a single employee or shift, for incremental evaluation.
+    """
+
+    def __init__(self, config: Config, specs: Sequence[ConstraintSpec]) -> None:
+        self.specs = tuple(specs)
+        self.ids = RosterIds.for_config(config)
+        times = ShiftTimes.for_config(config)
+        self._start, self._end = times.start, times.end
+        self._shifts = list(config.shifts.values())
+        self._index = EligibilityIndex.for_config(config)
+        self._config = config
+
+        self._shift_checks: List[Tuple[int, ShiftCheck]] = []
+        self._assign_checks: List[Tuple[int, List[int], Callable[[str, str], Violation]]] = []
+        self._employee_checks: List[Tuple[int, EmployeeCheck]] = []
+        self._reports_unknown = -1
+        self.needs_members = False
+        for i, spec in enumerate(self.specs):
+            scope = scope_of(spec)
+            build = getattr(self, f"_compile_{spec.kind}")
+            if scope == "shift":
+                self._shift_checks.append((i, build(spec)))
+            elif scope == "assignment":
+                masks, message = build(spec)
+                self._assign_checks.append((i, masks, message))
+                if spec.kind == "availability" and self._reports_unknown < 0:
+                    self._reports_unknown = i
+            else:
+                self._employee_checks.append((i, build(spec)))
+        self.hard = [spec.severity == "hard" for spec in self.specs]
+
+    @staticmethod
+    def for_config(config: Config, specs: Sequence[ConstraintSpec]) -> "CompiledConstraints":
+        return config.derived(f"constraints:{specs!r}", lambda c: CompiledConstraints(c, specs))
+
+    # -- full validation ----------------------------------------------------
+
+    def check(self, schedule: Schedule) -> List[List[Violation]]:
+        """Violations per spec (same order as ``specs``), in one fused pass."""
+        out: List[List[Violation]] = [[] for _ in self.specs]
+        shift_pos, employee_pos = self.ids.shift_pos, self.ids.employee_pos
+        assign_checks = self._assign_checks
+        unknown = out[self._reports_unknown] if self._reports_unknown >= 0 else None
+        needs_members = self.needs_members
+        filled = [0] * len(self._shifts)
+        members: List[List[int]] = [[] for _ in self._shifts] if needs_members else []
+        timelines: Dict[str, List[int]] = {}
+        totals: Dict[str, int] = {}
+
+        for sid, eids in schedule.assignments.items():
+            s = shift_pos.get(sid)
+            if s is None:
+                if unknown is not None:
+                    unknown.append(Violation(code="UNKNOWN_SHIFT", message=f"Unknown shift: {sid}", shift_id=sid))
+                for eid in eids:
+                    totals[eid] = totals.get(eid, 0) + 1
+                    if eid not in timelines:
+                        timelines[eid] = []
+                continue
+            filled[s] = len(eids)
+            for eid in eids:
+                tl = timelines.get(eid)
+                if tl is None:
+                    tl = timelines[eid] = []
+                tl.append(s)
+                e = employee_pos.get(eid)
+                if e is None:
+                    if unknown is not None:
+                        unknown.append(
+                            Violation(
+                                code="UNKNOWN_EMPLOYEE",
+                                message=f"Unknown employee: {eid}",
+                                shift_id=sid,
+                                employee_id=eid,
+                            )
+                        )
+                    continue
+                if needs_members:
+                    members[s].append(e)
+                for i, masks, message in assign_checks:
+                    if not masks[s] >> e & 1:
+                        out[i].append(message(sid, eid))
+
+        if self._shift_checks:
+            shift_ids = self.ids.shift_ids
+            for s, sid in enumerate(shift_ids):
+                m = members[s] if needs_members else []
+                for i, fn in self._shift_checks:
+                    fn(s, sid, filled[s], m, out[i])
+
+        if self._employee_checks:
+            start, end = self._start, self._end
+            for eid, tl in timelines.items():
+                tl.sort(key=start.__getitem__)
+                gaps = [start[tl[k + 1]] - end[tl[k]] for k in range(len(tl) - 1)]
+                total = len(tl) + totals.get(eid, 0)
+                for i, fn in self._employee_checks:
+                    fn(eid, tl, total, gaps, out[i])
+        return out
+
+    # -- incremental re-checks -------------------------------------------------
+
+    def employee_count(self, e: int, timeline: List[int]) -> int:
+        """Hard violations of employee ``e`` given its start-sorted shifts."""
+        eid = self.ids.employee_ids[e]
+        n = 0
+        for i, masks, _ in self._assign_checks:
+            if self.hard[i]:
+                n += sum(1 for s in timeline if not masks[s] >> e & 1)
+        if self._employee_checks:
+            start, end = self._start, self._end
+            gaps = [start[timeline[k + 1]] - end[timeline[k]] for k in range(len(timeline) - 1)]
+            found: List[Violation] = []
+            for i, fn in self._employee_checks:
+                if self.hard[i]:
+                    fn(eid, timeline, len(timeline), gaps, found)
+            n += len(found)
+        return n
+
+    def shift_count(self, s: int, members: Sequence[int]) -> int:
+        """Hard violations of shift ``s`` staffed by ``members``."""
+        found: List[Violation] = []
+        sid = self.ids.shift_ids[s]
+        for i, fn in self._shift_checks:
+            if self.hard[i]:
+                fn(s, sid, len(members), list(members), found)
+        return len(found)
+
+    # -- kinds ----------------------------------------------------------------
+
+    def _policy(self, spec: ConstraintSpec, key: str, policy: str) -> Any:
+        value = spec.params.get(key)
+        return getattr(self._config.policies, policy) if value is None else value
+
+    def _compile_headcount(self, spec: ConstraintSpec) -> ShiftCheck:
+        code = code_of(spec)
+        override = spec.params.get("min")
+        required = [sh.required_headcount if override is None else int(override) for sh in self._shifts]
+
+        def check(s: int, sid: str, filled: int, members: List[int], out: List[Violation]) -> None:
+            if filled < required[s]:
+                out.append(Violation(code=code, message=f"Shift {sid} needs {required[s]} but has {filled}", shift_id=sid))
+
+        return check
+
+    def _compile_min_skilled(self, spec: ConstraintSpec) -> ShiftCheck:
+        code = code_of(spec)
+        skill = str(spec.params["skill"])
+        count = int(spec.params.get("count", 1))
+        only = spec.params.get("shift_skill")
+        applies = [only is None or only in sh.required_skills for sh in self._shifts]
+        mask = self._index.skills_mask({skill})
+        self.needs_members = True
+
+        def check(s: int, sid: str, filled: int, members: List[int], out: List[Violation]) -> None:
+            if not applies[s]:
+                return
+            have = sum(1 for e in members if mask >> e & 1)
+            if have < count:
+                out.append(
+                    Violation(
+                        code=code, message=f"Shift {sid} needs {count} with {skill} but has {have}", shift_id=sid
+                    )
+                )
+
+        return check
+
+    def _compile_availability(self, spec: ConstraintSpec) -> Tuple[List[int], Callable[[str, str], Violation]]:
+        code = code_of(spec)
+
+        def message(sid: str, eid: str) -> Violation:
+            return Violation(code=code, message=f"{eid} not available for shift {sid}", shift_id=sid, employee_id=eid)
+
+        return self._index.available_by_shift, message
+
+    def _compile_skills(self, spec: ConstraintSpec) -> Tuple[List[int], Callable[[str, str], Violation]]:
+        code = code_of(spec)
+        shifts = self._config.shifts
+        masks = [
+            skills if sh.required_skills else self._index.all_mask
+            for skills, sh in zip(self._index.skills_by_shift, self._shifts)
+        ]
+
+        def message(sid: str, eid: str) -> Violation:
+            req = sorted(shifts[sid].required_skills)
+            return Violation(
+                code=code, message=f"{eid} missing skill(s) for {sid}: requires {req}", shift_id=sid, employee_id=eid
+            )
+
+        return masks, message
+
+    def _compile_max_shifts(self, spec: ConstraintSpec) -> EmployeeCheck:
+        code = code_of(spec)
+        cap = int(self._policy(spec, "limit", "max_shifts_per_week"))
+        days = float(spec.params.get("window_days") or 0)
+        if days:
+            return self._window_check(code, cap, days, None, "shifts")
+
+        def check(eid: str, tl: List[int], total: int, gaps: List[int], out: List[Violation]) -> None:
+            if total > cap:
+                out.append(Violation(code=code, message=f"{eid} assigned {total} shifts (cap {cap})", employee_id=eid))
+
+        return check
+
+    def _compile_max_hours(self, spec: ConstraintSpec) -> EmployeeCheck:
+        hours = [(end - start) / 3600.0 for start, end in zip(self._start, self._end)]
+        limit = float(spec.params["limit"])
+        return self._window_check(code_of(spec), limit, float(spec.params.get("window_days", 7)), hours, "hours")
+
+    def _window_check(
+        self, code: str, limit: float, days: float, weight: Optional[List[float]], unit: str
+    ) -> EmployeeCheck:
+        # Sliding window over the sorted timeline: shifts starting within ``days`` of
+        # each shift's start; one violation per employee, for the first window over.
+        span = days * 86400
+        start = self._start
+        shift_ids = self.ids.shift_ids
+
+        def check(eid: str, tl: List[int], total: int, gaps: List[int], out: List[Violation]) -> None:
+            lo = 0
+            load = 0.0
+            for s in tl:
+                load += 1.0 if weight is None else weight[s]
+                while start[s] - start[tl[lo]] >= span:
+                    load -= 1.0 if weight is None else weight[tl[lo]]
+                    lo += 1
+                if load > limit + 1e-9:
+                    first = shift_ids[tl[lo]]
+                    out.append(
+                        Violation(
+                            code=code,
+                            message=f"{eid} has {load:g} {unit} within {days:g} day(s) from {first} (cap {limit:g})",
+                            employee_id=eid,
+                        )
+                    )
+                    return
+
+        return check
+
+    def _compile_min_rest(self, spec: ConstraintSpec) -> EmployeeCheck:
+        code = code_of(spec)
+        min_rest = float(self._policy(spec, "hours", "min_rest_hours")) * 3600
+        shift_ids = self.ids.shift_ids
+
+        def check(eid: str, tl: List[int], total: int, gaps: List[int], out: List[Violation]) -> None:
+            for k, gap in enumerate(gaps):
+                if gap < min_rest:
+                    out.append(
+                        Violation(
+                            code=code,
+                            message=f"{eid} has insufficient rest between {shift_ids[tl[k]]} and {shift_ids[tl[k + 1]]}",
+                            employee_id=eid,
+                        )
+                    )
+
+        return check
+
+    def _compile_max_consecutive(self, spec: ConstraintSpec) -> EmployeeCheck:
+        code = code_of(spec)
+        cap = int(self._policy(spec, "limit", "max_consecutive_shifts"))
+        within = float(spec.params.get("gap_hours", CONSECUTIVE_GAP / 3600)) * 3600
+
+        def check(eid: str, tl: List[int], total: int, gaps: List[int], out: List[Violation]) -> None:
+            # "Consecutive" heuristic: next shift starts within 18 hours of previous end
+            run = 1
+            for gap in gaps:
+                run = run + 1 if gap <= within else 1
+                if run > cap:
+                    out.append(
+                        Violation(code=code, message=f"{eid} exceeds max consecutive shifts ({cap})", employee_id=eid)
+                    )
+                    return
+
+        return check
@@ -1,178 +1,119 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import timedelta
+from dataclasses import dataclass, field
 from typing import Callable, Dict, List, Sequence, Tuple
 
-from .domain import Config, Schedule
+from .batch_validation import BatchResult, BatchValidator
+from .constraint_specs import BUILTIN_SPECS, CompiledConstraints, Violation, code_of
+from .domain import Config, ConstraintSpec, Schedule
+from .profiling import active
 
+ConstraintFn = Callable[[Config, Schedule], List[Violation]]
 
-@dataclass(frozen=True)
-class Violation:
-    code: str
-    message: str
-    shift_id: str | None = None
-    employee_id: str | None = None
 
+class SpecCheck:
+    """A ``ConstraintFn`` backed by a declarative ``ConstraintSpec``.
 
-ConstraintFn = Callable[[Config, Schedule], List[Violation]]
+    Called on its own it runs the compiled checker for just this spec; inside a
+    ``ConstraintSuite`` all spec-backed entries are fused into one pass.
+    """
 
+    def __init__(self, spec: ConstraintSpec) -> None:
+        self.spec = spec
 
-def _employee_availability_violation(config: Config, schedule: Schedule) -> List[Violation]:
-    out: List[Violation] = []
-    for sid, eids in schedule.assignments.items():
-        shift = config.shifts.get(sid)
-        if shift is None:
-            out.append(Violation(code="UNKNOWN_SHIFT", message=f"Unknown shift: {sid}", shift_id=sid))
-            continue
-        for eid in eids:
-            emp = config.employees.get(eid)
-            if emp is None:
-                out.append(Violation(code="UNKNOWN_EMPLOYEE", message=f"Unknown employee: {eid}", shift_id=sid, employee_id=eid))
-                continue
-            if not any(w.contains(shift.start, shift.end) for w in emp.availability):
-                out.append(
-                    Violation(
-                        code="NOT_AVAILABLE",
-                        message=f"{eid} not available for shift {sid}",
-                        shift_id=sid,
-                        employee_id=eid,
-                    )
-                )
-    return out
-
-
-def _skills_violation(config: Config, schedule: Schedule) -> List[Violation]:
-    out: List[Violation] = []
-    for sid, eids in schedule.assignments.items():
-        shift = config.shifts.get(sid)
-        if shift is None:
-            continue
-        req = shift.required_skills
-        if not req:
-            continue
-        for eid in eids:
-            emp = config.employees.get(eid)
-            if emp is None:
-                continue
-            if not req.issubset(emp.skills):
-                out.append(
-                    Violation(
-                        code="MISSING_SKILL",
-                        message=f"{eid} missing skill(s) for {sid}: requires {sorted(req)}",
-                        shift_id=sid,
-                        employee_id=eid,
-                    )
-                )
-    return out
-
-
-def _coverage_violation(config: Config, schedule: Schedule) -> List[Violation]:
-    out: List[Violation] = []
-    for sid, shift in config.shifts.items():
-        assigned = schedule.assignments.get(sid, [])
-        if len(assigned) < shift.required_headcount:
-            out.append(
-                Violation(
-                    code="UNDER_COVERAGE",
-                    message=f"Shift {sid} needs {shift.required_headcount} but has {len(assigned)}",
-                    shift_id=sid,
-                )
-            )
-    return out
-
-
-def _max_shifts_per_week_violation(config: Config, schedule: Schedule) -> List[Violation]:
-    out: List[Violation] = []
-    emp_to_shifts = schedule.employee_shifts()
-    cap = config.policies.max_shifts_per_week
-    for eid, sids in emp_to_shifts.items():
-        if len(sids) > cap:
-            out.append(
-                Violation(
-                    code="MAX_SHIFTS_WEEK",
-                    message=f"{eid} assigned {len(sids)} shifts (cap {cap})",
-                    employee_id=eid,
-                )
-            )
-    return out
-
-
-def _min_rest_violation(config: Config, schedule: Schedule) -> List[Violation]:
-    out: List[Violation] = []
-    min_rest = timedelta(hours=config.policies.min_rest_hours)
-
-    emp_to_shift_ids = schedule.employee_shifts()
-    for eid, sids in emp_to_shift_ids.items():
-        shifts = [config.shifts[sid] for sid in sids if sid in config.shifts]
-        shifts.sort(key=lambda x: x.start)
-        for a, b in zip(shifts, shifts[1:]):
-            if b.start - a.end < min_rest:
-                out.append(
-                    Violation(
-                        code="MIN_REST",
-                        message=f"{eid} has insufficient rest between {a.id} and {b.id}",
-                        employee_id=eid,
-                    )
-                )
-    return out
-
-
-def _max_consecutive_violation(config: Config, schedule: Schedule) -> List[Violation]:
-    out: List[Violation] = []
-    cap = config.policies.max_consecutive_shifts
-    emp_to_shift_ids = schedule.employee_shifts()
-
-    for eid, sids in emp_to_shift_ids.items():
-        shifts = [config.shifts[sid] for sid in sids if sid in config.shifts]
-        shifts.sort(key=lambda x: x.start)
-        run = 1
-        for prev, cur in zip(shifts, shifts[1:]):
-            # "Consecutive" heuristic: next shift starts within 18 hours of previous end
-            if cur.start - prev.end <= timedelta(hours=18):
-                run += 1
-            else:
-                run = 1
-            if run > cap:
-                out.append(
-                    Violation(
-                        code="MAX_CONSECUTIVE",
-                        message=f"{eid} exceeds max consecutive shifts ({cap})",
-                        employee_id=eid,
-                    )
-                )
-                break
-    return out
+    def __call__(self, config: Config, schedule: Schedule) -> List[Violation]:
+        return CompiledConstraints.for_config(config, (self.spec,)).check(schedule)[0]
+
+    def __repr__(self) -> str:
+        return f"SpecCheck({self.spec!r})"
 
 
 @dataclass(frozen=True)
 class ValidationReport:
     ok: bool
     violations: List[Violation]
+    # violations of soft (``severity: "soft"``) specs; they don't affect ``ok``
+    warnings: List[Violation] = field(default_factory=list)
 
     def to_dict(self) -> Dict:
-        return {"ok": self.ok, "violations": [v.__dict__ for v in self.violations]}
+        out = {"ok": self.ok, "violations": [v.__dict__ for v in self.violations]}
+        if self.warnings:
+            out["warnings"] = [v.__dict__ for v in self.warnings]
+        return out
 
 
 class ConstraintSuite:
-    def __init__(self, constraints: Sequence[Tuple[str, ConstraintFn]]):
+    """Named constraint checks, run in order.
+
+    Entries are plain ``ConstraintFn`` callables or ``SpecCheck``s; the spec-backed
+    ones are validated together in one fused pass (``CompiledConstraints``). With
+    ``include_config`` the config's own ``constraints`` are appended at validation time.
+    """
+
+    def __init__(self, constraints: Sequence[Tuple[str, ConstraintFn]], include_config: bool = False):
         self._constraints = list(constraints)
+        self.include_config = include_config
 
     @staticmethod
     def default() -> "ConstraintSuite":
-        return ConstraintSuite(
-            [
-                ("coverage", _coverage_violation),
-                ("availability", _employee_availability_violation),
-                ("skills", _skills_violation),
-                ("max_shifts_per_week", _max_shifts_per_week_violation),
-                ("min_rest_hours", _min_rest_violation),
-                ("max_consecutive_shifts", _max_consecutive_violation),
-            ]
-        )
+        return ConstraintSuite.from_specs(BUILTIN_SPECS, include_config=True)
+
+    @staticmethod
+    def from_specs(specs: Sequence[ConstraintSpec], include_config: bool = False) -> "ConstraintSuite":
+        return ConstraintSuite([(spec.name, SpecCheck(spec)) for spec in specs], include_config=include_config)
+
+    def entries(self, config: Config) -> List[Tuple[str, ConstraintFn]]:
+        if self.include_config and config.constraints:
+            return self._constraints + [(spec.name, SpecCheck(spec)) for spec in config.constraints]
+        return self._constraints
 
     def validate(self, config: Config, schedule: Schedule) -> ValidationReport:
+        entries = self.entries(config)
+        prof = active()
+        found: List[List[Violation]] = []
+        if prof is None:
+            specs = tuple(fn.spec for _, fn in entries if isinstance(fn, SpecCheck))
+            fused = iter(CompiledConstraints.for_config(config, specs).check(schedule) if specs else ())
+            for _, fn in entries:
+                found.append(next(fused) if isinstance(fn, SpecCheck) else fn(config, schedule))
+        else:
+            # One phase per constraint, so specs run unfused here.
+            for name, fn in entries:
+                with prof.phase(f"constraint.{name}"):
+                    found.append(fn(config, schedule))
+            prof.count("validate.calls")
+
         violations: List[Violation] = []
-        for _, fn in self._constraints:
-            violations.extend(fn(config, schedule))
-        return ValidationReport(ok=(len(violations) == 0), violations=violations)
+        warnings: List[Violation] = []
+        for (_, fn), vs in zip(entries, found):
+            soft = isinstance(fn, SpecCheck) and fn.spec.severity == "soft"
+            (warnings if soft else violations).extend(vs)
+        return ValidationReport(ok=not violations, violations=violations, warnings=warnings)
+
+    def validate_batch(self, config: Config, schedules: Sequence[Schedule], details: bool = False) -> List[BatchResult]:
+        """Validate many schedules against one config; per-schedule counts by code.
+
+        Suites of only built-in specs run through the shared ``BatchValidator``
+        encoding; other constraints (and schedules it can't encode) use ``validate``. With
+        ``details=True`` failing schedules also carry their ``Violation`` list.
+        """
+        entries = self.entries(config)
+        builtin = all(isinstance(fn, SpecCheck) and fn.spec in BUILTIN_SPECS for _, fn in entries)
+        fast = BatchValidator.for_config(config) if builtin else None
+        wanted = {code_of(fn.spec) for _, fn in entries} if builtin else set()
+        out: List[BatchResult] = []
+        for schedule in schedules:
+            counts = fast.counts(schedule) if fast is not None else None
+            if counts is None:
+                report = self.validate(config, schedule)
+                by_code: Dict[str, int] = {}
+                for v in report.violations:
+                    by_code[v.code] = by_code.get(v.code, 0) + 1
+                out.append(BatchResult(report.ok, by_code, report.violations if details else None))
+                continue
+            counts = {c: n for c, n in counts.items() if c in wanted and n}
+            violations = None
+            if details:
+                violations = self.validate(config, schedule).violations if counts else []
+            out.append(BatchResult(not counts, counts, violations))
+        return out
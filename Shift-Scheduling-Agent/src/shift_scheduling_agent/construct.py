@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import heapq
+import random
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+from .compact import RosterIds
+from .domain import Config, Schedule
+from .eligibility import EligibilityIndex, iter_bits
+from .timeline import Timeline, TimelineRules
+
+
+class _Construction:
+    """State of one regret construction: per-employee timelines and, per open shift,
+    the bitmask of employees that can still take it without breaking a hard rule."""
+
+    def __init__(self, config: Config) -> None:
+        self.ids = RosterIds.for_config(config)
+        self.rules = rules = TimelineRules.for_config(config)
+        self.masks = masks = EligibilityIndex.for_config(config).eligible_by_shift
+        n_shifts, n_emp = len(masks), len(self.ids.employee_ids)
+        self.start, self.end = rules.start, rules.end
+        self.cap = config.policies.max_shifts_per_week
+        self.need = [sh.required_headcount for sh in config.shifts.values()]
+        self.crew: List[List[int]] = [[] for _ in range(n_shifts)]
+        self.load = [0] * n_emp
+        self.timelines = [Timeline(rules) for _ in range(n_emp)]
+
+        fits = self.cap > 0 and rules.max_run >= 1
+        self.feasible = [mask if fits else 0 for mask in masks]
+        # Each employee's eligible shifts by start, for the window re-checks after a pick.
+        by_emp: List[List[int]] = [[] for _ in range(n_emp)]
+        for s in sorted(range(n_shifts), key=self.start.__getitem__):
+            for e in iter_bits(masks[s]):
+                by_emp[e].append(s)
+        self.by_emp = by_emp
+        self.by_emp_start = [[self.start[s] for s in shifts] for shifts in by_emp]
+        # An assignment can only change feasibility of shifts this close: the rest
+        # window, or the longest run of max_run + 1 shifts chained by short gaps.
+        longest = max((e - s for s, e in zip(self.start, self.end)), default=0)
+        self.reach = max(rules.min_rest, (rules.max_run + 1) * (rules.consecutive_gap + longest)) + longest
+
+    def slack(self, s: int) -> int:
+        return self.feasible[s].bit_count() - self.need[s]
+
+    def fits(self, s: int, e: int) -> bool:
+        tl = self.timelines[e]
+        return self.load[e] < self.cap and tl.rest_ok(s) and tl.run_through(s) <= self.rules.max_run
+
+    def window(self, e: int, s: int) -> List[int]:
+        starts = self.by_emp_start[e]
+        lo = bisect_left(starts, self.start[s] - self.reach)
+        hi = bisect_right(starts, self.end[s] + self.reach)
+        return self.by_emp[e][lo:hi]
+
+    def cost(self, s: int, e: int) -> Tuple[int, int, int]:
+        # (open shifts this pick would leave short, load, open shifts it competes with
+        # inside the rest window)
+        bit = 1 << e
+        min_rest = self.rules.min_rest
+        short = near = 0
+        if self.load[e] + 1 >= self.cap:
+            nearby = [t for t in self.by_emp[e] if t != s and self.feasible[t] & bit and self.need[t] > 0]
+            short = sum(self.slack(t) <= 0 for t in nearby)
+            return short, self.load[e], len(nearby)
+        for t in self.window(e, s):
+            if t == s or not (self.feasible[t] & bit) or self.need[t] <= 0:
+                continue
+            if self.start[t] < self.end[s] + min_rest and self.end[t] + min_rest > self.start[s]:
+                near += 1
+                short += self.slack(t) <= 0
+        return short, self.load[e], near
+
+    def assign(self, s: int, e: int) -> List[int]:
+        """Place ``e`` on ``s``; returns the open shifts whose candidate set shrank."""
+        bit = 1 << e
+        self.place(s, e)
+        self.feasible[s] &= ~bit
+        changed = [s]
+        candidates = self.by_emp[e] if self.load[e] >= self.cap else self.window(e, s)
+        for t in candidates:
+            if t == s or self.need[t] <= 0 or not (self.feasible[t] & bit):
+                continue
+            if self.load[e] >= self.cap or not self.fits(t, e):
+                self.feasible[t] &= ~bit
+                changed.append(t)
+        return changed
+
+    def place(self, s: int, e: int) -> None:
+        self.crew[s].append(e)
+        self.need[s] -= 1
+        self.load[e] += 1
+        self.timelines[e].insert(s)
+
+    def unplace(self, s: int, e: int) -> None:
+        self.crew[s].remove(e)
+        self.need[s] += 1
+        self.load[e] -= 1
+        self.timelines[e].remove(s)
+
+    def hand_over(self, s: int) -> bool:
+        """Staff one slot of ``s`` by moving a blocked employee ``e`` onto it and
+        handing ``e``'s conflicting shift ``t`` to someone else who fits."""
+        for e in iter_bits(self.masks[s]):
+            if e in self.crew[s]:
+                continue
+            blockers = list(self.timelines[e]) if self.load[e] >= self.cap else self.window(e, s)
+            for t in blockers:
+                if e not in self.crew[t]:
+                    continue
+                self.unplace(t, e)
+                if self.fits(s, e):
+                    self.place(s, e)
+                    for e2 in iter_bits(self.masks[t]):
+                        if e2 != e and e2 not in self.crew[t] and self.fits(t, e2):
+                            self.place(t, e2)
+                            return True
+                    self.unplace(s, e)
+                self.place(t, e)
+        return False
+
+
+def regret_construct(config: Config, rnd: random.Random) -> Schedule:
+    """Greedy construction that keeps rest, run and cap rules while it assigns.
+
+    Open shifts sit in a priority queue keyed by slack (employees who can still take
+    the shift minus the headcount still needed), so the shift with the fewest spare
+    candidates is staffed next; the keys of the shifts a pick affects are refreshed
+    lazily. Among the candidates, the one that leaves the fewest other shifts short,
+    then has the lowest load, then competes for the fewest nearby shifts is chosen
+    (random tie-break). Shifts left without candidates get one-step hand-overs (see
+    ``_Construction.hand_over``); what is still short stays under-covered.
+    """
+    st = _Construction(config)
+    order = list(range(len(st.need)))
+    rnd.shuffle(order)
+    tie = {s: i for i, s in enumerate(order)}
+    heap = [(st.slack(s), st.start[s], tie[s], s) for s in order if st.need[s] > 0]
+    heapq.heapify(heap)
+    while heap:
+        slack, _, _, s = heapq.heappop(heap)
+        if st.need[s] <= 0 or slack != st.slack(s):
+            continue  # filled, or superseded by a refreshed entry
+        pool = list(iter_bits(st.feasible[s]))
+        if not pool:
+            continue
+        rnd.shuffle(pool)
+        e = min(pool, key=lambda e: st.cost(s, e))
+        for t in st.assign(s, e):
+            if st.need[t] > 0:
+                heapq.heappush(heap, (st.slack(t), st.start[t], tie[t], t))
+    # Queue exhausted: the shifts still short have no candidate left; try one-step
+    # hand-overs for them (the candidate masks are not used past this point).
+    for s in order:
+        while st.need[s] > 0 and st.hand_over(s):
+            pass
+
+    shift_ids, employee_ids = st.ids.shift_ids, st.ids.employee_ids
+    return Schedule(
+        assignments={shift_ids[s]: [employee_ids[e] for e in crew] for s, crew in enumerate(st.crew)}
+    )
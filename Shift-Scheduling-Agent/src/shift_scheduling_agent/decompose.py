@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .compact import RosterIds
+from .constraints import ConstraintSuite
+from .domain import Config, Schedule
+from .eligibility import EligibilityIndex, iter_bits
+from .incremental import IncrementalEvaluator
+from .solver import SolveResult, solve
+from .warmstart import fill, reconcile
+
+
+@dataclass(frozen=True)
+class Part:
+    """An independent sub-problem: no employee of ``employees`` is eligible for a shift
+    outside ``shifts``, and no other employee is eligible for these shifts."""
+
+    employees: Tuple[str, ...]
+    shifts: Tuple[str, ...]
+
+
+def components(config: Config) -> List[Part]:
+    """Connected components of the employee–shift eligibility graph (config order).
+
+    Shifts nobody is eligible for form one extra part with no employees.
+    """
+    ids = RosterIds.for_config(config)
+    masks = EligibilityIndex.for_config(config).eligible_by_shift
+    # Clusters are disjoint employee masks, so a shift merges exactly the clusters its
+    # own eligible mask touches.
+    clusters: List[Tuple[int, List[int]]] = []
+    orphans: List[int] = []
+    for s, mask in enumerate(masks):
+        if not mask:
+            orphans.append(s)
+            continue
+        merged_mask, merged = mask, [s]
+        rest: List[Tuple[int, List[int]]] = []
+        for cm, cs in clusters:
+            if cm & mask:
+                merged_mask |= cm
+                merged.extend(cs)
+            else:
+                rest.append((cm, cs))
+        rest.append((merged_mask, merged))
+        clusters = rest
+
+    parts = [
+        Part(tuple(ids.employee_ids[e] for e in iter_bits(cm)), tuple(ids.shift_ids[s] for s in sorted(cs)))
+        for cm, cs in clusters
+    ]
+    parts.sort(key=lambda p: ids.shift_pos[p.shifts[0]])
+    if orphans:
+        parts.append(Part((), tuple(ids.shift_ids[s] for s in orphans)))
+    return parts
+
+
+def subconfig(config: Config, employees: Tuple[str, ...], shifts: List[str], **policy_changes: int) -> Config:
+    prefs = config.preferences
+    keep = set(employees)
+    return Config(
+        employees={eid: config.employees[eid] for eid in employees},
+        shifts={sid: config.shifts[sid] for sid in shifts},
+        policies=replace(config.policies, **policy_changes),
+        preferences=replace(
+            prefs,
+            employee_shift_preferences={k: v for k, v in prefs.employee_shift_preferences.items() if k in keep},
+        ),
+        solver=replace(config.solver, workers=1),
+        meta=config.meta,
+        constraints=config.constraints,
+    )
+
+
+def _day(dt: datetime) -> datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def windows(config: Config, shifts: Tuple[str, ...], days: int) -> List[List[str]]:
+    """Consecutive ``days``-long windows of ``shifts`` by start time (empty ones skipped)."""
+    if not shifts:
+        return []
+    origin = min(_day(config.shifts[sid].start) for sid in shifts)
+    buckets: Dict[int, List[str]] = {}
+    for sid in shifts:
+        buckets.setdefault((config.shifts[sid].start - origin).days // days, []).append(sid)
+    return [buckets[k] for k in sorted(buckets)]
+
+
+# Set once per worker process (see ``portfolio._init_worker``).
+_WORKER_CONFIG: Optional[Config] = None
+
+
+def _init_worker(config: Config) -> None:
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = config
+
+
+def _solve_part(part: Part, share: float, config: Optional[Config] = None) -> Tuple[Dict[str, List[str]], int, int]:
+    """Solve one part; with ``solver.window_days`` roll week by week over its horizon.
+
+    Each window is a warm start whose frozen context is the previous window's last
+    ``window_overlap_days`` of assignments, so rest and consecutive rules see across
+    the boundary. The weekly cap is split across windows in proportion to their length.
+    """
+    base = config if config is not None else _WORKER_CONFIG
+    assert base is not None, "worker not initialised"
+    if not part.employees:
+        return {sid: [] for sid in part.shifts}, 0, 0
+    sol = base.solver
+    budget = sol.max_seconds * share
+    iteration_budget = sol.max_iterations * share
+    if sol.window_days <= 0:
+        sub = subconfig(base, part.employees, list(part.shifts)).with_solver(
+            max_seconds=budget, max_iterations=max(1, math.ceil(iteration_budget))
+        )
+        result = solve(sub)
+        return result.schedule.assignments, result.iterations, result.moves
+
+    chunks = windows(base, part.shifts, sol.window_days)
+    starts = [base.shifts[sid].start for sid in part.shifts]
+    horizon_days = (_day(max(starts)) - _day(min(starts))).days + 1
+    overlap = timedelta(days=max(0, sol.window_overlap_days))
+    assignments: Dict[str, List[str]] = {}
+    load = dict.fromkeys(part.employees, 0)
+    iterations = moves = 0
+    previous: List[str] = []
+    for chunk in chunks:
+        window_start = min(base.shifts[sid].start for sid in chunk)
+        context = [sid for sid in previous if base.shifts[sid].end > window_start - overlap]
+        span_days = sol.window_days + (sol.window_overlap_days if context else 0)
+        cap = max(1, math.ceil(base.policies.max_shifts_per_week * min(1.0, span_days / horizon_days)))
+        sub = subconfig(base, part.employees, context + chunk, max_shifts_per_week=cap).with_solver(
+            max_seconds=budget * len(chunk) / len(part.shifts),
+            max_iterations=max(1, math.ceil(iteration_budget * len(chunk) / len(part.shifts))),
+        )
+        if context:
+            chunk_assignments, its, mv = _roll_window(sub, context, assignments, load)
+        else:
+            result = solve(sub)
+            chunk_assignments, its, mv = result.schedule.assignments, result.iterations, result.moves
+        for sid in chunk:
+            assignments[sid] = chunk_assignments.get(sid, [])
+            for eid in assignments[sid]:
+                load[eid] += 1
+        iterations += its
+        moves += mv
+        previous = chunk
+    return assignments, iterations, moves
+
+
+def _roll_window(
+    sub: Config, context: List[str], assignments: Dict[str, List[str]], load: Dict[str, int]
+) -> Tuple[Dict[str, List[str]], int, int]:
+    # Fill the window around its frozen context, least cumulative load first (so work
+    # spreads across windows); search only if that leaves violations.
+    initial = Schedule(assignments={sid: assignments[sid] for sid in context})
+    rec = reconcile(sub, initial, context)
+    ev = IncrementalEvaluator(sub, rec.schedule, frozen=rec.frozen)
+    prior = [load[eid] for eid in sub.employees]
+    for sid in context:
+        for eid in assignments[sid]:
+            prior[ev.ids.employee_pos[eid]] -= 1  # already on the window's own timelines
+    fill(sub, ev, prior_load=prior)
+    if not ev.violations:
+        return ev.schedule.assignments, 0, ev.moves
+    result = solve(sub, initial=ev.schedule, frozen=context)
+    return result.schedule.assignments, result.iterations, ev.moves + result.moves
+
+
+def solve_decomposed(config: Config, workers: Optional[int] = None) -> SolveResult:
+    """Solve independent parts of the roster separately (in parallel) and stitch them.
+
+    Parts are the connected components of the eligibility graph; employees in
+    different parts never compete for a shift, so each part is an exact sub-problem.
+    With ``solver.window_days`` each part is additionally solved as a rolling horizon
+    of windows. The stitched schedule is validated against the full config and any
+    remaining violations (typically the weekly cap or rest across window boundaries)
+    are repaired by a warm start from it.
+    """
+    start = time.time()
+    parts = components(config)
+    total = max(1, len(config.shifts))
+    shares = [len(p.shifts) / total for p in parts]
+    n_workers = max(1, int(workers or config.solver.workers or os.cpu_count() or 1))
+
+    if n_workers > 1 and len(parts) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, len(parts)), initializer=_init_worker, initargs=(config,)
+        ) as pool:
+            solved = list(pool.map(_solve_part, parts, shares))
+    else:
+        solved = [_solve_part(p, share, config=config) for p, share in zip(parts, shares)]
+
+    merged: Dict[str, List[str]] = {}
+    iterations = moves = 0
+    for assignments, its, mv in solved:
+        merged.update(assignments)
+        iterations += its
+        moves += mv
+    schedule = Schedule(assignments={sid: merged.get(sid, []) for sid in config.shifts})
+
+    sizes = sorted((len(p.shifts) for p in parts), reverse=True)
+    notes = [f"Decomposed into {len(parts)} part(s) (largest {sizes[0] if sizes else 0} shift(s))."]
+    if config.solver.window_days > 0:
+        notes[0] += f" Rolling windows of {config.solver.window_days} day(s)."
+    report = ConstraintSuite.default().validate(config, schedule)
+    if not report.ok:
+        remaining = max(0.1, config.solver.max_seconds - (time.time() - start))
+        repaired = solve(config.with_solver(max_seconds=remaining), initial=schedule)
+        notes.append(f"Stitching left {len(report.violations)} violation(s); repaired with churn {repaired.churn}.")
+        notes.extend(repaired.notes)
+        schedule = repaired.schedule
+        iterations += repaired.iterations
+        moves += repaired.moves
+        report = ConstraintSuite.default().validate(config, schedule)
+    return SolveResult(
+        schedule=schedule,
+        ok=report.ok,
+        iterations=iterations,
+        seconds=time.time() - start,
+        notes=notes,
+        moves=moves,
+    )
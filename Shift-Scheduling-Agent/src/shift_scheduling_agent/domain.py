@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 
 @dataclass(frozen=True)
@@ -46,6 +46,8 @@ class Policies:
 class Preferences:
     fairness_weight: float = 1.0
     preference_weight: float = 0.3
+    # penalty per assignment added or removed relative to a warm-start schedule
+    churn_weight: float = 1.0
     employee_shift_preferences: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
 
 
@@ -55,6 +57,41 @@ class SolverConfig:
     max_iterations: int = 800
     random_seed: int = 7
     backtracking_limit: int = 3000
+    # "swap" (hill-climbing swaps from the greedy start), "anneal" or "tabu"
+    strategy: str = "swap"
+    # starting schedule: "regret" (rule-aware, most constrained shift first) or "greedy"
+    construction: str = "regret"
+    penalty_weight: float = 10.0
+    initial_temperature: float = 2.0
+    cooling_rate: float = 0.999
+    tabu_tenure: int = 20
+    # >1 runs a multi-process portfolio (see ``portfolio.solve_portfolio``)
+    workers: int = 1
+    # solve eligibility components separately (see ``decompose.solve_decomposed``);
+    # window_days > 0 also rolls over the horizon in windows of that many days
+    decompose: bool = False
+    window_days: int = 0
+    window_overlap_days: int = 1
+    # group interchangeable employees (see ``symmetry.EmployeeClasses``): skip swaps
+    # and exact-search branches that only relabel them
+    symmetry: bool = True
+
+
+@dataclass(frozen=True)
+class ConstraintSpec:
+    """A declarative hard/soft rule, compiled by ``constraint_specs.CompiledConstraints``.
+
+    ``kind`` selects the checker (``headcount``, ``min_skilled``, ``availability``,
+    ``skills``, ``max_shifts``, ``max_hours``, ``min_rest``, ``max_consecutive``);
+    missing ``params`` fall back to ``Policies``. ``code`` defaults per kind. Soft
+    violations are reported as warnings and don't fail validation.
+    """
+
+    name: str
+    kind: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    code: str = ""
+    severity: str = "hard"
 
 
 @dataclass(frozen=True)
@@ -65,6 +102,27 @@ class Config:
     preferences: Preferences
     solver: SolverConfig
     meta: Dict[str, str] = field(default_factory=dict)
+    # rules declared in the config, checked after the built-in constraints
+    constraints: Tuple[ConstraintSpec, ...] = ()
+    _derived: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Derived indexes are rebuilt on demand instead of being pickled to workers.
+        state = dict(self.__dict__)
+        state["_derived"] = {}
+        return state
+
+    def with_solver(self, **changes: Any) -> "Config":
+        # Solver knobs don't feed any derived index, so the copy shares the cache.
+        out = replace(self, solver=replace(self.solver, **changes))
+        object.__setattr__(out, "_derived", self._derived)
+        return out
+
+    def derived(self, key: str, build: Callable[["Config"], Any]) -> Any:
+        # Indexes derived from the (immutable) config are built once and shared.
+        if key not in self._derived:
+            self._derived[key] = build(self)
+        return self._derived[key]
 
 
 @dataclass
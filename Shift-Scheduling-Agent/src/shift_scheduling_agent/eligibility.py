@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterator, List, Tuple
+
+from .domain import Config, TimeWindow
+from .timeline import IntervalIndex, epoch_seconds
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class AvailabilityWindows(IntervalIndex):
+    """An employee's availability as an ``IntervalIndex`` over epoch seconds."""
+
+    __slots__ = ()
+
+    def __init__(self, windows: List[TimeWindow]) -> None:
+        super().__init__((epoch_seconds(w.start), epoch_seconds(w.end)) for w in windows)
+
+    def contains(self, start: datetime, end: datetime) -> bool:
+        return super().contains(epoch_seconds(start), epoch_seconds(end))
+
+
+class EligibilityIndex:
+    """Shift → eligible-employee bitsets, built once per ``Config``.
+
+    Bit ``i`` of a mask is ``employee_ids[i]`` (config order). A shift's eligible set is
+    the AND of its required-skill masks with the availability mask of its time slot.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.employee_ids: List[str] = list(config.employees.keys())
+        self.employee_pos: Dict[str, int] = {eid: i for i, eid in enumerate(self.employee_ids)}
+        self.all_mask = (1 << len(self.employee_ids)) - 1
+        self._shifts = config.shifts
+
+        self._skill_masks: Dict[str, int] = {}
+        for i, eid in enumerate(self.employee_ids):
+            for skill in config.employees[eid].skills:
+                self._skill_masks[skill] = self._skill_masks.get(skill, 0) | (1 << i)
+
+        self._windows: Dict[str, AvailabilityWindows] = {
+            eid: AvailabilityWindows(emp.availability) for eid, emp in config.employees.items()
+        }
+        self._slot_masks = self._build_slot_masks()
+
+        # Per-shift masks, also as lists aligned with ``RosterIds.shift_ids`` (config order)
+        # for the integer-indexed solver internals.
+        self._req_masks: Dict[FrozenSet[str], int] = {}
+        self._eligible: Dict[str, int] = {}
+        self.skills_by_shift: List[int] = []
+        self.available_by_shift: List[int] = []
+        self.eligible_by_shift: List[int] = []
+        for sid, shift in config.shifts.items():
+            skills = self.skills_mask(shift.required_skills)
+            available = self._slot_masks[(shift.start, shift.end)]
+            self._eligible[sid] = skills & available
+            self.skills_by_shift.append(skills)
+            self.available_by_shift.append(available)
+            self.eligible_by_shift.append(skills & available)
+
+    @staticmethod
+    def for_config(config: Config) -> "EligibilityIndex":
+        return config.derived("eligibility", EligibilityIndex)
+
+    def _build_slot_masks(self) -> Dict[Tuple[datetime, datetime], int]:
+        # Sweep each employee's windows over the distinct shift slots sorted by start;
+        # cost is proportional to the slots that start inside a window.
+        slots = sorted({(s.start, s.end) for s in self._shifts.values()})
+        slot_starts = [epoch_seconds(start) for start, _ in slots]
+        slot_ends = [epoch_seconds(end) for _, end in slots]
+        masks = [0] * len(slots)
+        for i, eid in enumerate(self.employee_ids):
+            bit = 1 << i
+            aw = self._windows[eid]
+            for w_start, w_end in zip(aw.starts, aw.ends):
+                lo = bisect_left(slot_starts, w_start)
+                hi = bisect_right(slot_starts, w_end)
+                for k in range(lo, hi):
+                    if slot_ends[k] <= w_end:
+                        masks[k] |= bit
+        return dict(zip(slots, masks))
+
+    def skills_mask(self, required: FrozenSet[str] | set) -> int:
+        key = frozenset(required)
+        mask = self._req_masks.get(key)
+        if mask is None:
+            mask = self.all_mask
+            for skill in key:
+                mask &= self._skill_masks.get(skill, 0)
+            self._req_masks[key] = mask
+        return mask
+
+    def eligible_mask(self, shift_id: str) -> int:
+        return self._eligible[shift_id]
+
+    def eligible(self, shift_id: str) -> List[str]:
+        ids = self.employee_ids
+        return [ids[i] for i in iter_bits(self._eligible[shift_id])]
+
+    def eligible_count(self, shift_id: str) -> int:
+        return self._eligible[shift_id].bit_count()
+
+    def is_eligible(self, employee_id: str, shift_id: str) -> bool:
+        return bool(self._eligible[shift_id] >> self.employee_pos[employee_id] & 1)
+
+    def is_available(self, employee_id: str, shift_id: str) -> bool:
+        shift = self._shifts[shift_id]
+        return bool(self._slot_masks[(shift.start, shift.end)] >> self.employee_pos[employee_id] & 1)
+
+    def has_skills(self, employee_id: str, shift_id: str) -> bool:
+        mask = self.skills_mask(self._shifts[shift_id].required_skills)
+        return bool(mask >> self.employee_pos[employee_id] & 1)
+
+    def available_for(self, employee_id: str, start: datetime, end: datetime) -> bool:
+        # Ad-hoc interval query (e.g. a shift not yet in the config).
+        return self._windows[employee_id].contains(start, end)
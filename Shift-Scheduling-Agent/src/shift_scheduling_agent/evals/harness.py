@@ -1,55 +1,203 @@
 from __future__ import annotations
 
+import argparse
 import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from statistics import fmean, pvariance
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from ..config_io import load_config
+from ..config_io import ConfigCache
 from ..constraints import ConstraintSuite
-from ..domain import Schedule
+from ..scoring import score_schedule
 from ..solver import solve
 
-
-DATASET = Path("evals/datasets/smoke.jsonl")
-
-
-def run_case(case: Dict) -> Dict:
-    config_path = case["config_path"]
-    expect_ok = bool(case.get("expect_ok", True))
-
-    config = load_config(config_path)
+# The datasets ship with the project (evals/ next to src/), not the package.
+DATASET = Path(__file__).resolve().parents[3] / "evals" / "datasets" / "smoke.jsonl"
+
+# Parsed configs, per process: pool workers get runs sorted by config path, so each
+# worker parses a config once and reuses it (and its derived indexes) across cases.
+_CONFIGS = ConfigCache(maxsize=64)
+
+# (config path, seed, max_seconds override)
+Run = Tuple[str, int, Optional[float]]
+
+
+@dataclass
+class EvalCase:
+    id: str
+    config_path: str
+    expect_ok: bool = True
+    seeds: List[int] = field(default_factory=list)
+
+
+def load_cases(dataset: str | Path, seeds: int = 1) -> List[EvalCase]:
+    """Read a JSONL dataset. Relative ``config_path``s resolve against the working
+    directory first, then the dataset's directory. Cases without explicit ``seeds``
+    run ``seeds`` seeds starting at the config's ``solver.random_seed``."""
+    path = Path(dataset)
+    cases: List[EvalCase] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        raw = json.loads(line)
+        config_path = Path(raw["config_path"])
+        if not config_path.is_absolute() and not config_path.exists():
+            config_path = path.parent / config_path
+        case_seeds = [int(s) for s in raw.get("seeds", [])]
+        if not case_seeds:
+            base = _CONFIGS.get(config_path).solver.random_seed
+            case_seeds = [base + i for i in range(max(1, seeds))]
+        cases.append(
+            EvalCase(
+                id=raw.get("id", raw["config_path"]),
+                config_path=str(config_path.resolve()),
+                expect_ok=bool(raw.get("expect_ok", True)),
+                seeds=case_seeds,
+            )
+        )
+    return cases
+
+
+def _solve_run(run: Run) -> Dict[str, Any]:
+    config_path, seed, max_seconds = run
+    config = _CONFIGS.get(config_path).with_solver(random_seed=seed)
+    if max_seconds is not None:
+        config = config.with_solver(max_seconds=min(config.solver.max_seconds, max_seconds))
     result = solve(config)
     report = ConstraintSuite.default().validate(config, result.schedule)
+    score = score_schedule(config, result.schedule)
+    counts: Dict[str, int] = {}
+    for v in report.violations:
+        counts[v.code] = counts.get(v.code, 0) + 1
+    return {
+        "seed": seed,
+        "ok": report.ok,
+        "seconds": result.seconds,
+        "iterations": result.iterations,
+        "moves": result.moves,
+        "violations": counts,
+        "score": score.total,
+        "components": score.components,
+    }
 
+
+def run_cases(
+    cases: Sequence[EvalCase], workers: int = 1, max_seconds: Optional[float] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Solve every (case, seed) and summarise per case.
+
+    Runs go to a process pool when ``workers > 1``. Cases that repeat the same
+    config and seed share one solve.
+    """
+    runs = sorted({(c.config_path, s, max_seconds) for c in cases for s in c.seeds})
+    if workers > 1 and len(runs) > 1:
+        chunksize = max(1, len(runs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = dict(zip(runs, pool.map(_solve_run, runs, chunksize=chunksize)))
+    else:
+        outcomes = {run: _solve_run(run) for run in runs}
+    return {c.id: summarise(c, [outcomes[(c.config_path, s, max_seconds)] for s in c.seeds]) for c in cases}
+
+
+def summarise(case: EvalCase, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    scores = [r["score"] for r in runs]
+    seconds = [r["seconds"] for r in runs]
+    violations = [sum(r["violations"].values()) for r in runs]
+    valid = [r["ok"] for r in runs]
     return {
-        "case_id": case.get("id", config_path),
-        "solver_ok": result.ok,
-        "valid_ok": report.ok,
-        "expect_ok": expect_ok,
-        "violations": [v.__dict__ for v in report.violations[:20]],
+        "config_path": case.config_path,
+        "expect_ok": case.expect_ok,
+        "passed": all(valid) if case.expect_ok else not any(valid),
+        "score_mean": fmean(scores),
+        "score_var": pvariance(scores),
+        "seconds_mean": fmean(seconds),
+        "seconds_var": pvariance(seconds),
+        "violations_mean": fmean(violations),
+        "runs": runs,
     }
 
 
-def main() -> None:
-    if not DATASET.exists():
-        raise SystemExit(f"Missing dataset: {DATASET}")
+def regressions(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    score_tolerance: float = 1e-6,
+    slowdown: float = 1.5,
+    min_seconds: float = 0.05,
+) -> List[str]:
+    """Quality and speed regressions of ``current`` against ``baseline`` (cases in both).
+
+    A case regresses if it stopped passing, its mean violations rose, its mean score
+    dropped by more than ``score_tolerance``, or its mean solve time grew by more than
+    ``slowdown``× and ``min_seconds``.
+    """
+    out: List[str] = []
+    for case_id, cur in current["cases"].items():
+        old = baseline.get("cases", {}).get(case_id)
+        if old is None:
+            continue
+        if old["passed"] and not cur["passed"]:
+            out.append(f"{case_id}: no longer passes")
+        if cur["violations_mean"] > old["violations_mean"]:
+            out.append(f"{case_id}: violations {old['violations_mean']:g} -> {cur['violations_mean']:g}")
+        if cur["score_mean"] < old["score_mean"] - score_tolerance:
+            out.append(f"{case_id}: score {old['score_mean']:.4f} -> {cur['score_mean']:.4f}")
+        if (
+            cur["seconds_mean"] > old["seconds_mean"] * slowdown
+            and cur["seconds_mean"] - old["seconds_mean"] > min_seconds
+        ):
+            out.append(f"{case_id}: solve time {old['seconds_mean']:.3f}s -> {cur['seconds_mean']:.3f}s")
+    return out
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m shift_scheduling_agent.evals.harness")
+    parser.add_argument("--dataset", default=str(DATASET))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seeds", type=int, default=1, help="Seeds per case without explicit `seeds`.")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Cap every case's solver budget.")
+    parser.add_argument("--out", default="", help="Write results (JSON); usable as a later --baseline.")
+    parser.add_argument("--baseline", default="", help="Fail on quality/speed regressions against this file.")
+    parser.add_argument("--score-tolerance", type=float, default=1e-6)
+    parser.add_argument("--slowdown", type=float, default=1.5, help="Allowed mean solve-time ratio.")
+    args = parser.parse_args(argv)
+
+    dataset = Path(args.dataset)
+    if not dataset.exists():
+        raise SystemExit(f"Missing dataset: {dataset}")
+
+    started = time.perf_counter()
+    cases = load_cases(dataset, seeds=args.seeds)
+    results = {
+        "meta": {"dataset": str(dataset), "seeds": args.seeds, "max_seconds": args.max_seconds},
+        "cases": run_cases(cases, workers=args.workers, max_seconds=args.max_seconds),
+    }
+    results["meta"]["wall_seconds"] = time.perf_counter() - started
 
-    cases = [json.loads(line) for line in DATASET.read_text(encoding="utf-8").splitlines() if line.strip()]
-    results = [run_case(c) for c in cases]
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
 
-    failed: List[Dict] = []
-    for r in results:
-        if r["expect_ok"] and not r["valid_ok"]:
-            failed.append(r)
-        if (not r["expect_ok"]) and r["valid_ok"]:
-            failed.append(r)
+    failed = {k: v for k, v in results["cases"].items() if not v["passed"]}
+    regressed: List[str] = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressed = regressions(baseline, results, args.score_tolerance, args.slowdown)
 
     if failed:
         print("FAILED cases:")
-        print(json.dumps(failed, indent=2))
+        print(json.dumps({k: {**v, "runs": v["runs"][:3]} for k, v in failed.items()}, indent=2))
+    if regressed:
+        print("Regressions against baseline:")
+        print("\n".join(f"  {line}" for line in regressed))
+    if failed or regressed:
         raise SystemExit(1)
 
-    print(f"OK — {len(results)} smoke case(s).")
+    n_runs = sum(len(c.seeds) for c in cases)
+    print(f"OK — {len(cases)} case(s), {n_runs} run(s) in {results['meta']['wall_seconds']:.2f}s.")
 
 
 if __name__ == "__main__":
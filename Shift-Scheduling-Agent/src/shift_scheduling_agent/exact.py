@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .compact import RosterIds
+from .constraints import Violation
+from .domain import Config, Schedule
+from .eligibility import EligibilityIndex, iter_bits
+from .symmetry import EmployeeClasses
+from .timeline import ShiftTimes, Timeline, TimelineRules
+
+Pair = Tuple[int, int]  # (employee, shift)
+
+_MAX_NOGOOD = 6
+_MAX_NOGOODS = 20000
+
+# trail records
+_DOM, _WHY, _ASSIGN, _FLOOR = range(4)
+
+
+@dataclass
+class ExactResult:
+    # "feasible", "infeasible" (proven) or "unknown" (budget exhausted / repair failed)
+    status: str
+    schedule: Optional[Schedule]
+    conflicts: List[Violation] = field(default_factory=list)
+    backtracks: int = 0
+    nodes: int = 0
+    seconds: float = 0.0
+    symmetric: int = 0  # candidates skipped as relabellings (``solver.symmetry``)
+
+
+class _Budget(Exception):
+    pass
+
+
+class _Search:
+    """DFS over shift slots with MRV ordering, forward checking and binary-ish nogoods.
+
+    Domains are employee bitsets per shift (from ``EligibilityIndex``). Assigning e to
+    s removes e from every open shift that would break min rest with s, and from every
+    open shift once e hits the weekly cap; consecutive runs are checked when a value is
+    tried. A domain wipeout on an untouched shift records the assignments that caused
+    it as a nogood. Within a shift, search picks are made in increasing employee index
+    so each crew is enumerated once. With ``solver.symmetry``, of the candidates that
+    share an ``EmployeeClasses`` class and the shifts assigned so far only the first
+    is tried: the others lead to relabelled copies of its subtree.
+    """
+
+    def __init__(self, config: Config, deadline: float, limit: int) -> None:
+        self.config = config
+        self.deadline = deadline
+        self.limit = limit
+        self.ids = RosterIds.for_config(config)
+        index = EligibilityIndex.for_config(config)
+        shifts = list(config.shifts.values())
+        n = len(shifts)
+
+        self.eligible = list(index.eligible_by_shift)
+        self.dom = list(index.eligible_by_shift)
+        self.need = [sh.required_headcount for sh in shifts]
+        times = ShiftTimes.for_config(config)
+        self.start = times.start
+        self.end = times.end
+        self.floor = [-1] * n
+        self.cap = config.policies.max_shifts_per_week
+        self.max_run = config.policies.max_consecutive_shifts
+
+        # Shift pairs closer than min rest (either order) can't share an employee.
+        rest = config.policies.min_rest_hours * 3600
+        order = sorted(range(n), key=lambda s: self.start[s])
+        starts = [self.start[s] for s in order]
+        self.rest_conflicts: List[List[int]] = [[] for _ in range(n)]
+        for i, s in enumerate(order):
+            hi = bisect_left(starts, self.end[s] + rest, lo=i + 1)
+            for t in order[i + 1 : hi]:
+                self.rest_conflicts[s].append(t)
+                self.rest_conflicts[t].append(s)
+
+        self.open: Set[int] = {s for s in range(n) if self.need[s] > 0}
+        self.assigned: List[List[int]] = [[] for _ in range(n)]
+        rules = TimelineRules.for_config(config)
+        self.timeline: List[Timeline] = [Timeline(rules) for _ in self.ids.employee_ids]
+        self.current: Set[Pair] = set()
+        self.why: List[Dict[int, Tuple[Pair, ...]]] = [{} for _ in range(n)]
+        self.trail: List[Tuple] = []
+        self.nogoods: Dict[Pair, List[FrozenSet[Pair]]] = {}
+        self.n_nogoods = 0
+
+        self.class_of: Optional[List[int]] = None
+        if config.solver.symmetry:
+            self.class_of = EmployeeClasses.for_config(config, preferences=False).class_of
+        self.nodes = 0
+        self.backtracks = 0
+        self.symmetric = 0  # candidates skipped as relabellings of an earlier one
+        self.wipeouts: Counter = Counter()
+        self.causes: Counter = Counter()
+
+    # -- state changes (all trailed) ------------------------------------------
+
+    def _effective(self, s: int) -> int:
+        f = self.floor[s]
+        return self.dom[s] >> (f + 1) << (f + 1) if f >= 0 else self.dom[s]
+
+    def _remove(self, t: int, e: int, cause: Tuple[Pair, ...], kind: str) -> bool:
+        # Drop e from dom[t]; False on wipeout.
+        self.trail.append((_DOM, t, self.dom[t]))
+        self.dom[t] &= ~(1 << e)
+        if cause:
+            self.trail.append((_WHY, t, e))
+            self.why[t][e] = cause
+        if self._effective(t).bit_count() >= self.need[t]:
+            return True
+        self.wipeouts[t] += 1
+        self.causes[kind] += 1
+        self._learn(t)
+        return False
+
+    def assign(self, e: int, s: int, search_pick: bool) -> bool:
+        self.nodes += 1
+        self.trail.append((_ASSIGN, s, e))
+        self.assigned[s].append(e)
+        tl = self.timeline[e]
+        tl.insert(s)
+        self.need[s] -= 1
+        if self.need[s] == 0:
+            self.open.discard(s)
+        self.current.add((e, s))
+        self.trail.append((_DOM, s, self.dom[s]))
+        self.dom[s] &= ~(1 << e)
+        if search_pick:
+            self.trail.append((_FLOOR, s, self.floor[s]))
+            self.floor[s] = e
+
+        bit = 1 << e
+        if s in self.open and self._effective(s).bit_count() < self.need[s]:
+            return False
+        for t in self.rest_conflicts[s]:
+            if t in self.open and self.dom[t] & bit:
+                if not self._remove(t, e, ((e, s),), "MIN_REST"):
+                    return False
+        if len(tl) >= self.cap:
+            cause = tuple((e, x) for x in tl)
+            for t in list(self.open):
+                if self.dom[t] & bit and not self._remove(t, e, cause, "MAX_SHIFTS_WEEK"):
+                    return False
+        return True
+
+    def undo(self, mark: int) -> None:
+        trail = self.trail
+        while len(trail) > mark:
+            rec = trail.pop()
+            kind = rec[0]
+            if kind == _DOM:
+                self.dom[rec[1]] = rec[2]
+            elif kind == _WHY:
+                self.why[rec[1]].pop(rec[2], None)
+            elif kind == _FLOOR:
+                self.floor[rec[1]] = rec[2]
+            else:
+                _, s, e = rec
+                self.assigned[s].pop()
+                self.timeline[e].remove(s)
+                if self.need[s] == 0:
+                    self.open.add(s)
+                self.need[s] += 1
+                self.current.discard((e, s))
+
+    # -- checks -----------------------------------------------------------------
+
+    def _consecutive_ok(self, e: int, s: int) -> bool:
+        return self.timeline[e].run_through(s) <= self.max_run
+
+    def _blocked_by_nogood(self, pair: Pair) -> bool:
+        for ng in self.nogoods.get(pair, ()):
+            if all(p == pair or p in self.current for p in ng):
+                return True
+        return False
+
+    def _learn(self, t: int) -> None:
+        # Only sound when t has no search picks (its domain is then plain eligibility).
+        if self.assigned[t] or self.n_nogoods >= _MAX_NOGOODS:
+            return
+        why = self.why[t]
+        cause: Set[Pair] = set()
+        for e in iter_bits(self.eligible[t] & ~self.dom[t]):
+            c = why.get(e)
+            if c is None:
+                return
+            cause.update(c)
+        if not cause or len(cause) > _MAX_NOGOOD:
+            return
+        ng = frozenset(cause)
+        for p in ng:
+            self.nogoods.setdefault(p, []).append(ng)
+        self.n_nogoods += 1
+
+    def _tick(self) -> None:
+        if self.backtracks > self.limit or time.time() > self.deadline:
+            raise _Budget()
+
+    # -- search -------------------------------------------------------------------
+
+    def _select(self) -> Optional[int]:
+        best, best_slack = None, None
+        for s in self.open:
+            slack = self._effective(s).bit_count() - self.need[s]
+            if best_slack is None or slack < best_slack or (slack == best_slack and s < best):
+                best, best_slack = s, slack
+        return best
+
+    def _candidates(self, s: int) -> List[int]:
+        out = [
+            e
+            for e in iter_bits(self._effective(s))
+            if self._consecutive_ok(e, s) and not self._blocked_by_nogood((e, s))
+        ]
+        # least-loaded first keeps the result fair-ish
+        out.sort(key=lambda e: (len(self.timeline[e]), e))
+        if self.class_of is not None and len(out) > 1:
+            out = self._break_symmetry(out)
+        return out
+
+    def _break_symmetry(self, candidates: List[int]) -> List[int]:
+        # Two candidates of one class with the same shifts are interchangeable unless an
+        # open shift's pick floor lies between them (one may still join it, the other not).
+        floors = [self.floor[t] for t in self.open if self.floor[t] >= 0]
+        first: Dict[Tuple[int, Tuple[int, ...]], int] = {}
+        out = []
+        for e in candidates:
+            key = (self.class_of[e], tuple(self.timeline[e]))
+            rep = first.setdefault(key, e)
+            if rep != e and not any(rep <= f < e for f in floors):
+                self.symmetric += 1
+                continue
+            out.append(e)
+        return out
+
+    def run(self) -> bool:
+        """True if a complete assignment was found, False if the space is exhausted."""
+        stack: List[List] = []  # [shift, candidates, next position, trail mark]
+        while True:
+            s = self._select()
+            if s is None:
+                return True
+            stack.append([s, self._candidates(s), 0, len(self.trail)])
+            while True:
+                self._tick()
+                frame = stack[-1]
+                self.undo(frame[3])
+                if frame[2] >= len(frame[1]):
+                    stack.pop()
+                    self.backtracks += 1
+                    if not stack:
+                        return False
+                    continue
+                e = frame[1][frame[2]]
+                frame[2] += 1
+                if self.assign(e, frame[0], search_pick=True):
+                    break
+                self.backtracks += 1
+
+    def schedule(self) -> Schedule:
+        sids, eids = self.ids.shift_ids, self.ids.employee_ids
+        return Schedule(assignments={sids[s]: [eids[e] for e in row] for s, row in enumerate(self.assigned)})
+
+    def conflicts(self) -> List[Violation]:
+        sids = self.ids.shift_ids
+        out: List[Violation] = []
+        for s, elig in enumerate(self.eligible):
+            if elig.bit_count() < self.config.shifts[sids[s]].required_headcount:
+                out.append(
+                    Violation(
+                        code="UNDER_COVERAGE",
+                        message=f"Shift {sids[s]} needs {self.config.shifts[sids[s]].required_headcount} "
+                        f"but only {elig.bit_count()} employee(s) are eligible",
+                        shift_id=sids[s],
+                    )
+                )
+        if out:
+            return out
+        for s, count in self.wipeouts.most_common(10):
+            out.append(
+                Violation(
+                    code="UNDER_COVERAGE",
+                    message=f"Shift {sids[s]} could not be covered in {count} branch(es)",
+                    shift_id=sids[s],
+                )
+            )
+        for code, count in self.causes.most_common():
+            out.append(Violation(code=code, message=f"{code} pruned {count} branch(es) to a dead end"))
+        return out
+
+
+def exact_search(
+    config: Config,
+    fixed: Optional[Schedule] = None,
+    deadline: Optional[float] = None,
+    backtracking_limit: Optional[int] = None,
+) -> ExactResult:
+    """Complete search for a schedule satisfying every hard constraint.
+
+    Bounded by ``solver.backtracking_limit`` and ``solver.max_seconds`` unless
+    overridden. ``fixed`` assignments (e.g. a greedy start) are kept where consistent
+    and the rest is searched; since they may themselves block a solution, a failed
+    repair reports ``unknown`` rather than ``infeasible``.
+    """
+    t0 = time.time()
+    limit = config.solver.backtracking_limit if backtracking_limit is None else backtracking_limit
+    search = _Search(config, deadline if deadline is not None else t0 + config.solver.max_seconds, limit)
+
+    ok = True
+    for s in range(len(search.need)):
+        if search.eligible[s].bit_count() < search.need[s]:
+            ok = False
+    if not ok:
+        return ExactResult("infeasible", None, search.conflicts(), 0, 0, time.time() - t0)
+
+    if fixed is not None:
+        ids = search.ids
+        for sid, eids in fixed.assignments.items():
+            s = ids.shift_pos.get(sid)
+            if s is None:
+                continue
+            for eid in eids:
+                e = ids.employee_pos.get(eid)
+                if e is None or search.need[s] <= 0 or not search.dom[s] >> e & 1:
+                    continue
+                if not search._consecutive_ok(e, s):
+                    continue
+                mark = len(search.trail)
+                if not search.assign(e, s, search_pick=False):
+                    search.undo(mark)
+
+    try:
+        found = search.run()
+    except _Budget:
+        return ExactResult("unknown", None, [], search.backtracks, search.nodes, time.time() - t0, search.symmetric)
+
+    if found:
+        return ExactResult("feasible", search.schedule(), [], search.backtracks, search.nodes, time.time() - t0, search.symmetric)
+    status = "infeasible" if fixed is None else "unknown"
+    return ExactResult(status, None, search.conflicts(), search.backtracks, search.nodes, time.time() - t0, search.symmetric)
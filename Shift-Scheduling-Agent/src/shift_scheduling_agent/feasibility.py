@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from .compact import RosterIds
+from .domain import Config
+from .eligibility import EligibilityIndex, iter_bits
+
+
+@dataclass(frozen=True)
+class CoverageBound:
+    """Max-flow relaxation of coverage: shifts' headcount against eligible employees
+    with the shift cap as capacity (rest and run rules ignored).
+
+    ``max_coverage`` slots is an upper bound on what any schedule can staff. When it
+    is below ``demand``, ``bottleneck`` is a min-cut certificate: these shifts need
+    ``bottleneck_demand`` slots, but everyone eligible for them (``employees``, all at
+    the cap) can staff at most ``bottleneck_capacity``. ``short`` is one maximum
+    staffing's unfilled slots per shift.
+    """
+
+    demand: int
+    max_coverage: int
+    bottleneck: Tuple[str, ...] = ()
+    employees: Tuple[str, ...] = ()
+    bottleneck_demand: int = 0
+    bottleneck_capacity: int = 0
+    # skill -> slots the bottleneck shifts need that require it
+    skills: Dict[str, int] = field(default_factory=dict)
+    short: Dict[str, int] = field(default_factory=dict)
+    unstaffable: Tuple[str, ...] = ()  # shifts nobody is eligible for
+    seconds: float = 0.0
+
+    @property
+    def feasible(self) -> bool:
+        return self.max_coverage >= self.demand
+
+    @property
+    def deficit(self) -> int:
+        return self.demand - self.max_coverage
+
+    def notes(self, limit: int = 10) -> List[str]:
+        if self.feasible:
+            return []
+        out = [f"Coverage is impossible: at most {self.max_coverage} of {self.demand} slot(s) can be staffed."]
+        if self.unstaffable:
+            out.append(f"No eligible employee for: {_sample(self.unstaffable, limit)}.")
+        skills = ", ".join(f"{k} ({v})" for k, v in sorted(self.skills.items(), key=lambda kv: (-kv[1], kv[0])))
+        out.append(
+            f"Bottleneck: {len(self.bottleneck)} shift(s) need {self.bottleneck_demand} slot(s) but their "
+            f"{len(self.employees)} eligible employee(s) can cover at most {self.bottleneck_capacity}"
+            + (f"; skills needed: {skills}" if skills else "")
+            + f". Shifts: {_sample(self.bottleneck, limit)}."
+        )
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "feasible": self.feasible,
+            "demand": self.demand,
+            "max_coverage": self.max_coverage,
+            "bottleneck": list(self.bottleneck),
+            "employees": list(self.employees),
+            "bottleneck_demand": self.bottleneck_demand,
+            "bottleneck_capacity": self.bottleneck_capacity,
+            "skills": dict(self.skills),
+            "short": dict(self.short),
+            "unstaffable": list(self.unstaffable),
+            "seconds": self.seconds,
+        }
+
+
+def _sample(ids: Tuple[str, ...], limit: int) -> str:
+    head = ", ".join(ids[:limit])
+    return head + (f" (+{len(ids) - limit} more)" if len(ids) > limit else "")
+
+
+def coverage_bound(config: Config) -> CoverageBound:
+    """Maximum coverage by augmenting paths (bitset search), cached per config."""
+    return config.derived("coverage_bound", _coverage_bound)
+
+
+class _Staffing:
+    """A staffing that respects eligibility, headcount and the shift cap, grown by
+    augmenting paths; employees and shift crews are bitmasks."""
+
+    def __init__(self, masks: List[int], required: List[int], n_emp: int, cap: int) -> None:
+        self.masks = masks
+        self.required = required
+        self.cap = cap
+        self.crew = [0] * len(masks)
+        self.fill = [0] * len(masks)
+        self.load = [0] * n_emp
+        self.shifts_of: List[List[int]] = [[] for _ in range(n_emp)]
+        self.spare = (1 << n_emp) - 1 if cap > 0 else 0  # employees below the cap
+
+    def _join(self, s: int, e: int) -> None:
+        self.crew[s] |= 1 << e
+        self.shifts_of[e].append(s)
+
+    def _leave(self, s: int, e: int) -> None:
+        self.crew[s] &= ~(1 << e)
+        self.shifts_of[e].remove(s)
+
+    def _staff(self, s: int, e: int) -> None:
+        # one more slot of s filled, one more shift for e
+        self.fill[s] += 1
+        self.load[e] += 1
+        if self.load[e] >= self.cap:
+            self.spare &= ~(1 << e)
+
+    def greedy(self, order: List[int]) -> None:
+        for s in order:
+            for e in iter_bits(self.masks[s] & self.spare):
+                if self.fill[s] >= self.required[s]:
+                    break
+                self._join(s, e)
+                self._staff(s, e)
+
+    def augment(self, s: int, dead: int) -> Tuple[bool, int]:
+        """Staff one more slot of ``s`` along a shortest augmenting path.
+
+        BFS over shifts: an eligible employee not on shift t either has spare capacity
+        (the path ends) or can move to t from one of their shifts, which then needs a
+        replacement. Returns (augmented, employees visited); ``dead`` employees are
+        skipped (visited by a failed search since the last augmentation).
+        """
+        masks, crew = self.masks, self.crew
+        seen = 0
+        joins: Dict[int, int] = {}  # employee -> shift they would move to
+        leaver: Dict[int, int] = {}  # shift -> employee who would leave it
+        visited = {s}
+        queue = deque([s])
+        while queue:
+            t = queue.popleft()
+            cand = masks[t] & ~crew[t] & ~seen & ~dead
+            if not cand:
+                continue
+            free = cand & self.spare
+            if free:
+                first = e = (free & -free).bit_length() - 1
+                while True:
+                    self._join(t, e)
+                    if t == s:
+                        break
+                    prev = leaver[t]
+                    self._leave(t, prev)
+                    e, t = prev, joins[prev]
+                self._staff(s, first)
+                return True, seen
+            seen |= cand
+            for e in iter_bits(cand):
+                joins[e] = t
+                for t2 in self.shifts_of[e]:
+                    if t2 not in visited:
+                        visited.add(t2)
+                        leaver[t2] = e
+                        queue.append(t2)
+        return False, seen
+
+    def residual_region(self, deficient: List[int]) -> Tuple[List[int], int]:
+        """Shifts and employees reachable from ``deficient`` shifts in the residual
+        graph of a maximum staffing: the sink side of a minimum cut."""
+        employees = 0
+        visited = set(deficient)
+        queue = deque(deficient)
+        while queue:
+            t = queue.popleft()
+            cand = self.masks[t] & ~self.crew[t] & ~employees
+            employees |= cand
+            for e in iter_bits(cand):
+                for t2 in self.shifts_of[e]:
+                    if t2 not in visited:
+                        visited.add(t2)
+                        queue.append(t2)
+        return sorted(visited), employees
+
+
+def _coverage_bound(config: Config) -> CoverageBound:
+    t0 = time.perf_counter()
+    ids = RosterIds.for_config(config)
+    masks = EligibilityIndex.for_config(config).eligible_by_shift
+    required = [sh.required_headcount for sh in config.shifts.values()]
+    flow = _Staffing(masks, required, len(ids.employee_ids), max(0, config.policies.max_shifts_per_week))
+
+    # Greedy start, scarcest shifts first, then augmenting paths for what is left.
+    order = sorted(range(len(masks)), key=lambda s: masks[s].bit_count())
+    flow.greedy(order)
+    dead = 0
+    for s in order:
+        while flow.fill[s] < required[s]:
+            found, seen = flow.augment(s, dead)
+            if not found:
+                dead |= seen
+                break
+            dead = 0
+
+    fill = flow.fill
+    deficient = [s for s in range(len(masks)) if fill[s] < required[s]]
+    region, employees = flow.residual_region(deficient)
+    skills: Dict[str, int] = {}
+    shifts = list(config.shifts.values())
+    for s in region:
+        for skill in shifts[s].required_skills:
+            skills[skill] = skills.get(skill, 0) + required[s]
+    return CoverageBound(
+        demand=sum(required),
+        max_coverage=sum(fill),
+        bottleneck=tuple(ids.shift_ids[s] for s in region),
+        employees=tuple(ids.employee_ids[e] for e in iter_bits(employees)),
+        bottleneck_demand=sum(required[s] for s in region),
+        bottleneck_capacity=sum(fill[s] for s in region),
+        skills=skills,
+        short={ids.shift_ids[s]: required[s] - fill[s] for s in deficient},
+        unstaffable=tuple(ids.shift_ids[s] for s in deficient if not masks[s]),
+        seconds=time.perf_counter() - t0,
+    )
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import heapq
+import random
+from typing import Dict, List, Optional, Set
+
+from .compact import RosterIds
+from .domain import Config, Schedule
+from .eligibility import EligibilityIndex, iter_bits
+from .incremental import IncrementalEvaluator
+from .scoring import ScoreModel
+from .warmstart import fill, shed
+
+# Integer arc costs: one unit of sum-of-squared-loads costs fairness_weight * SCALE,
+# one preference point preference_weight * SCALE * 2n (the pstdev slope at std dev 1).
+SCALE = 1000
+
+
+class MinCostStaffing:
+    """Min-cost flow over the coverage relaxation: eligibility (skills, availability),
+    headcount and the weekly cap, with rest and run rules left out.
+
+    Shifts supply ``required_headcount`` units, each employee forwards up to the cap
+    to the sink and an assignment (s, e) is an arc costing minus its preference
+    reward. The k-th shift of an employee costs ``2k - 1`` fairness units on the
+    employee's sink arcs, so the sink arcs are convex and a flow's fairness cost is
+    the sum of squared loads (for full coverage, the same order as the std dev term
+    of the score).
+
+    ``solve`` is the primal-dual successive shortest path method: one Dijkstra from
+    every shift still short (reduced costs kept non-negative by node potentials),
+    then as many units as fit along zero reduced-cost paths, until no shift can
+    reach the sink. The result staffs as many slots as any staffing can and has the
+    least cost among those.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.ids = ids = RosterIds.for_config(config)
+        self.model = model = ScoreModel.for_config(config)
+        masks = EligibilityIndex.for_config(config).eligible_by_shift
+        self.required = [sh.required_headcount for sh in config.shifts.values()]
+        self.n_shifts = n_shifts = len(masks)
+        self.n_emp = n_emp = len(ids.employee_ids)
+        self.sink = n_shifts + n_emp
+        self.cap = max(0, config.policies.max_shifts_per_week)
+        self.fair_unit = round(model.fairness_weight * SCALE)
+        pref_unit = model.preference_weight * SCALE * 2 * max(1, n_emp)
+
+        # Employees whose reward on a shift can be non-zero: skill-preference matches
+        # plus everyone with per-shift/time/day preferences.
+        by_skill: Dict[int, int] = {}
+        extra = 0
+        for e in range(n_emp):
+            for bit in iter_bits(model.skill_pref[e]):
+                by_skill[bit] = by_skill.get(bit, 0) | (1 << e)
+            if model.extra[e] is not None:
+                extra |= 1 << e
+        # Per shift: eligible employees and their arc costs, and the non-zero costs by
+        # employee (for the reverse arcs).
+        self.eligible: List[List[int]] = []
+        self.costs: List[List[int]] = []
+        self.bonus: List[Dict[int, int]] = []
+        for s in range(n_shifts):
+            rewarded = extra
+            for bit in iter_bits(model.shift_skills[s]):
+                rewarded |= by_skill.get(bit, 0)
+            bonus = {}
+            for e in iter_bits(rewarded & masks[s]):
+                c = -round(pref_unit * model.reward(s, e))
+                if c:
+                    bonus[e] = c
+            eligible = list(iter_bits(masks[s]))
+            self.eligible.append(eligible)
+            self.costs.append([bonus.get(e, 0) for e in eligible] if bonus else [0] * len(eligible))
+            self.bonus.append(bonus)
+
+        self.crew: List[Set[int]] = [set() for _ in range(n_shifts)]
+        self.shifts_of: List[List[int]] = [[] for _ in range(n_emp)]
+        self.load = [0] * n_emp
+        self.short: Dict[int, int] = {}
+        # Potentials: shifts, then employees, then the sink. Shifts start at 0 and an
+        # employee at its cheapest incoming arc, so every reduced cost is >= 0.
+        pi = [0] * (self.sink + 1)
+        for bonus in self.bonus:
+            for e, c in bonus.items():
+                if c < pi[n_shifts + e]:
+                    pi[n_shifts + e] = c
+        pi[self.sink] = min((pi[n_shifts + e] + self.fair_unit for e in range(n_emp)), default=0)
+        self.pi = pi
+        self.phases = 0
+
+    def cost(self, s: int, e: int) -> int:
+        return self.bonus[s].get(e, 0)
+
+    def solve(self) -> "MinCostStaffing":
+        excess = list(self.required)
+        while True:
+            sources = [s for s in range(self.n_shifts) if excess[s] > 0]
+            if not sources or not self._price(sources):
+                break
+            self.phases += 1
+            dead: Set[int] = set()
+            for s in sources:
+                while excess[s] > 0 and self._route(s, dead):
+                    excess[s] -= 1
+        self.short = {s: x for s, x in enumerate(excess) if x > 0}
+        return self
+
+    def _price(self, sources: List[int]) -> bool:
+        """Dijkstra from ``sources`` on reduced costs; shifts the potentials so the
+        shortest paths to the sink have zero reduced cost. False if none exists."""
+        S, pi, crew, load, cap, fair = self.n_shifts, self.pi, self.crew, self.load, self.cap, self.fair_unit
+        pi_sink = pi[self.sink]
+        dist = dict.fromkeys(sources, 0)
+        heap = [(0, s) for s in sources]
+        settled = []
+        best = None
+        while heap:
+            d, u = heapq.heappop(heap)
+            if best is not None and d >= best:
+                break
+            if d > dist[u]:
+                continue
+            settled.append((u, d))
+            base = d + pi[u]
+            if u < S:
+                # shift -> eligible employee not on it (join)
+                members = crew[u]
+                for e, c in zip(self.eligible[u], self.costs[u]):
+                    if e in members:
+                        continue
+                    v = S + e
+                    nd = base + c - pi[v]
+                    if nd < dist.get(v, nd + 1):
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+            else:
+                e = u - S
+                if load[e] < cap:
+                    nd = base + fair * (2 * load[e] + 1) - pi_sink
+                    if best is None or nd < best:
+                        best = nd
+                # employee -> a shift they are on (leave it; its slot needs someone else)
+                for t in self.shifts_of[e]:
+                    nd = base - self.bonus[t].get(e, 0) - pi[t]
+                    if nd < dist.get(t, nd + 1):
+                        dist[t] = nd
+                        heapq.heappush(heap, (nd, t))
+        if best is None:
+            return False
+        for u, d in settled:
+            pi[u] += d - best
+        return True
+
+    def _route(self, s: int, dead: Set[int]) -> bool:
+        """One unit from ``s`` to the sink along zero reduced-cost arcs (DFS).
+        Nodes that fail are added to ``dead`` for the rest of the phase."""
+        S, pi, crew, load, cap, fair = self.n_shifts, self.pi, self.crew, self.load, self.cap, self.fair_unit
+        pi_sink = pi[self.sink]
+        path = [s]
+        seen = {s}
+        pos = [0]
+        while path:
+            u = path[-1]
+            i = pos[-1]
+            nxt = -1
+            if u < S:
+                eligible, costs, members = self.eligible[u], self.costs[u], crew[u]
+                base = pi[u]
+                while i < len(eligible):
+                    e = eligible[i]
+                    i += 1
+                    v = S + e
+                    if e not in members and v not in seen and v not in dead and base + costs[i - 1] == pi[v]:
+                        nxt = v
+                        break
+            else:
+                e = u - S
+                if i == 0:
+                    i = 1
+                    if load[e] < cap and fair * (2 * load[e] + 1) + pi[u] == pi_sink:
+                        self._apply(path)
+                        return True
+                shifts = self.shifts_of[e]
+                while i - 1 < len(shifts):
+                    t = shifts[i - 1]
+                    i += 1
+                    if t not in seen and t not in dead and pi[u] - self.bonus[t].get(e, 0) == pi[t]:
+                        nxt = t
+                        break
+            pos[-1] = i
+            if nxt < 0:
+                dead.add(u)
+                path.pop()
+                pos.pop()
+            else:
+                seen.add(nxt)
+                path.append(nxt)
+                pos.append(0)
+        return False
+
+    def _apply(self, path: List[int]) -> None:
+        # path = shift, employee, shift, employee, ...: each employee joins the shift
+        # before it and leaves the shift after it; the last one gains a shift.
+        S = self.n_shifts
+        self.load[path[-1] - S] += 1
+        for i in range(0, len(path), 2):
+            t, e = path[i], path[i + 1] - S
+            self.crew[t].add(e)
+            self.shifts_of[e].append(t)
+            if i:
+                leaver = path[i - 1] - S
+                self.crew[t].discard(leaver)
+                self.shifts_of[leaver].remove(t)
+
+    def schedule(self) -> Schedule:
+        shift_ids, employee_ids = self.ids.shift_ids, self.ids.employee_ids
+        return Schedule(
+            assignments={shift_ids[s]: [employee_ids[e] for e in sorted(c)] for s, c in enumerate(self.crew)}
+        )
+
+
+def flow_construct(config: Config, rnd: Optional[random.Random] = None) -> Schedule:
+    """Optimal staffing of the coverage/skills/cap relaxation, then local repair.
+
+    ``MinCostStaffing`` solves the relaxation exactly (coverage first, then fairness
+    and preferences); ``shed`` drops the assignments that break rest, run or custom
+    rules and ``fill`` restaffs the freed slots with employees who stay valid. The
+    result is deterministic, so ``rnd`` is unused.
+    """
+    ev = IncrementalEvaluator(config, MinCostStaffing(config).solve().schedule())
+    shed(ev)
+    fill(config, ev)
+    return ev.schedule
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import random
+from array import array
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .compact import CompactSchedule, RosterIds
+from .constraint_specs import CompiledConstraints
+from .domain import Config, Schedule
+from .eligibility import EligibilityIndex
+from .scoring import ScoreModel
+from .timeline import ShiftTimes, Timeline, TimelineRules
+
+
+class IndexedSet:
+    """Set of ints with O(1) add/discard and uniform random choice."""
+
+    def __init__(self) -> None:
+        self.items: List[int] = []
+        self._pos: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, x: int) -> bool:
+        return x in self._pos
+
+    def add(self, x: int) -> None:
+        if x not in self._pos:
+            self._pos[x] = len(self.items)
+            self.items.append(x)
+
+    def discard(self, x: int) -> None:
+        i = self._pos.pop(x, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if last != x:
+            self.items[i] = last
+            self._pos[last] = i
+
+    def choice(self, rnd: random.Random) -> int:
+        return self.items[rnd.randrange(len(self.items))]
+
+
+@dataclass(frozen=True)
+class MoveEval:
+    violations: int
+    violation_delta: int
+    score_delta: float
+
+
+class IncrementalEvaluator:
+    """Delta evaluation of hard violations and score for local search.
+
+    Works on a ``CompactSchedule`` (integer employee/shift ids, see ``RosterIds``) and
+    keeps per-employee ``Timeline``s (rest and run checks maintained on insert/remove),
+    per-shift coverage and running fairness sums so a move only re-checks the
+    employees and shifts it touches, each in O(log n). Counts match
+    ``ConstraintSuite.default().validate`` and ``score_schedule`` for schedules that
+    only reference ids present in the config; hard rules from ``config.constraints``
+    are re-checked for each touched employee/shift by their compiled checkers.
+
+    Moves are applied tentatively by ``propose_*`` and must be followed by ``commit()``
+    or ``rollback()``.
+
+    With a ``baseline`` schedule (warm start) the score includes the churn penalty of
+    ``score_schedule(config, schedule, baseline)``. ``frozen`` shifts are left alone by
+    the search neighbourhoods.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        schedule: Schedule,
+        baseline: Optional[Schedule] = None,
+        frozen: FrozenSet[int] = frozenset(),
+    ) -> None:
+        self.config = config
+        self.ids = RosterIds.for_config(config)
+        self.state = CompactSchedule.from_schedule(config, schedule)
+        self.state.ensure_keys()
+
+        index = EligibilityIndex.for_config(config)
+        shifts = list(config.shifts.values())
+        n_shifts = len(shifts)
+        self._available = index.available_by_shift
+        self._skills = index.skills_by_shift
+        self._needs_skills = [bool(sh.required_skills) for sh in shifts]
+        self._required = [sh.required_headcount for sh in shifts]
+        # Timelines sort by (start, schedule key order) so ties on start sort exactly
+        # like the stable sort used by the full constraint checks.
+        start = ShiftTimes.for_config(config).start
+        rank = {s: i for i, s in enumerate(self.state.key_order)}
+        rules = TimelineRules.for_config(config, key=[start[s] * n_shifts + rank[s] for s in range(n_shifts)])
+        self._cap = config.policies.max_shifts_per_week
+        # Hard rules declared in the config, re-checked per touched employee/shift.
+        custom = tuple(spec for spec in config.constraints if spec.severity == "hard")
+        self._custom = CompiledConstraints.for_config(config, custom) if custom else None
+
+        self._model = ScoreModel.for_config(config)
+        self._reward = self._model.reward
+
+        assigned: List[List[int]] = [[] for _ in self.ids.employee_ids]
+        for s in self.state.key_order:
+            for e in self.state.members(s):
+                assigned[e].append(s)
+        self._timelines = [Timeline(rules, tl) for tl in assigned]
+        # Availability and skill misses per employee, updated on link/unlink.
+        self._ineligible = [sum(self._misfit(s, e) for s in tl) for e, tl in enumerate(assigned)]
+
+        self._emp_viol = [self._employee_violations(e) for e in range(len(self._timelines))]
+        self._shift_viol = [self._coverage_violation(s) for s in range(n_shifts)]
+        self._violations = sum(self._emp_viol) + sum(self._shift_viol)
+        # Targets for repair moves, kept in sync with the caches above.
+        self.under_covered = IndexedSet()
+        self.violating_employees = IndexedSet()
+        for s, v in enumerate(self._shift_viol):
+            if v:
+                self.under_covered.add(s)
+        for e, v in enumerate(self._emp_viol):
+            if v:
+                self.violating_employees.add(e)
+
+        self._n = len(self._timelines)
+        self._n_shifts = n_shifts
+        self._sum = sum(len(t) for t in self._timelines)
+        self._sumsq = sum(len(t) ** 2 for t in self._timelines)
+        self._pref_points = sum(
+            self._reward(s, e) for s in self.state.key_order for e in self.state.members(s)
+        )
+
+        # Pending-move state: journal marks plus saved per-employee/shift caches.
+        self._tl_journal = array("i")
+        self._state_mark = 0
+        self._saved_emp: Dict[int, int] = {}
+        # (short_rests, long_runs, ineligible) per touched employee, restored on rollback
+        self._saved_counts: Dict[int, Tuple[int, int, int]] = {}
+        self._saved_shift: Dict[int, int] = {}
+        self._saved_totals: Tuple[int, int, int, float, int] | None = None
+        self._score_before = 0.0
+        self.moves = 0  # proposals evaluated, for throughput reporting
+        self.frozen = frozen
+
+        # Churn against the baseline as (employee * n_shifts + shift) pair keys; pairs
+        # naming unknown ids can never be restored and count as a constant.
+        self._baseline: Optional[Set[int]] = None
+        self._churn = 0
+        if baseline is not None:
+            self._baseline = set()
+            unknown = 0
+            for sid, eids in baseline.assignments.items():
+                s = self.ids.shift_pos.get(sid)
+                for eid in eids:
+                    e = self.ids.employee_pos.get(eid)
+                    if s is None or e is None:
+                        unknown += 1
+                    else:
+                        self._baseline.add(e * n_shifts + s)
+            current = {e * n_shifts + s for s in self.state.key_order for e in self.state.members(s)}
+            self._churn = unknown + len(self._baseline ^ current)
+
+    # -- public API -------------------------------------------------------
+
+    @property
+    def schedule(self) -> Schedule:
+        return self.state.to_schedule()
+
+    @property
+    def violations(self) -> int:
+        return self._violations
+
+    @property
+    def score(self) -> float:
+        prefs = self.config.preferences
+        return (
+            self._fairness() * prefs.fairness_weight
+            + self._pref_points * prefs.preference_weight
+            - self._churn * prefs.churn_weight
+        )
+
+    @property
+    def churn(self) -> int:
+        return self._churn
+
+    def employee_violations(self, e: int) -> int:
+        return self._emp_viol[e]
+
+    def propose_swap(self, s1: int, e1: int, s2: int, e2: int) -> MoveEval:
+        """Tentatively move e1 from s1 to s2 and e2 from s2 to s1 (integer ids)."""
+        self._begin()
+        self._replace(s1, e1, e2)
+        self._replace(s2, e2, e1)
+        return self._finish()
+
+    def propose_reassign(self, s: int, k: int, e: int) -> MoveEval:
+        """Tentatively replace the employee in slot k of shift s with e."""
+        self._begin()
+        old = self.state.get(s, k)
+        self._touch(s, old, e)
+        self.state.set(s, k, e)
+        self._unlink(old, s)
+        self._link(e, s)
+        return self._finish()
+
+    def propose_add(self, s: int, e: int) -> MoveEval:
+        """Tentatively assign e to shift s."""
+        self._begin()
+        self._touch(s, e)
+        self.state.insert(s, e)
+        self._link(e, s)
+        return self._finish()
+
+    def propose_remove(self, s: int, k: int) -> MoveEval:
+        """Tentatively unassign the employee in slot k of shift s."""
+        self._begin()
+        e = self.state.get(s, k)
+        self._touch(s, e)
+        self.state.delete(s, k)
+        self._unlink(e, s)
+        return self._finish()
+
+    def employee_shifts(self, e: int) -> List[int]:
+        return self._timelines[e].shifts
+
+    def commit(self) -> None:
+        self.state.forget()
+        del self._tl_journal[:]
+        self._saved_emp.clear()
+        self._saved_counts.clear()
+        self._saved_shift.clear()
+        self._saved_totals = None
+
+    def rollback(self) -> None:
+        if self._saved_totals is None:
+            return
+        self.state.undo(self._state_mark)
+        j = self._tl_journal
+        while j:
+            linked, e, s = j[-3:]
+            del j[-3:]
+            if linked:
+                self._timelines[e].remove(s, recount=False)
+            else:
+                self._timelines[e].insert(s, recount=False)
+        for e, (rests, runs, ineligible) in self._saved_counts.items():
+            tl = self._timelines[e]
+            tl.short_rests, tl.long_runs = rests, runs
+            self._ineligible[e] = ineligible
+        for e, v in self._saved_emp.items():
+            self._set_emp_viol(e, v)
+        for s, v in self._saved_shift.items():
+            self._set_shift_viol(s, v)
+        self._violations, self._sum, self._sumsq, self._pref_points, self._churn = self._saved_totals
+        self.commit()
+
+    # -- move plumbing ----------------------------------------------------
+
+    def _begin(self) -> None:
+        if self._saved_totals is not None:
+            raise RuntimeError("A proposed move is pending; commit() or rollback() first.")
+        self.moves += 1
+        self._state_mark = self.state.mark()
+        self._saved_totals = (self._violations, self._sum, self._sumsq, self._pref_points, self._churn)
+        self._score_before = self.score
+
+    def _finish(self) -> MoveEval:
+        before = self._saved_totals[0] if self._saved_totals else self._violations
+        for e in self._saved_emp:
+            new = self._employee_violations(e)
+            self._violations += new - self._emp_viol[e]
+            self._set_emp_viol(e, new)
+        for s in self._saved_shift:
+            new = self._coverage_violation(s)
+            self._violations += new - self._shift_viol[s]
+            self._set_shift_viol(s, new)
+        return MoveEval(
+            violations=self._violations,
+            violation_delta=self._violations - before,
+            score_delta=self.score - self._score_before,
+        )
+
+    def _set_emp_viol(self, e: int, v: int) -> None:
+        self._emp_viol[e] = v
+        if v:
+            self.violating_employees.add(e)
+        else:
+            self.violating_employees.discard(e)
+
+    def _set_shift_viol(self, s: int, v: int) -> None:
+        self._shift_viol[s] = v
+        if v:
+            self.under_covered.add(s)
+        else:
+            self.under_covered.discard(s)
+
+    def _touch(self, s: int, *employees: int) -> None:
+        self._saved_shift.setdefault(s, self._shift_viol[s])
+        for e in employees:
+            if e not in self._saved_emp:
+                self._saved_emp[e] = self._emp_viol[e]
+                tl = self._timelines[e]
+                self._saved_counts[e] = (tl.short_rests, tl.long_runs, self._ineligible[e])
+
+    def _replace(self, s: int, old: int, new: int) -> None:
+        state = self.state
+        for k in range(state.count(s)):
+            if state.get(s, k) != old:
+                continue
+            self._touch(s, old, new)
+            state.set(s, k, new)
+            self._unlink(old, s)
+            self._link(new, s)
+
+    def _link(self, e: int, s: int) -> None:
+        tl = self._timelines[e]
+        k = len(tl)
+        self._sum += 1
+        self._sumsq += 2 * k + 1
+        self._pref_points += self._reward(s, e)
+        self._ineligible[e] += self._misfit(s, e)
+        tl.insert(s)
+        self._tl_journal.extend((1, e, s))
+        if self._baseline is not None:
+            self._churn += -1 if e * self._n_shifts + s in self._baseline else 1
+
+    def _unlink(self, e: int, s: int) -> None:
+        tl = self._timelines[e]
+        tl.remove(s)
+        k = len(tl)
+        self._sum -= 1
+        self._sumsq -= 2 * k + 1
+        self._pref_points -= self._reward(s, e)
+        self._ineligible[e] -= self._misfit(s, e)
+        self._tl_journal.extend((0, e, s))
+        if self._baseline is not None:
+            self._churn += 1 if e * self._n_shifts + s in self._baseline else -1
+
+    # -- local checks -----------------------------------------------------
+
+    def _coverage_violation(self, s: int) -> int:
+        n = int(self.state.count(s) < self._required[s])
+        if self._custom is not None:
+            n += self._custom.shift_count(s, list(self.state.members(s)))
+        return n
+
+    def _employee_violations(self, e: int) -> int:
+        tl = self._timelines[e]
+        n = self._ineligible[e] + (len(tl) > self._cap) + tl.short_rests + (tl.long_runs > 0)
+        if self._custom is not None:
+            n += self._custom.employee_count(e, tl.shifts)
+        return n
+
+    def _misfit(self, s: int, e: int) -> int:
+        return (not self._available[s] >> e & 1) + (self._needs_skills[s] and not self._skills[s] >> e & 1)
+
+    def _fairness(self) -> float:
+        return ScoreModel.fairness(self._n, self._sum, self._sumsq)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .constraints import ConstraintSuite
+from .domain import Config, Schedule
+from .scoring import score_schedule
+from .solver import STRATEGIES, SolveResult, _improve, solve
+
+DEFAULT_STRATEGIES: Tuple[str, ...] = ("anneal", "tabu")
+
+
+@dataclass(frozen=True)
+class PortfolioMember:
+    seed: int
+    strategy: str
+
+
+@dataclass
+class WorkerStats:
+    member: int
+    seed: int
+    strategy: str
+    ok: bool
+    violations: int
+    score: float
+    iterations: int
+    seconds: float
+
+
+@dataclass
+class PortfolioResult:
+    best: SolveResult
+    best_member: int
+    workers: List[WorkerStats]
+
+
+# Set once per worker process by the pool initializer, so tasks only carry a seed,
+# a strategy, a budget and (when sharing) the incumbent assignments.
+_WORKER_CONFIG: Optional[Config] = None
+
+
+def _init_worker(config: Config) -> None:
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = config
+
+
+def _run_member(
+    member: PortfolioMember,
+    round_no: int,
+    max_seconds: float,
+    max_iterations: int,
+    incumbent: Optional[Dict[str, List[str]]],
+    config: Optional[Config] = None,
+) -> Tuple[SolveResult, int, float]:
+    base = config if config is not None else _WORKER_CONFIG
+    assert base is not None, "worker not initialised"
+    cfg = base.with_solver(
+        random_seed=member.seed,
+        strategy=member.strategy,
+        max_seconds=max_seconds,
+        max_iterations=max_iterations,
+    )
+    if incumbent is None:
+        result = solve(cfg)
+    elif member.strategy == "exact":
+        # Exact search neither uses the seed nor improves the score, so rerunning it
+        # can't beat the incumbent; the member carries it into the next round.
+        schedule = Schedule(assignments=incumbent)
+        ok = ConstraintSuite.default().validate(cfg, schedule).ok
+        result = SolveResult(schedule, ok, 0, 0.0, [f"Round {round_no}: exact member kept the shared incumbent."])
+    else:
+        rnd = random.Random(member.seed * 1_000_003 + round_no)
+        result = _improve(cfg, Schedule(assignments=incumbent), rnd, time.time())
+    violations = len(ConstraintSuite.default().validate(cfg, result.schedule).violations)
+    return result, violations, score_schedule(cfg, result.schedule).total
+
+
+def solve_portfolio(
+    config: Config,
+    workers: Optional[int] = None,
+    seeds: Optional[Sequence[int]] = None,
+    strategies: Optional[Sequence[str]] = None,
+    share_rounds: int = 1,
+) -> PortfolioResult:
+    """Run independent seeded searches across processes and keep the best.
+
+    Members are ``(seed, strategy)`` pairs: ``seeds`` defaults to ``workers`` seeds
+    starting at ``solver.random_seed`` and strategies are cycled over them;
+    ``strategies`` defaults to ``solver.strategy`` followed by the other
+    ``DEFAULT_STRATEGIES``, so the first member repeats the single-process solve. The
+    ``solver.max_seconds`` budget is shared wall-clock. With ``share_rounds > 1`` the
+    budget is split into rounds and every member restarts from the best incumbent
+    of the previous round (``exact`` members only run in the first round and then
+    carry the incumbent).
+
+    The winner is the best (valid, fewest violations, highest score), ties going to
+    the lowest member index, so runs bounded by ``max_iterations`` are deterministic
+    for a given seed set and worker count.
+    """
+    n_workers = max(1, int(workers or config.solver.workers or os.cpu_count() or 1))
+    seed_list = list(seeds) if seeds else [config.solver.random_seed + i for i in range(n_workers)]
+    if strategies:
+        strategy_list = list(strategies)
+    else:
+        strategy_list = [config.solver.strategy]
+        strategy_list += [s for s in DEFAULT_STRATEGIES if s != config.solver.strategy]
+    for strategy in strategy_list:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown solver strategy: {strategy} (expected one of {sorted(STRATEGIES)})")
+    members = [PortfolioMember(seed, strategy_list[i % len(strategy_list)]) for i, seed in enumerate(seed_list)]
+
+    start = time.time()
+    deadline = start + max(0.1, float(config.solver.max_seconds))
+    rounds = max(1, int(share_rounds))
+    round_iterations = max(1, -(-int(config.solver.max_iterations) // rounds))
+
+    results: List[Tuple[SolveResult, int, float]] = []
+    iterations = [0] * len(members)
+    incumbent: Optional[Dict[str, List[str]]] = None
+    best = 0
+
+    pool = None
+    if n_workers > 1 and len(members) > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=min(n_workers, len(members)), initializer=_init_worker, initargs=(config,)
+        )
+    try:
+        for round_no in range(rounds):
+            budget = max(0.05, (deadline - time.time()) / (rounds - round_no))
+            args = [(m, round_no, budget, round_iterations, incumbent) for m in members]
+            if pool is not None:
+                results = list(pool.map(_run_member, *zip(*args)))
+            else:
+                results = [_run_member(*a, config=config) for a in args]
+            for i, (res, _, _) in enumerate(results):
+                iterations[i] += res.iterations
+            best = max(range(len(results)), key=lambda i: (results[i][0].ok, -results[i][1], results[i][2]))
+            incumbent = results[best][0].schedule.assignments
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    seconds = time.time() - start
+    stats = [
+        WorkerStats(
+            member=i,
+            seed=m.seed,
+            strategy=m.strategy,
+            ok=res.ok,
+            violations=violations,
+            score=score,
+            iterations=iterations[i],
+            seconds=res.seconds,
+        )
+        for i, (m, (res, violations, score)) in enumerate(zip(members, results))
+    ]
+    winner = results[best][0]
+    notes = list(winner.notes)
+    notes.append(
+        f"Portfolio: member {best} (seed {members[best].seed}, {members[best].strategy}) "
+        f"best of {len(members)} on {n_workers} worker(s), {rounds} round(s)."
+    )
+    merged = SolveResult(
+        schedule=winner.schedule,
+        ok=winner.ok,
+        iterations=iterations[best],
+        seconds=seconds,
+        notes=notes,
+        trace=winner.trace,
+    )
+    return PortfolioResult(best=merged, best_member=best, workers=stats)
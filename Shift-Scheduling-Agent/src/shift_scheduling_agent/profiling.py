@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# The profiler for the current thread/task, or None. Instrumented code fetches it
+# once per call (``active()``) and skips all bookkeeping when it is None, so
+# disabled profiling costs one context-variable lookup per solve/validate/load.
+_CURRENT: ContextVar[Optional["Profiler"]] = ContextVar("shift_agent_profiler", default=None)
+
+
+def active() -> Optional["Profiler"]:
+    return _CURRENT.get()
+
+
+@dataclass
+class PhaseStat:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+class _Phase:
+    __slots__ = ("_prof", "_name", "_t0")
+
+    def __init__(self, prof: "Profiler", name: str) -> None:
+        self._prof = prof
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._t0 = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self._prof.record(self._name, self._t0, time.perf_counter())
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str) -> Any:
+    """``with phase("solve.construct"):`` times a block under the active profiler (no-op otherwise)."""
+    prof = _CURRENT.get()
+    return _NO_PHASE if prof is None else _Phase(prof, name)
+
+
+class Profiler:
+    """Per-phase timers, counters and time series for one or more solves.
+
+    Phases are flat names (``solve.construct``, ``constraint.min_rest_hours``); nested
+    phases are counted in both. Counters cover move outcomes (``moves.accepted``,
+    ``moves.rejected.<reason>``) and cache hits. Series hold ``(seconds, value)``
+    samples such as the incumbent score, in seconds since the profiler was created.
+    Every timed phase also becomes a Chrome trace event (up to ``max_events``; later
+    ones are only aggregated).
+    """
+
+    def __init__(self, max_events: int = 100_000) -> None:
+        self.phases: Dict[str, PhaseStat] = {}
+        self.counters: Dict[str, int] = {}
+        self.series: Dict[str, List[Tuple[float, float]]] = {}
+        self.max_events = max_events
+        self.dropped_events = 0
+        self._events: List[Tuple[str, float, float, int]] = []
+        self._origin = time.perf_counter()
+        self._origin_wall = time.time()
+        self._lock = threading.Lock()
+
+    # -- recording --------------------------------------------------------
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def record(self, name: str, t0: float, t1: float) -> None:
+        with self._lock:
+            stat = self.phases.get(name)
+            if stat is None:
+                stat = self.phases[name] = PhaseStat()
+            stat.calls += 1
+            stat.seconds += t1 - t0
+            if len(self._events) < self.max_events:
+                self._events.append((name, t0, t1, threading.get_ident()))
+            else:
+                self.dropped_events += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def sample(self, name: str, value: float, at: Optional[float] = None) -> None:
+        """Add a point to a series; ``at`` is a ``time.time()`` stamp (default: now)."""
+        seconds = (time.time() if at is None else at) - self._origin_wall
+        self.series.setdefault(name, []).append((seconds, value))
+
+    # -- export -----------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phases": {
+                k: {"calls": v.calls, "seconds": v.seconds}
+                for k, v in sorted(self.phases.items(), key=lambda kv: -kv[1].seconds)
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "series": {k: [list(p) for p in v] for k, v in self.series.items()},
+            "dropped_events": self.dropped_events,
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Events in the Chrome trace format (load in ``chrome://tracing`` or Perfetto)."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        for name, t0, t1, tid in self._events:
+            events.append(
+                {
+                    "name": name,
+                    "cat": name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (t0 - self._origin) * 1e6,
+                    "dur": (t1 - t0) * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                }
+            )
+        for name, points in self.series.items():
+            for seconds, value in points:
+                events.append({"name": name, "ph": "C", "ts": seconds * 1e6, "pid": pid, "args": {name: value}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str | Path) -> Tuple[Path, Path]:
+        """Write ``path`` (JSON summary) and ``<stem>.trace.json`` next to it."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        trace = p.with_name(p.stem + ".trace.json")
+        p.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        trace.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return p, trace
+
+
+@contextmanager
+def profiled(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """Enable profiling for the enclosed calls in this thread/task."""
+    prof = profiler or Profiler()
+    token = _CURRENT.set(prof)
+    try:
+        yield prof
+    finally:
+        _CURRENT.reset(token)
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
-from statistics import pstdev
-from typing import Dict, List, Tuple
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from .compact import RosterIds
 from .domain import Config, Schedule
+from .profiling import phase
+
+# Named parts of the day for ``prefer_time`` / ``avoid_time`` (by shift start hour,
+# [from, to) with wrap-around); "HH-HH" ranges are accepted too.
+TIME_OF_DAY = {"morning": (5, 12), "afternoon": (12, 17), "evening": (17, 22), "night": (22, 5)}
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
 
 
 @dataclass(frozen=True)
@@ -17,31 +25,161 @@ class ScoreReport:
         return {"total": self.total, "components": dict(self.components), "notes": list(self.notes)}
 
 
-def score_schedule(config: Config, schedule: Schedule) -> ScoreReport:
+def churn(schedule: Schedule, baseline: Schedule) -> int:
+    """Assignments (shift, employee) added or removed going from ``baseline`` to ``schedule``."""
+    before = {(sid, eid) for sid, eids in baseline.assignments.items() for eid in eids}
+    after = {(sid, eid) for sid, eids in schedule.assignments.items() for eid in eids}
+    return len(before ^ after)
+
+
+def _hours(spec: str) -> Iterable[int]:
+    key = spec.strip().lower()
+    if key in TIME_OF_DAY:
+        lo, hi = TIME_OF_DAY[key]
+    else:
+        try:
+            a, b = key.split("-")
+            lo, hi = int(a) % 24, int(b) % 24
+        except ValueError:
+            raise ValueError(f"Unknown time of day: {spec!r} (expected one of {sorted(TIME_OF_DAY)} or 'HH-HH')") from None
+    h = lo
+    while True:
+        yield h
+        h = (h + 1) % 24
+        if h == hi:
+            return
+
+
+def _day_off(spec: str) -> Tuple[str, int]:
+    # ("weekday", 0..6) or ("date", ordinal)
+    key = spec.strip().lower()
+    if key.isalpha() and key[:3] in WEEKDAYS:
+        return "weekday", WEEKDAYS.index(key[:3])
+    try:
+        return "date", date.fromisoformat(key).toordinal()
+    except ValueError:
+        raise ValueError(f"Unknown day off: {spec!r} (expected a weekday or YYYY-MM-DD)") from None
+
+
+class ScoreModel:
+    """Preference rewards and fairness terms compiled once per ``Config``.
+
+    ``reward(s, e)`` is the preference points employee ``e`` earns on shift ``s``
+    (config order): +1 for a ``prefer_skill`` match, +1/-1 for ``prefer_shift`` /
+    ``avoid_shift`` ids, +1/-1 for a start hour in ``prefer_time`` / ``avoid_time``
+    and -1 for a shift starting on one of the ``days_off`` (weekdays or ISO dates).
+    Skill matches are a bitset test; the other kinds are per-employee tables looked
+    up by shift id, start hour and day, so the cost doesn't grow with the number of
+    preferences and employees without them pay one extra test.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.ids = ids = RosterIds.for_config(config)
+        shifts = list(config.shifts.values())
+        skill_bits: Dict[str, int] = {}
+        self.shift_skills = [_bits(sh.required_skills, skill_bits) for sh in shifts]
+        self.shift_hour = [sh.start.hour for sh in shifts]
+        self.shift_day = [sh.start.toordinal() for sh in shifts]
+        self.shift_weekday = [sh.start.weekday() for sh in shifts]
+        prefs = config.preferences
+        self.fairness_weight = prefs.fairness_weight
+        self.preference_weight = prefs.preference_weight
+
+        n = len(ids.employee_ids)
+        self.skill_pref = [0] * n
+        # per employee: None, or (shift bonus by position, bonus by start hour [24],
+        # bonus by weekday [7], bonus by date ordinal)
+        self.extra: List[Optional[Tuple[Dict[int, float], List[float], List[float], Dict[int, float]]]] = [None] * n
+        for e, eid in enumerate(ids.employee_ids):
+            p = prefs.employee_shift_preferences.get(eid) or {}
+            self.skill_pref[e] = _bits(p.get("prefer_skill", []), skill_bits)
+            if not any(p.get(k) for k in ("prefer_shift", "avoid_shift", "prefer_time", "avoid_time", "days_off")):
+                continue
+            by_shift: Dict[int, float] = {}
+            for sign, key in ((1.0, "prefer_shift"), (-1.0, "avoid_shift")):
+                for sid in p.get(key, []):
+                    if sid in ids.shift_pos:
+                        by_shift[ids.shift_pos[sid]] = by_shift.get(ids.shift_pos[sid], 0.0) + sign
+            by_hour = [0.0] * 24
+            for sign, key in ((1.0, "prefer_time"), (-1.0, "avoid_time")):
+                for spec in p.get(key, []):
+                    for h in _hours(spec):
+                        by_hour[h] += sign
+            by_weekday = [0.0] * 7
+            by_date: Dict[int, float] = {}
+            for spec in p.get("days_off", []):
+                kind, v = _day_off(spec)
+                if kind == "weekday":
+                    by_weekday[v] -= 1.0
+                else:
+                    by_date[v] = by_date.get(v, 0.0) - 1.0
+            self.extra[e] = (by_shift, by_hour, by_weekday, by_date)
+
+    @staticmethod
+    def for_config(config: Config) -> "ScoreModel":
+        return config.derived("score_model", ScoreModel)
+
+    def reward(self, s: int, e: int) -> float:
+        r = 1.0 if self.skill_pref[e] & self.shift_skills[s] else 0.0
+        extra = self.extra[e]
+        if extra is not None:
+            by_shift, by_hour, by_weekday, by_date = extra
+            r += by_shift.get(s, 0.0) + by_hour[self.shift_hour[s]] + by_weekday[self.shift_weekday[s]]
+            if by_date:
+                r += by_date.get(self.shift_day[s], 0.0)
+        return r
+
+    @staticmethod
+    def fairness(n: int, total: int, sumsq: int) -> float:
+        """-(population std dev) of shift counts from their sum and sum of squares."""
+        if n < 2:
+            return 0.0
+        return -math.sqrt(max(0, n * sumsq - total * total)) / n
+
+
+def _bits(skills: Iterable[str], table: Dict[str, int]) -> int:
+    mask = 0
+    for skill in skills:
+        mask |= 1 << table.setdefault(skill, len(table))
+    return mask
+
+
+def score_schedule(config: Config, schedule: Schedule, baseline: Optional[Schedule] = None) -> ScoreReport:
+    # With a ``baseline`` (the published schedule of a warm start) the score also
+    # charges ``churn_weight`` per changed assignment.
+    with phase("score"):
+        return _score(config, schedule, baseline)
+
+
+def _score(config: Config, schedule: Schedule, baseline: Optional[Schedule]) -> ScoreReport:
     # Higher is better.
+    model = ScoreModel.for_config(config)
+    shift_pos, employee_pos = model.ids.shift_pos, model.ids.employee_pos
     comps: Dict[str, float] = {}
     notes: List[str] = []
 
-    # Fairness: minimize standard deviation of shifts per employee
-    emp_to = schedule.employee_shifts()
-    counts = [len(emp_to.get(eid, [])) for eid in config.employees.keys()]
-    fairness = -pstdev(counts) if len(counts) >= 2 else 0.0
-    comps["fairness"] = fairness * config.preferences.fairness_weight
-
-    # Preferences: reward when employee gets preferred skill tags
+    # Fairness: minimize standard deviation of shifts per employee (assignments to
+    # unknown shift ids still count as shifts)
+    counts = [0] * len(employee_pos)
     pref_points = 0.0
     for sid, eids in schedule.assignments.items():
-        shift = config.shifts.get(sid)
-        if shift is None:
-            continue
+        s = shift_pos.get(sid)
         for eid in eids:
-            prefs = config.preferences.employee_shift_preferences.get(eid, {})
-            prefer_skill = set(prefs.get("prefer_skill", []))
-            if prefer_skill and shift.required_skills and (shift.required_skills & prefer_skill):
-                pref_points += 1.0
-    comps["preferences"] = pref_points * config.preferences.preference_weight
+            e = employee_pos.get(eid)
+            if e is None:
+                continue
+            counts[e] += 1
+            if s is not None:
+                pref_points += model.reward(s, e)
+    fairness = ScoreModel.fairness(len(counts), sum(counts), sum(c * c for c in counts))
+    comps["fairness"] = fairness * model.fairness_weight
+    comps["preferences"] = pref_points * model.preference_weight
+
+    if baseline is not None:
+        comps["churn"] = -churn(schedule, baseline) * config.preferences.churn_weight
 
     total = sum(comps.values())
     if fairness == 0.0:
         notes.append("Fairness score is flat (small roster).")
     return ScoreReport(total=total, components=comps, notes=notes)
+
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .anytime import active as active_control
+from .compact import CompactSchedule
+from .domain import Config
+from .eligibility import EligibilityIndex, iter_bits
+from .incremental import IncrementalEvaluator, MoveEval
+from .profiling import active, phase
+
+
+@dataclass(frozen=True)
+class TracePoint:
+    seconds: float
+    iteration: int
+    score: float
+    violations: int
+
+
+# Moves are flat int tuples: (kind, a, b, c, d)
+#   SWAP      (s1, e1, s2, e2)
+#   REASSIGN  (s, slot, new_employee, old_employee)
+#   ADD       (s, employee, -, -)
+#   REMOVE    (s, slot, employee, -)
+Move = Tuple[int, int, int, int, int]
+SWAP, REASSIGN, ADD, REMOVE = range(4)
+
+_MOVES_PER_ITERATION = 20
+
+
+class _Incumbent:
+    """Best state seen so far, ranked by (violations, -score)."""
+
+    def __init__(self, ev: IncrementalEvaluator, start: float, trace: List[TracePoint]) -> None:
+        self._start = start
+        self._trace = trace
+        self._control = active_control()
+        self.state = ev.state.copy()
+        self.violations = ev.violations
+        self.score = ev.score
+        trace.append(TracePoint(time.time() - start, 0, self.score, self.violations))
+        if self._control is not None:
+            self._control.offer(self.state, self.score, self.violations, 0, ev.moves)
+
+    def beats(self, violations: int, score: float) -> bool:
+        return violations < self.violations or (violations == self.violations and score > self.score + 1e-12)
+
+    def offer(self, ev: IncrementalEvaluator, iteration: int) -> None:
+        if self.beats(ev.violations, ev.score):
+            with phase("search.incumbent_copy"):
+                self.state = ev.state.copy()
+            self.violations = ev.violations
+            self.score = ev.score
+            self._trace.append(TracePoint(time.time() - self._start, iteration, self.score, self.violations))
+            if self._control is not None:
+                self._control.offer(self.state, self.score, self.violations, iteration, ev.moves)
+
+
+class _Neighbourhood:
+    def __init__(self, config: Config, ev: IncrementalEvaluator) -> None:
+        self._ev = ev
+        self._masks = EligibilityIndex.for_config(config).eligible_by_shift
+        self._eligible: Dict[int, List[int]] = {}
+        self._n_shifts = len(config.shifts)
+        self._frozen = ev.frozen
+        self._movable = [s for s in range(self._n_shifts) if s not in ev.frozen] if ev.frozen else None
+
+    def _random_shift(self, rnd: random.Random) -> int:
+        if self._movable is None:
+            return rnd.randrange(self._n_shifts)
+        return self._movable[rnd.randrange(len(self._movable))]
+
+    def _random_eligible(self, s: int, rnd: random.Random) -> Optional[int]:
+        pool = self._eligible.get(s)
+        if pool is None:
+            pool = self._eligible[s] = list(iter_bits(self._masks[s]))
+        return pool[rnd.randrange(len(pool))] if pool else None
+
+    def random_move(self, rnd: random.Random) -> Optional[Move]:
+        ev, state = self._ev, self._ev.state
+        if self._movable == []:
+            return None
+        r = rnd.random()
+
+        if r < 0.3 and ev.under_covered:
+            s = ev.under_covered.choice(rnd)
+            e = self._random_eligible(s, rnd)
+            if e is None or state.contains(s, e) or s in self._frozen:
+                return None
+            return (ADD, s, e, 0, 0)
+
+        if r < 0.45 and ev.violating_employees:
+            e = ev.violating_employees.choice(rnd)
+            shifts = ev.employee_shifts(e)
+            if not shifts:
+                return None
+            s = shifts[rnd.randrange(len(shifts))]
+            if s in self._frozen:
+                return None
+            return (REMOVE, s, list(state.members(s)).index(e), e, 0)
+
+        if r < 0.75:
+            s = self._random_shift(rnd)
+            n = state.count(s)
+            e = self._random_eligible(s, rnd)
+            if not n or e is None or state.contains(s, e):
+                return None
+            k = rnd.randrange(n)
+            return (REASSIGN, s, k, e, state.get(s, k))
+
+        s1 = self._random_shift(rnd)
+        s2 = self._random_shift(rnd)
+        n1, n2 = state.count(s1), state.count(s2)
+        if s1 == s2 or not n1 or not n2:
+            return None
+        e1 = state.get(s1, rnd.randrange(n1))
+        e2 = state.get(s2, rnd.randrange(n2))
+        # like ADD/REASSIGN, never put an employee on a shift they already work
+        if e1 == e2 or state.contains(s1, e2) or state.contains(s2, e1):
+            return None
+        return (SWAP, s1, e1, s2, e2)
+
+
+def _apply(ev: IncrementalEvaluator, move: Move) -> MoveEval:
+    kind, a, b, c, d = move
+    if kind == SWAP:
+        return ev.propose_swap(a, b, c, d)
+    if kind == REASSIGN:
+        return ev.propose_reassign(a, b, c)
+    if kind == ADD:
+        return ev.propose_add(a, b)
+    return ev.propose_remove(a, b)
+
+
+def _added_pairs(move: Move) -> List[Tuple[int, int]]:
+    kind, a, b, c, d = move
+    if kind == SWAP:
+        return [(d, a), (b, c)]
+    if kind == REASSIGN:
+        return [(c, a)]
+    if kind == ADD:
+        return [(b, a)]
+    return []
+
+
+def _removed_pairs(move: Move) -> List[Tuple[int, int]]:
+    kind, a, b, c, d = move
+    if kind == SWAP:
+        return [(b, a), (d, c)]
+    if kind == REASSIGN:
+        return [(d, a)]
+    if kind == REMOVE:
+        return [(c, a)]
+    return []
+
+
+def _gain(config: Config, move: MoveEval) -> float:
+    # Hard constraints enter the objective as a penalty so the search can cross
+    # infeasible regions (and repair an invalid start).
+    return move.score_delta - config.solver.penalty_weight * move.violation_delta
+
+
+def anneal(
+    config: Config,
+    ev: IncrementalEvaluator,
+    rnd: random.Random,
+    *,
+    start: float,
+    deadline: float,
+    max_iterations: int,
+    trace: List[TracePoint],
+) -> Tuple[CompactSchedule, int]:
+    """Simulated annealing over swap/reassign/add/remove moves."""
+    sol = config.solver
+    temperature = max(1e-6, sol.initial_temperature)
+    cooling = min(1.0, max(0.0, sol.cooling_rate))
+    moves = _Neighbourhood(config, ev)
+    best = _Incumbent(ev, start, trace)
+    prof = active()
+
+    ctl = active_control()
+    iterations = 0
+    while iterations < max_iterations and time.time() < deadline:
+        if ctl is not None and ctl.should_stop(ev.moves):
+            break
+        iterations += 1
+        for _ in range(_MOVES_PER_ITERATION):
+            move = moves.random_move(rnd)
+            if move is None:
+                if prof is not None:
+                    prof.count("moves.skipped")
+                continue
+            gain = _gain(config, _apply(ev, move))
+            if gain >= 0 or rnd.random() < math.exp(gain / temperature):
+                ev.commit()
+                best.offer(ev, iterations)
+                if prof is not None:
+                    prof.count("moves.accepted" if gain >= 0 else "moves.accepted.uphill")
+            else:
+                ev.rollback()
+                if prof is not None:
+                    prof.count("moves.rejected.metropolis")
+            temperature = max(1e-6, temperature * cooling)
+    return best.state, iterations
+
+
+def tabu_search(
+    config: Config,
+    ev: IncrementalEvaluator,
+    rnd: random.Random,
+    *,
+    start: float,
+    deadline: float,
+    max_iterations: int,
+    trace: List[TracePoint],
+) -> Tuple[CompactSchedule, int]:
+    """Tabu search: each iteration takes the best sampled non-tabu move.
+
+    Removing employee e from shift s forbids re-adding (e, s) for ``tabu_tenure``
+    iterations unless the move yields a new incumbent (aspiration).
+    """
+    tenure = max(0, config.solver.tabu_tenure)
+    moves = _Neighbourhood(config, ev)
+    best = _Incumbent(ev, start, trace)
+    tabu: Dict[Tuple[int, int], int] = {}
+    prof = active()
+
+    ctl = active_control()
+    iterations = 0
+    while iterations < max_iterations and time.time() < deadline:
+        if ctl is not None and ctl.should_stop(ev.moves):
+            break
+        iterations += 1
+        chosen: Optional[Move] = None
+        chosen_gain = -math.inf
+        candidates = 0
+        for _ in range(_MOVES_PER_ITERATION):
+            move = moves.random_move(rnd)
+            if move is None:
+                if prof is not None:
+                    prof.count("moves.skipped")
+                continue
+            result = _apply(ev, move)
+            aspiration = best.beats(result.violations, ev.score)
+            ev.rollback()
+            if not aspiration and any(tabu.get(p, 0) >= iterations for p in _added_pairs(move)):
+                if prof is not None:
+                    prof.count("moves.rejected.tabu")
+                continue
+            candidates += 1
+            gain = _gain(config, result)
+            if gain > chosen_gain:
+                chosen, chosen_gain = move, gain
+
+        if chosen is None:
+            continue
+        if prof is not None:
+            prof.count("moves.accepted")
+            prof.count("moves.rejected.not_best", candidates - 1)
+        _apply(ev, chosen)
+        ev.commit()
+        for pair in _removed_pairs(chosen):
+            tabu[pair] = iterations + tenure
+        best.offer(ev, iterations)
+    return best.state, iterations
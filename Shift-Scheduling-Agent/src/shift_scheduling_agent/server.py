@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import signal
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .tools import CONFIG_CACHE, ToolRegistry, default_registry
+
+_MAX_BODY = 64 * 1024 * 1024
+_CANCELLED = 499  # nginx's "client closed request"; not in HTTPStatus
+
+Response = Tuple[int, Dict[str, Any]]
+
+
+class _RequestError(Exception):
+    # A request that can't be read; answered with ``status`` and the connection closed.
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _call_default_tool(name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # Runs in a pool process; each worker keeps its own warm CONFIG_CACHE.
+    return default_registry().call(name, **kwargs)
+
+
+class SchedulingServer:
+    """JSON-over-HTTP front end for the tool registry.
+
+    ``POST /tools/<name>`` calls a tool with the JSON body as keyword arguments.
+    With the default registry, ``process_tools`` (``schedule_generate``) run in a
+    process pool so a long solve never holds the GIL against validate/score/explain
+    calls, which run on a thread pool against the shared config cache.
+
+    A request may set ``?timeout=<seconds>``; generate calls also get it as their
+    ``max_seconds`` cap. Clients can tag requests with ``X-Request-Id`` and cancel them
+    with ``DELETE /requests/<id>`` (an id already in flight is refused with 409). Cancelling or timing out drops a queued solve; one
+    already running in a worker finishes within its budget and is discarded.
+
+    Other endpoints: ``GET /health``, ``GET /stats``, ``GET /tools``.
+    """
+
+    def __init__(
+        self,
+        registry: Optional[ToolRegistry] = None,
+        workers: int = 2,
+        default_timeout: float = 60.0,
+        process_tools: Sequence[str] = ("schedule_generate",),
+    ) -> None:
+        self.registry = registry or default_registry()
+        self.default_timeout = default_timeout
+        self.process_tools = set(process_tools) if registry is None else set()
+        # spawn, not fork: the parent has an event loop and live threads.
+        self._processes = (
+            ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+            if self.process_tools
+            else None
+        )
+        self._threads = ThreadPoolExecutor(max_workers=4)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._started = time.time()
+        self.counters: Dict[str, int] = {"requests": 0, "errors": 0, "timeouts": 0, "cancelled": 0}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle, host, port)
+
+    def close(self) -> None:
+        for task in self._inflight.values():
+            task.cancel()
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+    # -- HTTP -------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except _RequestError as e:
+                    self.counters["requests"] += 1
+                    self.counters["errors"] += 1
+                    self._write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = await self.dispatch(method, target, headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) < 2:
+            return None
+        headers: Dict[str, str] = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = h.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise _RequestError(400, "Bad request: invalid Content-Length") from None
+        if length < 0:
+            raise _RequestError(400, "Bad request: invalid Content-Length")
+        if length > _MAX_BODY:
+            raise _RequestError(413, f"Body larger than {_MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return parts[0].upper(), parts[1], headers, body
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        reason = "Cancelled" if status == _CANCELLED else HTTPStatus(status).phrase
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    # -- routing ----------------------------------------------------------
+
+    async def dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> Response:
+        self.counters["requests"] += 1
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+
+        if method == "GET" and path == "/health":
+            return 200, {"ok": True}
+        if method == "GET" and path == "/stats":
+            return 200, self.stats()
+        if method == "GET" and path == "/tools":
+            return 200, {"tools": self.registry.list()}
+        if method == "DELETE" and path.startswith("/requests/"):
+            task = self._inflight.get(path[len("/requests/") :])
+            if task is None:
+                return 404, {"error": "no such request"}
+            task.cancel()
+            return 200, {"cancelled": True}
+        if method == "POST" and path.startswith("/tools/"):
+            name = path[len("/tools/") :]
+            if name not in self.registry:
+                self.counters["errors"] += 1
+                return 404, {"error": f"Tool not found: {name}"}
+            try:
+                kwargs = json.loads(body or b"{}")
+                query = parse_qs(url.query)
+                timeout = float(query["timeout"][0]) if "timeout" in query else self.default_timeout
+                if not isinstance(kwargs, dict):
+                    raise ValueError("body must be a JSON object of tool arguments")
+            except ValueError as e:
+                self.counters["errors"] += 1
+                return 400, {"error": f"Bad request: {e}"}
+            request_id = headers.get("x-request-id") or uuid.uuid4().hex
+            if request_id in self._inflight:
+                self.counters["errors"] += 1
+                return 409, {"error": f"Request id already in flight: {request_id}"}
+            return await self._run_tool(name, kwargs, timeout, request_id)
+        return 404, {"error": f"No route for {method} {url.path}"}
+
+    async def _run_tool(self, name: str, kwargs: Dict[str, Any], timeout: float, request_id: str) -> Response:
+        loop = asyncio.get_running_loop()
+        try:
+            if name in self.process_tools:
+                if name == "schedule_generate":
+                    kwargs.setdefault("max_seconds", timeout)
+                future = loop.run_in_executor(self._processes, _call_default_tool, name, kwargs)
+            else:
+                future = loop.run_in_executor(self._threads, lambda: self.registry.call(name, **kwargs))
+            task = asyncio.ensure_future(asyncio.wait_for(future, timeout))
+            self._inflight[request_id] = task
+            result = await task
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            return 504, {"error": f"Timed out after {timeout:g}s", "request_id": request_id}
+        except asyncio.CancelledError:
+            self.counters["cancelled"] += 1
+            return _CANCELLED, {"error": "Cancelled", "request_id": request_id}
+        except (TypeError, ValueError, OSError) as e:
+            self.counters["errors"] += 1
+            return 400, {"error": f"{type(e).__name__}: {e}"}
+        except Exception as e:  # noqa: BLE001 - surfaced to the client
+            self.counters["errors"] += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            self._inflight.pop(request_id, None)
+        return 200, result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "inflight": len(self._inflight),
+            "uptime_seconds": round(time.time() - self._started, 3),
+            "config_cache": CONFIG_CACHE.stats(),
+        }
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, workers: int = 2, timeout: float = 60.0) -> None:
+    """Run the server until SIGINT/SIGTERM, then stop the worker pools."""
+
+    async def main() -> None:
+        server = SchedulingServer(workers=workers, default_timeout=timeout)
+        srv = await server.start(host, port)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows: KeyboardInterrupt still works
+                pass
+        addr = srv.sockets[0].getsockname()
+        print(f"shift-agent serving on http://{addr[0]}:{addr[1]}", flush=True)
+        try:
+            await stop.wait()
+        finally:
+            srv.close()
+            server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from array import array
+from collections.abc import Mapping
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from .domain import (
+    Config,
+    ConstraintSpec,
+    Employee,
+    Policies,
+    Preferences,
+    Schedule,
+    Shift,
+    SolverConfig,
+    TimeWindow,
+)
+from .timeline import epoch_seconds
+
+# Layout (native byte order, every section 8-byte aligned):
+#   header   magic "SSA1", kind u16, byte-order probe u16 (== 1), section count u32
+#   table    per section: name 8s, offset u64, item count u64, array typecode 1s, pad 7x
+#   sections flat arrays; the string table is one NUL-separated UTF-8 blob
+# Times are epoch seconds (naive times count as UTC). Configs with offset-aware times
+# add the UTC offset of each time (seconds, _NAIVE for naive ones) in *_soff/*_eoff.
+MAGIC = b"SSA1"
+KIND_CONFIG, KIND_SCHEDULE = 1, 2
+_HEADER = struct.Struct("=4sHHI")
+_SECTION = struct.Struct("=8sQQ1s7x")
+_EPOCH = datetime(1970, 1, 1)
+_NAIVE = -(1 << 31)
+
+
+def is_snapshot(path: str | Path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(4) == MAGIC
+
+
+# -- writing -------------------------------------------------------------------
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+
+    def __call__(self, s: str) -> int:
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.index)
+        return i
+
+    def sections(self) -> Dict[str, array]:
+        for s in self.index:
+            if "\0" in s:
+                raise ValueError(f"Identifiers can't contain NUL: {s!r}")
+        return {"strings": array("B", "\0".join(self.index).encode("utf-8"))}
+
+
+def _skill_words(skills, skill_bits: Dict[str, int], words: int, out: array) -> None:
+    mask = 0
+    for s in skills:
+        mask |= 1 << skill_bits[s]
+    for _ in range(words):
+        out.append(mask & 0xFFFFFFFFFFFFFFFF)
+        mask >>= 64
+
+
+def _offset(dt: datetime) -> int:
+    off = dt.utcoffset()
+    return _NAIVE if off is None else int(off.total_seconds())
+
+
+def _write(path: str | Path, kind: int, sections: Dict[str, array]) -> None:
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for name, arr in sections.items():
+        offset = -(-offset // 8) * 8
+        table.append((name, offset, arr))
+        offset += len(arr) * arr.itemsize
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, kind, 1, len(sections)))
+        for name, off, arr in table:
+            f.write(_SECTION.pack(name.encode("ascii"), off, len(arr), arr.typecode.encode("ascii")))
+        for _, off, arr in table:
+            f.write(b"\0" * (off - f.tell()))
+            arr.tofile(f)
+
+
+def save_config_snapshot(config: Config, path: str | Path) -> None:
+    strings = _Strings()
+    skills = sorted(
+        {s for e in config.employees.values() for s in e.skills}
+        | {s for sh in config.shifts.values() for s in sh.required_skills}
+    )
+    skill_bits = {s: i for i, s in enumerate(skills)}
+    words = max(1, -(-len(skills) // 64))
+
+    emp_id, emp_name, emp_skill = array("i"), array("i"), array("Q")
+    av_ptr, av_start, av_end = array("q", [0]), array("q"), array("q")
+    offsets: Dict[str, array] = {name: array("i") for name in ("av_soff", "av_eoff", "sh_soff", "sh_eoff")}
+    for e in config.employees.values():
+        emp_id.append(strings(e.id))
+        emp_name.append(strings(e.name))
+        _skill_words(e.skills, skill_bits, words, emp_skill)
+        for w in e.availability:
+            av_start.append(epoch_seconds(w.start))
+            av_end.append(epoch_seconds(w.end))
+            offsets["av_soff"].append(_offset(w.start))
+            offsets["av_eoff"].append(_offset(w.end))
+        av_ptr.append(len(av_start))
+
+    sh_id, sh_start, sh_end, sh_head, sh_skill = array("i"), array("q"), array("q"), array("i"), array("Q")
+    for sh in config.shifts.values():
+        sh_id.append(strings(sh.id))
+        sh_start.append(epoch_seconds(sh.start))
+        sh_end.append(epoch_seconds(sh.end))
+        offsets["sh_soff"].append(_offset(sh.start))
+        offsets["sh_eoff"].append(_offset(sh.end))
+        sh_head.append(sh.required_headcount)
+        _skill_words(sh.required_skills, skill_bits, words, sh_skill)
+
+    header = {
+        "meta": config.meta,
+        "policies": asdict(config.policies),
+        "preferences": asdict(config.preferences),
+        "solver": asdict(config.solver),
+        "skills": skills,
+        "constraints": [asdict(spec) for spec in config.constraints],
+    }
+    _write(
+        path,
+        KIND_CONFIG,
+        {
+            "header": array("B", json.dumps(header).encode("utf-8")),
+            **strings.sections(),
+            "emp_id": emp_id,
+            "emp_name": emp_name,
+            "emp_skl": emp_skill,
+            "av_ptr": av_ptr,
+            "av_start": av_start,
+            "av_end": av_end,
+            "sh_id": sh_id,
+            "sh_start": sh_start,
+            "sh_end": sh_end,
+            "sh_head": sh_head,
+            "sh_skl": sh_skill,
+            **(offsets if any(off != _NAIVE for arr in offsets.values() for off in arr) else {}),
+        },
+    )
+
+
+def save_schedule_snapshot(schedule: Schedule, path: str | Path) -> None:
+    strings = _Strings()
+    shift, ptr, emp = array("i"), array("q", [0]), array("i")
+    for sid, eids in schedule.assignments.items():
+        shift.append(strings(sid))
+        emp.extend(strings(e) for e in eids)
+        ptr.append(len(emp))
+    _write(path, KIND_SCHEDULE, {**strings.sections(), "asg_sid": shift, "asg_ptr": ptr, "asg_emp": emp})
+
+
+# -- reading -------------------------------------------------------------------
+
+
+class _Snapshot:
+    """Sections of an mmapped snapshot as zero-copy ``memoryview`` arrays."""
+
+    def __init__(self, path: str | Path, kind: int) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        magic, found_kind, probe, n = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a snapshot: {path}")
+        if probe != 1:
+            raise ValueError(f"Snapshot {path} was written on a machine with a different byte order")
+        if found_kind != kind:
+            raise ValueError(f"Snapshot {path} holds a {'config' if found_kind == KIND_CONFIG else 'schedule'}")
+        self.sections: Dict[str, memoryview] = {}
+        for i in range(n):
+            name, off, count, code = _SECTION.unpack_from(buf, _HEADER.size + i * _SECTION.size)
+            code = code.decode("ascii")
+            size = struct.calcsize(code)
+            self.sections[name.rstrip(b"\0").decode("ascii")] = buf[off : off + count * size].cast(code)
+        # One C-level decode + split; cheaper than slicing the blob per string.
+        self.strings: List[str] = str(self.sections["strings"], "utf-8").split("\0")
+
+
+class LazyRecords(Mapping):
+    """Read-only id → record mapping that builds each record on first access.
+
+    Pickles as a plain dict (so configs can still be shipped to worker processes).
+    """
+
+    def __init__(self, ids: List[str], build: Callable[[int], Any]) -> None:
+        self._pos = {k: i for i, k in enumerate(ids)}
+        self._build = build
+        self._cache: List[Optional[Any]] = [None] * len(ids)
+
+    def __getitem__(self, key: str) -> Any:
+        i = self._pos[key]
+        rec = self._cache[i]
+        if rec is None:
+            rec = self._cache[i] = self._build(i)
+        return rec
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._pos)
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._pos
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (dict, (dict(self.items()),))
+
+
+class _ConfigReader:
+    def __init__(self, snap: _Snapshot) -> None:
+        self.snap = snap
+        sec = snap.sections
+        self.header = json.loads(bytes(sec["header"]))
+        self.skills = self.header["skills"]
+        self.words = max(1, -(-len(self.skills) // 64))
+        # Snapshots of naive configs carry no offset sections.
+        self.aware = "sh_soff" in sec
+        self._times: Dict[Tuple[int, int], datetime] = {}
+        self._skill_sets: Dict[Tuple[int, ...], FrozenSet[str]] = {}
+        self._windows: Dict[Tuple[int, int, int, int], TimeWindow] = {}
+
+    def time(self, secs: int, offset: int = _NAIVE) -> datetime:
+        dt = self._times.get((secs, offset))
+        if dt is None:
+            if offset == _NAIVE:
+                dt = _EPOCH + timedelta(seconds=secs)
+            else:
+                dt = (_EPOCH + timedelta(seconds=secs + offset)).replace(tzinfo=timezone(timedelta(seconds=offset)))
+            self._times[(secs, offset)] = dt
+        return dt
+
+    def skill_set(self, words: memoryview, i: int) -> FrozenSet[str]:
+        key = tuple(words[i * self.words : (i + 1) * self.words])
+        out = self._skill_sets.get(key)
+        if out is None:
+            mask = 0
+            for k, w in enumerate(key):
+                mask |= w << (64 * k)
+            out = self._skill_sets[key] = frozenset(s for b, s in enumerate(self.skills) if mask >> b & 1)
+        return out
+
+    def employee(self, i: int) -> Employee:
+        sec = self.snap.sections
+        lo, hi = sec["av_ptr"][i], sec["av_ptr"][i + 1]
+        windows = []
+        if self.aware:
+            offsets = zip(sec["av_soff"][lo:hi], sec["av_eoff"][lo:hi])
+        else:
+            offsets = [(_NAIVE, _NAIVE)] * (hi - lo)
+        for (start, end), (soff, eoff) in zip(zip(sec["av_start"][lo:hi], sec["av_end"][lo:hi]), offsets):
+            key = (start, end, soff, eoff)
+            w = self._windows.get(key)
+            if w is None:
+                w = self._windows[key] = TimeWindow(self.time(start, soff), self.time(end, eoff))
+            windows.append(w)
+        return Employee(
+            id=self.snap.strings[sec["emp_id"][i]],
+            name=self.snap.strings[sec["emp_name"][i]],
+            skills=self.skill_set(sec["emp_skl"], i),
+            availability=windows,
+        )
+
+    def shift(self, i: int) -> Shift:
+        sec = self.snap.sections
+        return Shift(
+            id=self.snap.strings[sec["sh_id"][i]],
+            start=self.time(sec["sh_start"][i], sec["sh_soff"][i] if self.aware else _NAIVE),
+            end=self.time(sec["sh_end"][i], sec["sh_eoff"][i] if self.aware else _NAIVE),
+            required_headcount=sec["sh_head"][i],
+            required_skills=self.skill_set(sec["sh_skl"], i),
+        )
+
+
+def load_config_snapshot(path: str | Path) -> Config:
+    """Map a config snapshot; employees and shifts are decoded lazily per record."""
+    snap = _Snapshot(path, KIND_CONFIG)
+    reader = _ConfigReader(snap)
+    h = reader.header
+    sec = snap.sections
+    return Config(
+        employees=LazyRecords([snap.strings[i] for i in sec["emp_id"]], reader.employee),
+        shifts=LazyRecords([snap.strings[i] for i in sec["sh_id"]], reader.shift),
+        policies=Policies(**h["policies"]),
+        preferences=Preferences(**h["preferences"]),
+        solver=SolverConfig(**h["solver"]),
+        meta=h["meta"],
+        constraints=tuple(ConstraintSpec(**spec) for spec in h.get("constraints", [])),
+    )
+
+
+def load_schedule_snapshot(path: str | Path) -> Schedule:
+    snap = _Snapshot(path, KIND_SCHEDULE)
+    sec = snap.sections
+    names = snap.strings
+    emp = [names[e] for e in sec["asg_emp"]]
+    ptr = sec["asg_ptr"].tolist()
+    return Schedule(assignments={names[sid]: emp[ptr[k] : ptr[k + 1]] for k, sid in enumerate(sec["asg_sid"])})
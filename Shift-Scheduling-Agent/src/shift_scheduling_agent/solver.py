@@ -2,12 +2,24 @@ from __future__ import annotations
 
 import random
 import time
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from .anytime import active as active_control
+from .compact import CompactSchedule
 from .constraints import ConstraintSuite
+from .construct import regret_construct
 from .domain import Config, Schedule
-from .scoring import score_schedule
+from .eligibility import EligibilityIndex
+from .exact import exact_search
+from .feasibility import coverage_bound
+from .flow import flow_construct
+from .incremental import IncrementalEvaluator
+from .profiling import Profiler, active, phase
+from .scoring import churn
+from .search import TracePoint, anneal, tabu_search
+from .symmetry import EmployeeClasses
+from .warmstart import fill, reconcile, shed
 
 
 @dataclass
@@ -17,31 +29,35 @@ class SolveResult:
     iterations: int
     seconds: float
     notes: List[str]
+    trace: List[TracePoint] = field(default_factory=list)
+    # local-search move proposals evaluated (0 for exact search)
+    moves: int = 0
+    # set when solving under ``profiling.profiled()``
+    profile: Optional[Profiler] = None
+    # assignments changed relative to a warm-start ``initial`` schedule
+    churn: int = 0
+
+
+STRATEGIES = {"swap", "anneal", "tabu", "exact"}
+CONSTRUCTIONS = {"regret", "greedy", "flow"}
 
 
 def _eligible_employees(config: Config, shift_id: str) -> List[str]:
-    shift = config.shifts[shift_id]
-    out: List[str] = []
-    for eid, emp in config.employees.items():
-        if shift.required_skills and not shift.required_skills.issubset(emp.skills):
-            continue
-        if not any(w.contains(shift.start, shift.end) for w in emp.availability):
-            continue
-        out.append(eid)
-    return out
+    return EligibilityIndex.for_config(config).eligible(shift_id)
 
 
 def _greedy_construct(config: Config, rnd: random.Random) -> Schedule:
     schedule = Schedule(assignments={})
     # Sort shifts by "hardness": fewer eligible employees first
+    index = EligibilityIndex.for_config(config)
     shift_ids = list(config.shifts.keys())
-    shift_ids.sort(key=lambda sid: len(_eligible_employees(config, sid)))
+    shift_ids.sort(key=index.eligible_count)
 
     emp_load: Dict[str, int] = {eid: 0 for eid in config.employees.keys()}
 
     for sid in shift_ids:
         req = config.shifts[sid].required_headcount
-        candidates = _eligible_employees(config, sid)
+        candidates = index.eligible(sid)
 
         # Pick employees with smallest load first (fairness-ish), then random tie-break
         rnd.shuffle(candidates)
@@ -61,15 +77,21 @@ def _greedy_construct(config: Config, rnd: random.Random) -> Schedule:
     return schedule
 
 
-def _try_swap_improvements(config: Config, schedule: Schedule, rnd: random.Random, max_steps: int) -> Tuple[Schedule, int]:
+def _try_swap_improvements(
+    config: Config,
+    evaluator: IncrementalEvaluator,
+    rnd: random.Random,
+    max_steps: int,
+    prof: Optional[Profiler] = None,
+) -> int:
     # Local improvement: attempt swaps to increase score while staying valid.
-    suite = ConstraintSuite.default()
-    best = schedule.copy()
-    best_score = score_schedule(config, best).total
+    # Each proposal is delta-evaluated in place and rolled back unless accepted.
     steps = 0
-
-    shift_ids = list(config.shifts.keys())
-    employees = list(config.employees.keys())
+    shift_ids = range(len(config.shifts))
+    state = evaluator.state
+    # Within a class, a swap that leaves each employee with the other's roster only
+    # relabels the schedule, so it can't change violations or score.
+    class_of = EmployeeClasses.for_config(config).class_of if config.solver.symmetry else None
 
     while steps < max_steps:
         steps += 1
@@ -77,64 +99,275 @@ def _try_swap_improvements(config: Config, schedule: Schedule, rnd: random.Rando
         s1 = rnd.choice(shift_ids)
         s2 = rnd.choice(shift_ids)
         if s1 == s2:
+            if prof is not None:
+                prof.count("moves.skipped")
             continue
 
-        a1 = best.assignments.get(s1, [])
-        a2 = best.assignments.get(s2, [])
-        if not a1 or not a2:
+        n1 = state.count(s1)
+        n2 = state.count(s2)
+        if not n1 or not n2:
+            if prof is not None:
+                prof.count("moves.skipped")
             continue
 
-        e1 = rnd.choice(a1)
-        e2 = rnd.choice(a2)
-        if e1 == e2:
+        e1 = state.get(s1, rnd.randrange(n1))
+        e2 = state.get(s2, rnd.randrange(n2))
+        if e1 == e2 or state.contains(s1, e2) or state.contains(s2, e1):
+            # the swap would list an employee twice on one shift
+            if prof is not None:
+                prof.count("moves.skipped")
+            continue
+        if (
+            class_of is not None
+            and class_of[e1] == class_of[e2]
+            and set(evaluator.employee_shifts(e1)) - {s1} == set(evaluator.employee_shifts(e2)) - {s2}
+        ):
+            if prof is not None:
+                prof.count("moves.skipped.symmetric")
             continue
 
-        # propose swap
-        cand = best.copy()
-        cand.assignments[s1] = [e2 if x == e1 else x for x in a1]
-        cand.assignments[s2] = [e1 if x == e2 else x for x in a2]
+        move = evaluator.propose_swap(s1, e1, s2, e2)
+        if move.violations == 0 and move.score_delta >= 0:
+            evaluator.commit()
+            if prof is not None:
+                prof.count("moves.accepted")
+        else:
+            evaluator.rollback()
+            if prof is not None:
+                prof.count("moves.rejected.infeasible" if move.violations else "moves.rejected.worse")
 
-        report = suite.validate(config, cand)
-        if not report.ok:
-            continue
+    return steps
+
+
+def _check_strategy(config: Config) -> None:
+    strategy = config.solver.strategy
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown solver strategy: {strategy} (expected one of {sorted(STRATEGIES)})")
+    construction = config.solver.construction
+    if construction not in CONSTRUCTIONS:
+        raise ValueError(f"Unknown construction: {construction} (expected one of {sorted(CONSTRUCTIONS)})")
+
+
+def _construct(config: Config, rnd: random.Random) -> Schedule:
+    if config.solver.construction == "greedy":
+        return _greedy_construct(config, rnd)
+    if config.solver.construction == "flow":
+        return flow_construct(config, rnd)
+    return regret_construct(config, rnd)
+
+
+def solve(config: Config, initial: Optional[Schedule] = None, frozen: Iterable[str] = ()) -> SolveResult:
+    """Construct, repair and improve a schedule within the solver budget.
 
-        cand_score = score_schedule(config, cand).total
-        if cand_score >= best_score:
-            best = cand
-            best_score = cand_score
+    With ``initial`` (the published schedule) this is a warm start instead: the
+    assignments that still fit ``config`` are kept, ``frozen`` shift ids are left
+    untouched, and only the broken employees and shifts are repaired, scored with a
+    ``preferences.churn_weight`` penalty per changed assignment. Local search only
+    runs (for the remaining budget) if targeted repair leaves violations.
 
-    return best, steps
+    Under ``profiling.profiled()`` the result's ``profile`` carries phase timings,
+    move outcomes and the incumbent score over time.
+    """
+    with phase("solve"):
+        result = _solve(config) if initial is None else _warm_solve(config, initial, frozen)
+    result.profile = active()
+    return result
 
 
-def solve(config: Config) -> SolveResult:
+def _solve(config: Config) -> SolveResult:
+    _check_strategy(config)
     rnd = random.Random(config.solver.random_seed)
     start = time.time()
+    time_budget = max(0.1, float(config.solver.max_seconds))
+    notes: List[str] = []
+
+    with phase("solve.coverage_bound"):
+        bound = coverage_bound(config)
+    if not bound.feasible:
+        # No schedule can staff every slot: return the construction instead of
+        # spending the budget on a search that cannot succeed.
+        with phase("solve.construct"):
+            schedule = _construct(config, rnd)
+        return SolveResult(schedule=schedule, ok=False, iterations=0, seconds=time.time() - start, notes=bound.notes())
+
+    if config.solver.strategy == "exact":
+        with phase("solve.exact"):
+            exact = exact_search(config, deadline=start + time_budget)
+        # Exact search models the built-in rules only, so its schedule is validated
+        # against the config's custom hard rules before it is reported.
+        report = None
+        if exact.status == "feasible" and exact.schedule is not None:
+            report = ConstraintSuite.default().validate(config, exact.schedule)
+        if report is not None and report.ok:
+            notes.append(f"Exact search found a valid schedule ({exact.backtracks} backtrack(s)).")
+            return SolveResult(schedule=exact.schedule, ok=True, iterations=exact.nodes, seconds=time.time() - start, notes=notes)
+        if report is not None:
+            # Anneal can repair, and starts from a schedule that only breaks custom rules.
+            notes.append(
+                f"Exact search's schedule breaks {len(report.violations)} custom rule(s); repairing it with local search."
+            )
+            result = _improve(config.with_solver(strategy="anneal"), exact.schedule, rnd, start)
+            result.notes[:0] = notes
+            return result
+        if exact.status == "infeasible":
+            notes.append("Proven infeasible: " + "; ".join(v.message for v in exact.conflicts[:10]))
+            schedule = _construct(config, rnd)
+            report = ConstraintSuite.default().validate(config, schedule)
+            return SolveResult(schedule=schedule, ok=report.ok, iterations=exact.nodes, seconds=time.time() - start, notes=notes)
+        notes.append(f"Exact search hit its budget ({exact.backtracks} backtrack(s)); falling back to local search.")
+        config = config.with_solver(strategy="swap")
+
+    with phase("solve.construct"):
+        schedule = _construct(config, rnd)
+    with phase("solve.repair"):
+        schedule = _repair(config, schedule, start + time_budget / 2, notes)
+    result = _improve(config, schedule, rnd, start)
+    result.notes[:0] = notes
+    return result
+
+
+def _warm_solve(config: Config, initial: Schedule, frozen: Iterable[str]) -> SolveResult:
+    _check_strategy(config)
+    rnd = random.Random(config.solver.random_seed)
+    start = time.time()
+    time_budget = max(0.1, float(config.solver.max_seconds))
+
+    with phase("solve.reconcile"):
+        rec = reconcile(config, initial, frozen)
+    with phase("solve.evaluator_init"):
+        evaluator = IncrementalEvaluator(config, rec.schedule, baseline=initial, frozen=rec.frozen)
+    with phase("solve.warm_repair"):
+        shed(evaluator)
+        fill(config, evaluator)
+    notes = [
+        f"Warm start: kept {rec.kept} assignment(s), dropped {len(rec.dropped)}, "
+        f"{len(rec.removed_shifts)} removed / {len(rec.new_shifts)} new shift(s)."
+    ]
 
+    iterations = 0
+    trace: List[TracePoint] = []
+    state = evaluator.state
+    if evaluator.violations:
+        # Swaps can't restaff a shift, so warm starts search with anneal unless tabu is configured.
+        notes.append(f"Targeted repair left {evaluator.violations} violation(s); searching with the remaining budget.")
+        search = tabu_search if config.solver.strategy == "tabu" else anneal
+        with phase("solve.improve"):
+            state, iterations = search(
+                config,
+                evaluator,
+                rnd,
+                start=start,
+                deadline=start + time_budget,
+                max_iterations=max(1, int(config.solver.max_iterations)),
+                trace=trace,
+            )
+    with phase("solve.to_schedule"):
+        schedule = state.to_schedule()
+
+    with phase("solve.final_validate"):
+        report = ConstraintSuite.default().validate(config, schedule)
+    ctl = active_control()
+    if ctl is not None and ctl.reason is not None:
+        notes.append(f"Stopped early: {ctl.reason}.")
+    if not report.ok:
+        notes.append(f"Schedule not fully valid ({len(report.violations)} violation(s)).")
+    return SolveResult(
+        schedule=schedule,
+        ok=report.ok,
+        iterations=iterations,
+        seconds=time.time() - start,
+        notes=notes,
+        trace=trace,
+        moves=evaluator.moves,
+        churn=churn(schedule, initial),
+    )
+
+
+def _repair(config: Config, schedule: Schedule, deadline: float, notes: List[str]) -> Schedule:
+    # Keep the consistent part of an invalid greedy start and complete it exactly.
+    if config.solver.backtracking_limit <= 0 or ConstraintSuite.default().validate(config, schedule).ok:
+        return schedule
+    exact = exact_search(config, fixed=schedule, deadline=deadline)
+    # Custom hard rules are outside exact search, so its completion may still break them.
+    if exact.status == "feasible" and exact.schedule is not None and ConstraintSuite.default().validate(config, exact.schedule).ok:
+        notes.append(f"Greedy start repaired by exact search ({exact.backtracks} backtrack(s)).")
+        return exact.schedule
+    return schedule
+
+
+def _infeasibility_notes(config: Config) -> List[str]:
+    bound = coverage_bound(config)
+    if not bound.feasible:
+        return bound.notes()
+    return [
+        "Every slot can be staffed within skills, availability and the shift cap, so the remaining "
+        "conflicts involve rest, consecutive-shift or custom rules; consider relaxing those or adding staff."
+    ]
+
+
+def _improve(config: Config, schedule: Schedule, rnd: random.Random, start: float) -> SolveResult:
+    # Run the configured strategy from ``schedule`` within the remaining budget.
+    strategy = config.solver.strategy
     notes: List[str] = []
+    trace: List[TracePoint] = []
     suite = ConstraintSuite.default()
 
-    schedule = _greedy_construct(config, rnd)
-    report = suite.validate(config, schedule)
-
     # If already OK, still try minor improvements for better fairness/preferences
     iterations = 0
     max_iter = max(1, int(config.solver.max_iterations))
     time_budget = max(0.1, float(config.solver.max_seconds))
 
-    while (time.time() - start) < time_budget and iterations < max_iter:
-        iterations += 1
-        improved, _ = _try_swap_improvements(config, schedule, rnd, max_steps=20)
-        if improved.assignments != schedule.assignments:
-            schedule = improved
-        # stop early if valid and improvements plateau-ish (lightweight condition)
-        if iterations % 50 == 0:
-            report = suite.validate(config, schedule)
-            if report.ok:
-                notes.append("Valid schedule found; continuing small improvements within budget.")
-
-    final_report = suite.validate(config, schedule)
+    prof = active()
+    ctl = active_control()
+    with phase("solve.evaluator_init"):
+        evaluator = IncrementalEvaluator(config, schedule)
+    best: Optional[CompactSchedule] = None
+    with phase("solve.improve"):
+        if strategy == "swap":
+            trace.append(TracePoint(time.time() - start, 0, evaluator.score, evaluator.violations))
+            if ctl is not None:
+                ctl.offer(evaluator.state.copy(), evaluator.score, evaluator.violations, 0, evaluator.moves)
+            while (time.time() - start) < time_budget and iterations < max_iter:
+                if ctl is not None and ctl.should_stop(evaluator.moves):
+                    break
+                iterations += 1
+                _try_swap_improvements(config, evaluator, rnd, max_steps=20, prof=prof)
+                if evaluator.score > trace[-1].score:
+                    trace.append(TracePoint(time.time() - start, iterations, evaluator.score, evaluator.violations))
+                    if ctl is not None:
+                        ctl.offer(evaluator.state.copy(), evaluator.score, evaluator.violations, iterations, evaluator.moves)
+                # stop early if valid and improvements plateau-ish (lightweight condition)
+                if iterations % 50 == 0:
+                    if evaluator.violations == 0:
+                        notes.append("Valid schedule found; continuing small improvements within budget.")
+        else:
+            search = anneal if strategy == "anneal" else tabu_search
+            best, iterations = search(
+                config,
+                evaluator,
+                rnd,
+                start=start,
+                deadline=start + time_budget,
+                max_iterations=max_iter,
+                trace=trace,
+            )
+    with phase("solve.to_schedule"):
+        schedule = evaluator.schedule if best is None else best.to_schedule()
+
+    with phase("solve.final_validate"):
+        final_report = suite.validate(config, schedule)
+    if prof is not None:
+        prof.count("moves.proposed", evaluator.moves)
+        for tp in trace:
+            prof.sample("score", tp.score, at=start + tp.seconds)
+            prof.sample("violations", tp.violations, at=start + tp.seconds)
     ok = final_report.ok
     seconds = time.time() - start
+    if ctl is not None and ctl.reason is not None:
+        notes.append(f"Stopped early: {ctl.reason}.")
     if not ok:
-        notes.append(f"Schedule not fully valid ({len(final_report.violations)} violation(s)). Consider relaxing policies or adding staff.")
-    return SolveResult(schedule=schedule, ok=ok, iterations=iterations, seconds=seconds, notes=notes)
+        notes.append(f"Schedule not fully valid ({len(final_report.violations)} violation(s)).")
+        notes.extend(_infeasibility_notes(config))
+    return SolveResult(
+        schedule=schedule, ok=ok, iterations=iterations, seconds=seconds, notes=notes, trace=trace, moves=evaluator.moves
+    )
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import csv
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+from .domain import Employee, Shift, TimeWindow
+
+_CHUNK = 1 << 20
+_WS = " \t\r\n"
+
+
+class RecordBuilder:
+    """Builds domain records from raw dicts, sharing repeated values.
+
+    Timestamps are memoized by their exact text (rosters repeat the same few
+    thousand instants; ``datetime.fromisoformat`` only runs on a miss), skill names
+    are interned and each distinct skill set becomes one shared frozenset, and
+    identical availability windows share one ``TimeWindow``.
+    """
+
+    def __init__(self, max_timestamps: int = 1 << 16) -> None:
+        self._max_timestamps = max_timestamps
+        self._timestamps: Dict[str, datetime] = {}
+        self._skill_sets: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+        self._windows: Dict[Tuple[datetime, datetime], TimeWindow] = {}
+
+    def timestamp(self, text: str) -> datetime:
+        dt = self._timestamps.get(text)
+        if dt is None:
+            if len(self._timestamps) >= self._max_timestamps:
+                self._timestamps.clear()
+            # ISO without timezone → naive datetime
+            dt = self._timestamps[text] = datetime.fromisoformat(text)
+        return dt
+
+    def skills(self, names: Iterable[str]) -> FrozenSet[str]:
+        key = tuple(sorted(names))
+        out = self._skill_sets.get(key)
+        if out is None:
+            out = self._skill_sets[key] = frozenset(sys.intern(n) for n in key)
+        return out
+
+    def window(self, start: str, end: str) -> TimeWindow:
+        key = (self.timestamp(start), self.timestamp(end))
+        w = self._windows.get(key)
+        if w is None:
+            w = self._windows[key] = TimeWindow(*key)
+        return w
+
+    def employee(self, e: Dict[str, Any]) -> Employee:
+        return Employee(
+            id=e["id"],
+            name=e.get("name", e["id"]),
+            skills=self.skills(e.get("skills", [])),
+            availability=[self.window(w["start"], w["end"]) for w in e.get("availability", [])],
+        )
+
+    def shift(self, s: Dict[str, Any]) -> Shift:
+        return Shift(
+            id=s["id"],
+            start=self.timestamp(s["start"]),
+            end=self.timestamp(s["end"]),
+            required_headcount=int(s.get("required_headcount", 1)),
+            required_skills=self.skills(s.get("required_skills", [])),
+        )
+
+
+class _Reader:
+    """Chunked text buffer with ``raw_decode`` on top; keeps only the unread tail."""
+
+    def __init__(self, f: IO[str]) -> None:
+        self._f = f
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(_CHUNK)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WS:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self._pos}, found {self._buf[self._pos]!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut at the chunk boundary decodes "successfully"; re-read.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+
+def iter_config_items(f: IO[str], streamed: Tuple[str, ...] = ("employees", "shifts")) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(key, value)`` for a top-level JSON object, one array element at a time for ``streamed`` keys.
+
+    Only the element being decoded (plus one read chunk) is held in memory.
+    """
+    r = _Reader(f)
+    r.expect("{")
+    if r.peek() == "}":
+        return
+    while True:
+        key = r.value()
+        r.expect(":")
+        if key in streamed and r.peek() == "[":
+            r.expect("[")
+            if r.peek() != "]":
+                while True:
+                    yield key, r.value()
+                    if r.peek() != ",":
+                        break
+                    r.expect(",")
+            r.expect("]")
+        else:
+            yield key, r.value()
+        if r.peek() != ",":
+            break
+        r.expect(",")
+    r.expect("}")
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Rows of a side file: ``.jsonl`` (one JSON object per line) or ``.csv``.
+
+    CSV cells are strings; list fields (``skills``, ``required_skills``) are
+    ``;``-separated.
+    """
+    suffix = path.suffix.lower()
+    with path.open(encoding="utf-8", newline="") as f:
+        if suffix in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif suffix == ".csv":
+            for row in csv.DictReader(f):
+                for k in ("skills", "required_skills"):
+                    if k in row:
+                        row[k] = [x for x in row[k].split(";") if x]
+                yield row
+        else:
+            raise ValueError(f"Unsupported record file (expected .jsonl or .csv): {path}")
+
+
+def group_availability(builder: RecordBuilder, rows: Iterable[Dict[str, Any]]) -> Dict[str, List[TimeWindow]]:
+    out: Dict[str, List[TimeWindow]] = {}
+    for row in rows:
+        out.setdefault(row["employee_id"], []).append(builder.window(row["start"], row["end"]))
+    return out
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from .compact import RosterIds
+from .domain import Config
+from .eligibility import EligibilityIndex, iter_bits
+
+
+class EmployeeClasses:
+    """Employees grouped into interchangeable classes.
+
+    Two employees share a class when they have the same skill set and are eligible
+    for the same shifts (their availability signature as the shifts see it); with
+    ``preferences`` their preference entries must match too. Hard rules treat the
+    members of a class alike, so exchanging two members' whole rosters relabels a
+    schedule; with preferences the score can't tell the relabelled schedules apart
+    either. A swap of single shifts is a relabelling only when it leaves each member
+    with the other's roster. Classes are numbered in order of their first employee,
+    members in config order.
+    """
+
+    def __init__(self, config: Config, preferences: bool = True) -> None:
+        ids = RosterIds.for_config(config)
+        masks = EligibilityIndex.for_config(config).eligible_by_shift
+        columns: List[List[int]] = [[] for _ in ids.employee_ids]
+        for s, mask in enumerate(masks):
+            for e in iter_bits(mask):
+                columns[e].append(s)
+        prefs = config.preferences.employee_shift_preferences
+        by_key: Dict[Tuple, int] = {}
+        self.class_of: List[int] = []
+        self.members: List[List[int]] = []
+        for e, eid in enumerate(ids.employee_ids):
+            key: Tuple = (frozenset(config.employees[eid].skills), tuple(columns[e]))
+            if preferences:
+                key += (_signature(prefs.get(eid) or {}),)
+            c = by_key.setdefault(key, len(by_key))
+            if c == len(self.members):
+                self.members.append([])
+            self.members[c].append(e)
+            self.class_of.append(c)
+
+    @staticmethod
+    def for_config(config: Config, preferences: bool = True) -> "EmployeeClasses":
+        key = "employee_classes" if preferences else "employee_classes:hard"
+        return config.derived(key, lambda c: EmployeeClasses(c, preferences))
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+
+def _signature(prefs: Dict[str, List[str]]) -> Tuple:
+    return tuple(sorted((kind, tuple(sorted(map(str, values)))) for kind, values in prefs.items() if values))
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .domain import Config, Employee, Policies, Preferences, Shift, SolverConfig, TimeWindow
+
+# (start hour, duration hours) of the shift templates cycled through each day
+_TEMPLATES: Sequence[Tuple[int, int]] = ((6, 8), (9, 8), (14, 8), (17, 6))
+# availability patterns: (start hour, end hour) within a day
+_WINDOWS: Sequence[Tuple[int, int]] = ((6, 22), (6, 15), (13, 23), (8, 18))
+
+
+def synthetic_config(
+    num_employees: int,
+    num_shifts: int,
+    *,
+    skills: Sequence[str] = ("cashier", "stock", "lead", "deli"),
+    shifts_per_day: int = 24,
+    available_days_ratio: float = 0.6,
+    seed: int = 0,
+    start: datetime = datetime(2026, 1, 5),
+    skill_sparsity: Optional[float] = None,
+    tightness: Optional[float] = None,
+    profiles: Optional[int] = None,
+) -> Config:
+    """Seeded random roster for tests and benchmarks (no IO).
+
+    ``available_days_ratio`` is the availability density (chance an employee has a
+    window on a given day). ``skill_sparsity`` is the chance an employee lacks each
+    skill (everyone keeps at least one); ``tightness`` sets total required headcount
+    as a fraction of the staff's weekly-cap capacity. ``profiles`` draws that many
+    (skills, availability) profiles and gives every employee one of them, for rosters
+    with many interchangeable employees. Left at None these keep the original draws
+    (1-2 skills, headcount 1 or 2, one profile per employee), so existing seeds are
+    unchanged.
+    """
+    rnd = random.Random(seed)
+    days = max(1, -(-num_shifts // shifts_per_day))
+    max_per_week = max(5, -(-days * 5 // 7))
+    mean_headcount = None
+    if tightness is not None:
+        mean_headcount = max(0.0, tightness) * num_employees * max_per_week / max(1, num_shifts)
+
+    shifts: Dict[str, Shift] = {}
+    for i in range(num_shifts):
+        day, slot = divmod(i, shifts_per_day)
+        hour, length = _TEMPLATES[slot % len(_TEMPLATES)]
+        s_start = start + timedelta(days=day, hours=hour)
+        shifts[f"s{i}"] = Shift(
+            id=f"s{i}",
+            start=s_start,
+            end=s_start + timedelta(hours=length),
+            required_headcount=rnd.choice((1, 1, 1, 2)) if mean_headcount is None else _draw_headcount(mean_headcount, rnd),
+            required_skills={rnd.choice(skills)},
+        )
+
+    def draw_profile() -> Tuple[Set[str], List[TimeWindow]]:
+        availability: List[TimeWindow] = []
+        for day in range(days):
+            if rnd.random() >= available_days_ratio:
+                continue
+            lo, hi = rnd.choice(_WINDOWS)
+            base = start + timedelta(days=day)
+            availability.append(TimeWindow(base + timedelta(hours=lo), base + timedelta(hours=hi)))
+        return _draw_skills(skills, skill_sparsity, rnd), availability
+
+    pool = [draw_profile() for _ in range(max(1, profiles))] if profiles is not None else None
+    employees: Dict[str, Employee] = {}
+    for i in range(num_employees):
+        emp_skills, windows = draw_profile() if pool is None else rnd.choice(pool)
+        employees[f"e{i}"] = Employee(
+            id=f"e{i}",
+            name=f"Employee {i}",
+            skills=set(emp_skills),
+            availability=list(windows),
+        )
+
+    return Config(
+        employees=employees,
+        shifts=shifts,
+        policies=Policies(max_shifts_per_week=max_per_week),
+        preferences=Preferences(),
+        solver=SolverConfig(random_seed=seed),
+        meta={"name": f"synthetic-{num_employees}x{num_shifts}-seed{seed}"},
+    )
+
+
+def multi_site_config(
+    sites: int, employees_per_site: int, days: int, *, shifts_per_day: int = 4, seed: int = 0
+) -> Config:
+    """``sites`` independent synthetic rosters in one config (ids prefixed ``<site>:``).
+
+    Every site has its own staff and skills, so no employee is eligible for another
+    site's shifts: the eligibility graph has one connected component per site.
+    """
+    parts = [
+        synthetic_config(
+            employees_per_site,
+            days * shifts_per_day,
+            skills=[f"site{k}-{s}" for s in ("a", "b", "c")],
+            shifts_per_day=shifts_per_day,
+            available_days_ratio=0.8,
+            seed=seed + k,
+        )
+        for k in range(sites)
+    ]
+    return replace(
+        parts[0],
+        employees={f"{k}:{e.id}": replace(e, id=f"{k}:{e.id}") for k, c in enumerate(parts) for e in c.employees.values()},
+        shifts={f"{k}:{s.id}": replace(s, id=f"{k}:{s.id}") for k, c in enumerate(parts) for s in c.shifts.values()},
+        meta={"name": f"synthetic-{sites}sites-{employees_per_site}x{days}d-seed{seed}"},
+    )
+
+
+def _draw_headcount(mean: float, rnd: random.Random) -> int:
+    # floor or ceil of the mean, so the expected total matches exactly
+    base = int(mean)
+    return max(1, base + (rnd.random() < mean - base))
+
+
+def _draw_skills(skills: Sequence[str], sparsity: Optional[float], rnd: random.Random) -> Set[str]:
+    if sparsity is None:
+        return set(rnd.sample(list(skills), k=rnd.randint(1, min(2, len(skills)))))
+    kept = {s for s in skills if rnd.random() >= sparsity}
+    return kept or {rnd.choice(skills)}
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .compact import RosterIds
+from .domain import Config, Schedule
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SECOND = timedelta(seconds=1)
+
+# Next shift starting within this many seconds of the previous end continues a run.
+CONSECUTIVE_GAP = 18 * 3600
+
+
+def epoch_seconds(dt: datetime) -> int:
+    # Naive times count as UTC; offset-aware ones are converted.
+    return (dt - (_EPOCH if dt.tzinfo is None else _EPOCH_UTC)) // _SECOND
+
+
+class ShiftTimes:
+    """Shift start/end as epoch seconds, aligned with ``RosterIds.shift_ids`` (config order)."""
+
+    def __init__(self, config: Config) -> None:
+        shifts = list(config.shifts.values())
+        self.start: List[int] = [epoch_seconds(sh.start) for sh in shifts]
+        self.end: List[int] = [epoch_seconds(sh.end) for sh in shifts]
+
+    @staticmethod
+    def for_config(config: Config) -> "ShiftTimes":
+        return config.derived("shift_times", ShiftTimes)
+
+
+def employee_timelines(config: Config, schedule: Schedule) -> Dict[str, List[int]]:
+    """Each employee's assigned shift positions sorted by start (unknown shift ids skipped).
+
+    The sort is stable over the order of ``schedule.employee_shifts()``, so ties on
+    start keep the order the datetime-based checks always reported.
+    """
+    shift_pos = RosterIds.for_config(config).shift_pos
+    start = ShiftTimes.for_config(config).start
+    out: Dict[str, List[int]] = {}
+    for sid, eids in schedule.assignments.items():
+        s = shift_pos.get(sid)
+        for eid in eids:
+            tl = out.setdefault(eid, [])
+            if s is not None:
+                tl.append(s)
+    for tl in out.values():
+        tl.sort(key=start.__getitem__)
+    return out
+
+
+class TimelineRules:
+    """What a ``Timeline`` orders by and counts: ``key[s]`` must be unique per shift."""
+
+    __slots__ = ("key", "start", "end", "min_rest", "max_run", "consecutive_gap")
+
+    def __init__(
+        self,
+        key: Sequence[int],
+        start: Sequence[int],
+        end: Sequence[int],
+        min_rest: int,
+        max_run: int,
+        consecutive_gap: int = CONSECUTIVE_GAP,
+    ) -> None:
+        self.key = key
+        self.start = start
+        self.end = end
+        self.min_rest = min_rest
+        self.max_run = max_run
+        self.consecutive_gap = consecutive_gap
+
+    @staticmethod
+    def for_config(config: Config, key: Sequence[int] | None = None) -> "TimelineRules":
+        times = ShiftTimes.for_config(config)
+        if key is None:
+            n = len(times.start)
+            key = [start * n + s for s, start in enumerate(times.start)]
+        pol = config.policies
+        return TimelineRules(key, times.start, times.end, pol.min_rest_hours * 3600, pol.max_consecutive_shifts)
+
+
+class Timeline:
+    """One employee's shifts sorted by ``rules.key``, with rest and run checks kept current.
+
+    Insert, remove and neighbour lookup bisect a parallel key list. ``short_rests``
+    counts adjacent gaps under min rest; ``long_runs`` counts windows of ``max_run``
+    consecutive short gaps (non-zero iff some run is longer than the cap). An insertion
+    or removal only changes the gaps next to it, so both counts are updated from the
+    neighbours and at most ``max_run`` gaps either side, never by re-walking the
+    timeline.
+    """
+
+    __slots__ = ("shifts", "_keys", "_rules", "short_rests", "long_runs")
+
+    def __init__(self, rules: TimelineRules, shifts: Iterable[int] = ()) -> None:
+        key = rules.key
+        self._rules = rules
+        self.shifts: List[int] = sorted(shifts, key=key.__getitem__)
+        self._keys: List[int] = [key[s] for s in self.shifts]
+        self.short_rests = self.long_runs = 0
+        tl, start, end = self.shifts, rules.start, rules.end
+        streak = 0
+        for i in range(1, len(tl)):
+            gap = start[tl[i]] - end[tl[i - 1]]
+            if gap < rules.min_rest:
+                self.short_rests += 1
+            streak = streak + 1 if gap <= rules.consecutive_gap else 0
+            if streak >= rules.max_run:
+                self.long_runs += 1
+
+    def __len__(self) -> int:
+        return len(self.shifts)
+
+    def __iter__(self):
+        return iter(self.shifts)
+
+    def insert(self, s: int, recount: bool = True) -> None:
+        """Add ``s``; ``recount=False`` skips the counters (for undo that restores them)."""
+        k = self._rules.key[s]
+        p = bisect_left(self._keys, k)
+        if recount:
+            rests, runs = self._insert_delta(p, s)
+            self.short_rests += rests
+            self.long_runs += runs
+        self.shifts.insert(p, s)
+        self._keys.insert(p, k)
+
+    def remove(self, s: int, recount: bool = True) -> None:
+        p = bisect_left(self._keys, self._rules.key[s])
+        if p >= len(self.shifts) or self.shifts[p] != s:
+            raise ValueError(f"shift {s} not in timeline")
+        del self.shifts[p]
+        del self._keys[p]
+        if recount:
+            rests, runs = self._insert_delta(p, s)
+            self.short_rests -= rests
+            self.long_runs -= runs
+
+    def neighbours(self, s: int) -> Tuple[int | None, int | None]:
+        """Shifts just before and after where ``s`` sits (or would sit)."""
+        key = self._rules.key[s]
+        lo = bisect_left(self._keys, key)
+        hi = bisect_right(self._keys, key)
+        before = self.shifts[lo - 1] if lo > 0 else None
+        after = self.shifts[hi] if hi < len(self.shifts) else None
+        return before, after
+
+    def rest_ok(self, s: int) -> bool:
+        """Would ``s`` keep min rest to both neighbours?"""
+        r = self._rules
+        before, after = self.neighbours(s)
+        if before is not None and r.start[s] - r.end[before] < r.min_rest:
+            return False
+        return after is None or r.start[after] - r.end[s] >= r.min_rest
+
+    def run_through(self, s: int) -> int:
+        """Length of the consecutive run ``s`` is (or would be) part of."""
+        r = self._rules
+        key = r.key[s]
+        lo = bisect_left(self._keys, key)
+        hi = bisect_right(self._keys, key)
+        tl, start, end, gap = self.shifts, r.start, r.end, r.consecutive_gap
+        run = 1
+        prev = s
+        for i in range(lo - 1, -1, -1):
+            if start[prev] - end[tl[i]] > gap:
+                break
+            run += 1
+            prev = tl[i]
+        nxt = s
+        for i in range(hi, len(tl)):
+            if start[tl[i]] - end[nxt] > gap:
+                break
+            run += 1
+            nxt = tl[i]
+        return run
+
+    def _insert_delta(self, p: int, s: int) -> Tuple[int, int]:
+        # Change in (short_rests, long_runs) from inserting s at index p (s absent).
+        r = self._rules
+        tl, start, end = self.shifts, r.start, r.end
+        min_rest, gap, m = r.min_rest, r.consecutive_gap, r.max_run
+        n = len(tl)
+        prev = tl[p - 1] if p > 0 else -1
+        nxt = tl[p] if p < n else -1
+        rests = 0
+        old_short = new_before = new_after = False
+        if prev >= 0:
+            g = start[s] - end[prev]
+            rests += g < min_rest
+            new_before = g <= gap
+        if nxt >= 0:
+            g = start[nxt] - end[s]
+            rests += g < min_rest
+            new_after = g <= gap
+        if prev >= 0 and nxt >= 0:
+            g = start[nxt] - end[prev]
+            rests -= g < min_rest
+            old_short = g <= gap
+        if m <= 0:
+            # every pair of shifts is already over the cap: count gaps
+            return rests, (prev >= 0) + (nxt >= 0) - (prev >= 0 and nxt >= 0)
+        if not (old_short or new_before or new_after):
+            return rests, 0
+        # Short-gap streaks ending at prev and starting at nxt; beyond m the window
+        # count is linear in the streak length, so longer streaks don't change the delta.
+        left = 0
+        i = p - 1
+        while left < m and i > 0 and start[tl[i]] - end[tl[i - 1]] <= gap:
+            left += 1
+            i -= 1
+        right = 0
+        i = p
+        while right < m and i + 1 < n and start[tl[i + 1]] - end[tl[i]] <= gap:
+            right += 1
+            i += 1
+
+        if old_short:
+            before = _windows(left + 1 + right, m)
+        else:
+            before = _windows(left, m) + _windows(right, m)
+        if new_before and new_after:
+            after = _windows(left + 2 + right, m)
+        elif new_before:
+            after = _windows(left + 1, m) + _windows(right, m)
+        elif new_after:
+            after = _windows(left, m) + _windows(right + 1, m)
+        else:
+            after = _windows(left, m) + _windows(right, m)
+        return rests, after - before
+
+
+def _windows(streak: int, m: int) -> int:
+    # windows of m short gaps inside a streak of that many
+    return streak - m + 1 if streak >= m else 0
+
+
+class IntervalIndex:
+    """Sorted windows answering "is [start, end] inside one window?" by bisect.
+
+    Windows nested inside another window are dropped (they never decide a query), so
+    starts and ends are both strictly increasing and the only candidate is the last
+    window starting at or before ``start``. Overlapping windows are not merged: a
+    shift must fit one declared window.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, windows: Iterable[Tuple[int, int]]) -> None:
+        starts: List[int] = []
+        ends: List[int] = []
+        for w_start, w_end in sorted(windows, key=lambda w: (w[0], -w[1])):
+            if ends and w_end <= ends[-1]:
+                continue
+            starts.append(w_start)
+            ends.append(w_end)
+        self.starts = starts
+        self.ends = ends
+
+    def contains(self, start: int, end: int) -> bool:
+        i = bisect_right(self.starts, start) - 1
+        return i >= 0 and end <= self.ends[i]
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List
 
-from .config_io import load_config
+from .config_io import ConfigCache
 from .constraints import ConstraintSuite
+from .decompose import solve_decomposed
 from .domain import Schedule
+from .eligibility import EligibilityIndex
+from .feasibility import coverage_bound
+from .portfolio import solve_portfolio
 from .scoring import score_schedule
 from .solver import solve
 
-
 ToolFn = Callable[..., Dict[str, Any]]
 
+# Shared by every tool call in the process (chat agent, CLI, server).
+CONFIG_CACHE = ConfigCache()
+
 
 class ToolRegistry:
     def __init__(self) -> None:
@@ -20,6 +26,9 @@ class ToolRegistry:
     def register(self, name: str, fn: ToolFn) -> None:
         self._tools[name] = fn
 
+    def __contains__(self, name: object) -> bool:
+        return name in self._tools
+
     def call(self, name: str, **kwargs: Any) -> Dict[str, Any]:
         if name not in self._tools:
             raise KeyError(f"Tool not found: {name}")
@@ -29,22 +38,49 @@ class ToolRegistry:
         return {k: (v.__doc__ or "").strip() for k, v in self._tools.items()}
 
 
-def schedule_generate(config_path: str) -> Dict[str, Any]:
-    """Generate a schedule from a config path."""
-    config = load_config(config_path)
-    result = solve(config)
-    return {
+def schedule_generate(
+    config_path: str,
+    workers: int | None = None,
+    max_seconds: float | None = None,
+    initial: Dict[str, Any] | None = None,
+    frozen: List[str] | None = None,
+    window_days: int | None = None,
+) -> Dict[str, Any]:
+    """Generate a schedule from a config path (or re-solve from an ``initial`` schedule)."""
+    config = CONFIG_CACHE.get(config_path)
+    if max_seconds is not None:
+        config = config.with_solver(max_seconds=min(config.solver.max_seconds, max_seconds))
+    if window_days is not None:
+        config = config.with_solver(decompose=True, window_days=window_days)
+    n_workers = workers or config.solver.workers
+    worker_stats = None
+    if initial is not None:
+        result = solve(config, initial=Schedule(assignments=initial.get("assignments", {})), frozen=frozen or ())
+    elif config.solver.decompose:
+        result = solve_decomposed(config, workers=n_workers)
+    elif n_workers > 1:
+        portfolio = solve_portfolio(config, workers=n_workers)
+        result = portfolio.best
+        worker_stats = [asdict(w) for w in portfolio.workers]
+    else:
+        result = solve(config)
+    out = {
         "ok": result.ok,
         "iterations": result.iterations,
         "seconds": result.seconds,
         "notes": result.notes,
         "schedule": {"assignments": result.schedule.assignments},
     }
+    if worker_stats is not None:
+        out["workers"] = worker_stats
+    if initial is not None:
+        out["churn"] = result.churn
+    return out
 
 
 def schedule_validate(config_path: str, schedule: Dict[str, Any]) -> Dict[str, Any]:
     """Validate a schedule against hard constraints."""
-    config = load_config(config_path)
+    config = CONFIG_CACHE.get(config_path)
     sch = Schedule(assignments={k: list(v) for k, v in schedule.get("assignments", {}).items()})
     report = ConstraintSuite.default().validate(config, sch)
     return report.to_dict()
@@ -52,7 +88,7 @@ def schedule_validate(config_path: str, schedule: Dict[str, Any]) -> Dict[str, A
 
 def schedule_score(config_path: str, schedule: Dict[str, Any]) -> Dict[str, Any]:
     """Score a schedule with soft preferences."""
-    config = load_config(config_path)
+    config = CONFIG_CACHE.get(config_path)
     sch = Schedule(assignments={k: list(v) for k, v in schedule.get("assignments", {}).items()})
     report = score_schedule(config, sch)
     return report.to_dict()
@@ -60,7 +96,7 @@ def schedule_score(config_path: str, schedule: Dict[str, Any]) -> Dict[str, Any]
 
 def schedule_explain(config_path: str, schedule: Dict[str, Any]) -> Dict[str, Any]:
     """Explain the schedule and major trade-offs."""
-    config = load_config(config_path)
+    config = CONFIG_CACHE.get(config_path)
     sch = Schedule(assignments={k: list(v) for k, v in schedule.get("assignments", {}).items()})
     v = ConstraintSuite.default().validate(config, sch)
     s = score_schedule(config, sch)
@@ -75,10 +111,12 @@ def schedule_explain(config_path: str, schedule: Dict[str, Any]) -> Dict[str, An
 
     lines.append("")
     lines.append("## Assignments")
+    index = EligibilityIndex.for_config(config)
     for sid in sorted(config.shifts.keys()):
         shift = config.shifts[sid]
         eids = sch.assignments.get(sid, [])
-        lines.append(f"- `{sid}` {shift.start.isoformat()} → {shift.end.isoformat()} : {', '.join(eids) if eids else '(unfilled)'}")
+        filled = ', '.join(eids) if eids else f"(unfilled; {index.eligible_count(sid)} eligible)"
+        lines.append(f"- `{sid}` {shift.start.isoformat()} → {shift.end.isoformat()} : {filled}")
 
     if not v.ok:
         lines.append("")
@@ -86,13 +124,26 @@ def schedule_explain(config_path: str, schedule: Dict[str, Any]) -> Dict[str, An
         for viol in v.violations[:50]:
             lines.append(f"- **{viol.code}**: {viol.message}")
 
+    bound = coverage_bound(config)
+    if not bound.feasible:
+        lines.append("")
+        lines.append("## Coverage bottleneck")
+        lines.extend(f"- {note}" for note in bound.notes())
+
     return {"markdown": "\n".join(lines)}
 
 
+def coverage_check(config_path: str) -> Dict[str, Any]:
+    """Upper bound on staffable slots (max-flow) and the bottleneck shifts if short."""
+    bound = coverage_bound(CONFIG_CACHE.get(config_path))
+    return {**bound.to_dict(), "notes": bound.notes()}
+
+
 def default_registry() -> ToolRegistry:
     reg = ToolRegistry()
     reg.register("schedule_generate", schedule_generate)
     reg.register("schedule_validate", schedule_validate)
     reg.register("schedule_score", schedule_score)
     reg.register("schedule_explain", schedule_explain)
+    reg.register("coverage_check", coverage_check)
     return reg
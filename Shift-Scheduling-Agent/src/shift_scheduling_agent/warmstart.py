@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .compact import RosterIds
+from .domain import Config, Schedule
+from .eligibility import EligibilityIndex, iter_bits
+from .incremental import IncrementalEvaluator
+from .timeline import epoch_seconds
+
+# Fitting candidates compared (lowest load first) per open slot during repair.
+_FILL_CANDIDATES = 16
+
+
+@dataclass
+class Reconciled:
+    """A published schedule checked against the current config."""
+
+    schedule: Schedule
+    frozen: FrozenSet[int]
+    kept: int = 0
+    # (shift_id, employee_id) pairs that no longer fit the config
+    dropped: List[Tuple[str, str]] = field(default_factory=list)
+    removed_shifts: List[str] = field(default_factory=list)
+    new_shifts: List[str] = field(default_factory=list)
+
+
+def reconcile(config: Config, initial: Schedule, frozen: Iterable[str] = ()) -> Reconciled:
+    """Keep the assignments of ``initial`` that still fit ``config``.
+
+    Assignments to removed shifts, of removed employees, or of employees no longer
+    eligible (skills/availability) are dropped. ``frozen`` shifts keep their crew
+    verbatim, eligible or not, unless the employee left the roster.
+    """
+    ids = RosterIds.for_config(config)
+    index = EligibilityIndex.for_config(config)
+    frozen_pos = frozenset(ids.shift_pos[sid] for sid in frozen if sid in ids.shift_pos)
+    out = Reconciled(schedule=Schedule(assignments={}), frozen=frozen_pos)
+    for sid, eids in initial.assignments.items():
+        s = ids.shift_pos.get(sid)
+        if s is None:
+            out.removed_shifts.append(sid)
+            out.dropped.extend((sid, eid) for eid in eids)
+            continue
+        row: List[str] = []
+        for eid in eids:
+            e = ids.employee_pos.get(eid)
+            if e is not None and eid not in row and (s in frozen_pos or index.eligible_by_shift[s] >> e & 1):
+                row.append(eid)
+            else:
+                out.dropped.append((sid, eid))
+        out.kept += len(row)
+        out.schedule.assignments[sid] = row
+    out.new_shifts = [sid for sid in config.shifts if sid not in initial.assignments]
+    return out
+
+
+def started_before(config: Config, cutoff: datetime) -> List[str]:
+    """Ids of shifts starting before ``cutoff`` (e.g. to freeze the past on a warm
+    start). A naive cutoff is read in each shift's local time."""
+    out = []
+    for sid, sh in config.shifts.items():
+        start = sh.start.replace(tzinfo=None) if cutoff.tzinfo is None else sh.start
+        if epoch_seconds(start) < epoch_seconds(cutoff):
+            out.append(sid)
+    return out
+
+
+def shed(ev: IncrementalEvaluator) -> None:
+    """Unassign violating employees from movable shifts until their own checks pass
+    (or no single removal helps); the freed slots are refilled by ``fill``."""
+    for e in list(ev.violating_employees.items):
+        while ev.employee_violations(e):
+            current = ev.employee_violations(e)
+            best: Optional[Tuple[int, int]] = None
+            for s in list(ev.employee_shifts(e)):
+                if s in ev.frozen:
+                    continue
+                k = list(ev.state.members(s)).index(e)
+                ev.propose_remove(s, k)
+                after = ev.employee_violations(e)
+                ev.rollback()
+                if after < current and (best is None or after < best[0]):
+                    best = (after, s)
+            if best is None:
+                break
+            s = best[1]
+            ev.propose_remove(s, list(ev.state.members(s)).index(e))
+            ev.commit()
+
+
+def fill(config: Config, ev: IncrementalEvaluator, prior_load: Optional[Sequence[int]] = None) -> None:
+    """Staff under-covered movable shifts with eligible employees that stay valid.
+
+    For each open slot, among the least-loaded candidates that add no violation, the
+    one with the best score delta (fairness, preferences, churn) is kept. ``prior_load``
+    adds per-employee shift counts from outside ``config`` (earlier rolling windows).
+    """
+    masks = EligibilityIndex.for_config(config).eligible_by_shift
+    required = [sh.required_headcount for sh in config.shifts.values()]
+    state = ev.state
+    for s in sorted(ev.under_covered.items):
+        if s in ev.frozen:
+            continue
+        while state.count(s) < required[s]:
+            pool = [e for e in iter_bits(masks[s]) if not state.contains(s, e) and not ev.employee_violations(e)]
+            if prior_load is None:
+                pool.sort(key=lambda e: len(ev.employee_shifts(e)))
+            else:
+                pool.sort(key=lambda e: len(ev.employee_shifts(e)) + prior_load[e])
+            best: Optional[Tuple[float, int]] = None
+            fitting = 0
+            for e in pool:
+                move = ev.propose_add(s, e)
+                fits = move.violation_delta <= 0 and not ev.employee_violations(e)
+                ev.rollback()
+                if not fits:
+                    continue
+                if best is None or move.score_delta > best[0]:
+                    best = (move.score_delta, e)
+                fitting += 1
+                if fitting >= _FILL_CANDIDATES:
+                    break
+            if best is None:
+                break
+            ev.propose_add(s, best[1])
+            ev.commit()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+from shift_scheduling_agent.anytime import CancelToken, SolveControl, solve_iter
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.domain import Schedule
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _config(strategy="anneal"):
+    config = synthetic_config(60, 40, shifts_per_day=4, seed=3)
+    return config.with_solver(strategy=strategy, max_iterations=100_000, max_seconds=30.0)
+
+
+def test_incumbents_improve_and_final_is_validated():
+    config = _config()
+    rows = list(solve_iter(config, SolveControl(stagnation_moves=2_000)))
+    incumbents, final = rows[:-1], rows[-1]
+    assert incumbents and final["event"] == "final"
+    keys = [(-r["violations"], r["score"]) for r in incumbents]
+    assert keys == sorted(keys)
+    assert final["stopped"] == "no improvement in 2000 moves"
+    assert final["seconds"] < 30.0
+    report = ConstraintSuite.default().validate(config, Schedule(assignments=final["schedule"]["assignments"]))
+    assert report.ok == final["ok"]
+
+
+def test_cancel_token_stops_the_solve():
+    token = CancelToken()
+    t0 = time.time()
+    for row in solve_iter(_config("swap"), SolveControl(cancel=token)):
+        if row["event"] == "incumbent":
+            token.cancel()
+        else:
+            final = row
+    assert final["stopped"] == "cancelled"
+    assert time.time() - t0 < 10.0
+
+
+def test_target_score_and_closing_the_generator():
+    rows = list(solve_iter(_config(), SolveControl(target_score=-1e9)))
+    assert rows[-1]["stopped"] == "target score reached" and rows[-1]["ok"]
+
+    control = SolveControl()
+    stream = solve_iter(_config("tabu"), control)
+    assert next(stream)["event"] == "incumbent"
+    stream.close()
+    assert control.cancel.cancelled
+
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import os
+
+from shift_scheduling_agent import batch
+from shift_scheduling_agent.batch import completed_ids, load_jobs, run_job, solve_many
+from shift_scheduling_agent.config_io import load_schedule, save_config
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _stores(tmp_path, n=3):
+    root = tmp_path / "stores"
+    root.mkdir()
+    for k in range(n):
+        config = synthetic_config(12, 20, shifts_per_day=4, seed=k).with_solver(max_iterations=100, max_seconds=5.0)
+        save_config(config, root / f"store{k}.json")
+    (root / "broken.json").write_text("{not json", encoding="utf-8")
+    return root
+
+
+def test_batch_isolates_failures_and_writes_schedules(tmp_path):
+    root = _stores(tmp_path)
+    jobs = load_jobs(root)
+    assert [j.id for j in jobs] == ["broken", "store0", "store1", "store2"]
+    rows = {r["id"]: r for r in solve_many(jobs, tmp_path / "out", checkpoint=tmp_path / "summary.jsonl")}
+    assert rows["broken"]["status"] == "failed" and "JSONDecodeError" in rows["broken"]["error"]
+    for k in range(3):
+        row = rows[f"store{k}"]
+        assert row["status"] == "solved"
+        assert load_schedule(row["schedule_path"]).assignments
+    lines = (tmp_path / "summary.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+
+
+def test_resume_skips_solved_stores(tmp_path):
+    root = _stores(tmp_path)
+    checkpoint = tmp_path / "summary.jsonl"
+    list(solve_many(load_jobs(root), tmp_path / "out", checkpoint=checkpoint))
+    assert completed_ids(checkpoint) == {"store0", "store1", "store2"}
+    again = list(solve_many(load_jobs(root), tmp_path / "out", checkpoint=checkpoint))
+    assert [r["id"] for r in again] == ["broken"]  # only the failure is retried
+
+
+def test_manifest_and_global_budget(tmp_path):
+    _stores(tmp_path, n=2)
+    manifest = tmp_path / "stores.jsonl"
+    manifest.write_text(
+        "\n".join(json.dumps({"id": f"s{k}", "config_path": f"stores/store{k}.json", "max_seconds": 2}) for k in range(2)),
+        encoding="utf-8",
+    )
+    jobs = load_jobs(manifest)
+    assert [(j.id, j.max_seconds) for j in jobs] == [("s0", 2.0), ("s1", 2.0)]
+    rows = list(solve_many(jobs, tmp_path / "out", max_seconds=0))
+    assert {r["status"] for r in rows} == {"skipped"}
+    assert completed_ids(tmp_path / "missing.jsonl") == set()
+
+
+def _crash_or_run(job, out_dir, deadline=None):
+    # Stands in for run_job in the workers: "store1" kills its process like an OOM kill.
+    if job.id == "store1":
+        os._exit(1)
+    return run_job(job, out_dir, deadline)
+
+
+def test_dead_worker_fails_only_its_own_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "run_job", _crash_or_run)
+    root = _stores(tmp_path, n=6)
+    rows = list(solve_many(load_jobs(root), tmp_path / "out", workers=2))
+    status = {r["id"]: r["status"] for r in rows}
+    assert len(rows) == 7
+    assert status.pop("store1") == "failed" and status.pop("broken") == "failed"
+    assert set(status.values()) == {"solved"}
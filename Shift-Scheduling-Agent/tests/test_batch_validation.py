@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.domain import (
+    Config,
+    Employee,
+    Policies,
+    Preferences,
+    Schedule,
+    Shift,
+    SolverConfig,
+    TimeWindow,
+)
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _random_schedules(config, n, seed):
+    rnd = random.Random(seed)
+    eids = list(config.employees)
+    out = []
+    for _ in range(n):
+        out.append(
+            Schedule(
+                assignments={
+                    sid: rnd.sample(eids, rnd.randint(0, min(len(eids), sh.required_headcount + 1)))
+                    for sid, sh in config.shifts.items()
+                }
+            )
+        )
+    return out
+
+
+@pytest.mark.parametrize(
+    "config",
+    [load_config("configs/sample_week.json"), synthetic_config(15, 60, shifts_per_day=4, seed=4)],
+    ids=["sample_week", "synthetic"],
+)
+def test_batch_counts_match_scalar_validate(config):
+    suite = ConstraintSuite.default()
+    schedules = _random_schedules(config, 50, seed=1)
+    for schedule, result in zip(schedules, suite.validate_batch(config, schedules)):
+        report = suite.validate(config, schedule)
+        assert result.ok == report.ok
+        assert result.counts == dict(Counter(v.code for v in report.violations))
+
+
+def test_partial_suite_and_fallback():
+    config = load_config("configs/sample_week.json")
+    suite = ConstraintSuite([(n, fn) for n, fn in ConstraintSuite.default()._constraints if n == "coverage"])
+    unknown = Schedule(assignments={"s1": ["nobody"]})
+    empty = Schedule(assignments={})
+
+    results = suite.validate_batch(config, [empty, unknown], details=True)
+    assert set(results[0].counts) == {"UNDER_COVERAGE"}
+    assert results[0].violations == suite.validate(config, empty).violations
+
+    full = ConstraintSuite.default().validate_batch(config, [unknown])[0]
+    assert full.counts["UNKNOWN_EMPLOYEE"] == 1
+
+
+def test_same_start_shifts_match_scalar_order():
+    # "a" and "b" start together; the scalar path walks them in schedule key order,
+    # which decides whether "c" (17h after "a") extends a run.
+    d = lambda h: datetime(2026, 2, 9) + timedelta(hours=h)  # noqa: E731
+    config = Config(
+        employees={"x": Employee("x", "X", set(), [TimeWindow(d(0), d(48))])},
+        shifts={
+            "a": Shift("a", d(0), d(8), 1, set()),
+            "b": Shift("b", d(0), d(1), 1, set()),
+            "c": Shift("c", d(25), d(30), 1, set()),
+        },
+        policies=Policies(max_consecutive_shifts=2, min_rest_hours=0),
+        preferences=Preferences(),
+        solver=SolverConfig(),
+    )
+    suite = ConstraintSuite.default()
+    for order in (["b", "a", "c"], ["a", "b", "c"]):
+        schedule = Schedule(assignments={sid: ["x"] for sid in order})
+        result = suite.validate_batch(config, [schedule], details=True)[0]
+        assert result.counts == dict(Counter(v.code for v in result.violations)), order
+        assert result.violations == suite.validate(config, schedule).violations
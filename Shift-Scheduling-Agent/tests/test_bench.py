@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from shift_scheduling_agent.bench import SUITE, BenchCase, compare, load_suite, run_suite
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def test_suite_file_parses():
+    names = [c.name for c in load_suite(SUITE)]
+    assert "tiny" in names and len(names) == len(set(names))
+
+
+def test_run_suite_reports_every_stage():
+    case = BenchCase("t", employees=60, shifts=20, shifts_per_day=4, max_seconds=0.3, max_iterations=20)
+    out = run_suite([case])
+    r = out["cases"]["t"]
+    assert set(r["timings"]) == {"load_config", "greedy_construct", "regret_construct", "coverage_bound", "validate", "score_schedule", "solve"}
+    assert r["throughput"]["moves_per_sec"] > 0 and r["solve"]["moves"] > 0
+    assert compare(out, out)[0].endswith("(  +0.0%)")
+
+
+def test_generator_knobs():
+    loose = synthetic_config(50, 20, seed=1, tightness=0.4)
+    tight = synthetic_config(50, 20, seed=1, tightness=0.8)
+    demand = lambda c: sum(s.required_headcount for s in c.shifts.values())  # noqa: E731
+    assert demand(tight) > 1.5 * demand(loose)
+    sparse = synthetic_config(50, 10, skills=list("abcdef"), seed=1, skill_sparsity=0.9)
+    dense = synthetic_config(50, 10, skills=list("abcdef"), seed=1, skill_sparsity=0.1)
+    assert sum(map(len, (e.skills for e in sparse.employees.values()))) < sum(
+        map(len, (e.skills for e in dense.employees.values()))
+    )
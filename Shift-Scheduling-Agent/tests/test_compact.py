@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from shift_scheduling_agent.compact import CompactSchedule
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.domain import Schedule
+
+
+def test_roundtrip_is_lossless():
+    config = load_config("configs/sample_week.json")
+    sch = Schedule(assignments={"s3": ["e4", "e1"], "s1": [], "s8": ["e3", "e3", "e2"]})
+    compact = CompactSchedule.from_schedule(config, sch)
+    assert compact.to_schedule().assignments == sch.assignments
+    assert list(compact.to_schedule().assignments) == ["s3", "s1", "s8"]
+
+
+def test_moves_undo_in_place():
+    config = load_config("configs/sample_week.json")
+    sch = Schedule(assignments={"s1": ["e1"], "s2": ["e3"]})
+    compact = CompactSchedule.from_schedule(config, sch)
+    ids = compact.ids
+    s1, s2 = ids.shift_pos["s1"], ids.shift_pos["s2"]
+
+    mark = compact.mark()
+    compact.set(s1, 0, ids.employee_pos["e4"])
+    compact.insert(s2, ids.employee_pos["e2"])
+    compact.insert(s2, ids.employee_pos["e1"])  # beyond required headcount: grows
+    compact.delete(s2, 0)
+    assert compact.to_schedule().assignments == {"s1": ["e4"], "s2": ["e2", "e1"]}
+
+    compact.undo(mark)
+    assert compact.to_schedule().assignments == sch.assignments
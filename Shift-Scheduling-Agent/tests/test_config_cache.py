@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+from shift_scheduling_agent.config_io import ConfigCache
+
+
+def test_hits_until_content_changes(tmp_path):
+    path = tmp_path / "week.json"
+    shutil.copy("configs/sample_week.json", path)
+    cache = ConfigCache(maxsize=2)
+
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # touched but identical content: still a hit
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.get(path) is first
+
+    path.write_text(path.read_text(encoding="utf-8").replace('"max_seconds": 1.5', '"max_seconds": 3.5'), encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    second = cache.get(path)
+    assert second is not first
+    assert second.solver.max_seconds == 3.5
+
+    cache.invalidate(path)
+    assert cache.get(path) is not second
+    assert cache.stats() == {"hits": 2, "misses": 3, "size": 1, "maxsize": 2}
+
+
+def test_lru_bound(tmp_path):
+    cache = ConfigCache(maxsize=2)
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"c{i}.json")
+        shutil.copy("configs/sample_week.json", paths[-1])
+        cache.get(paths[-1])
+    assert cache.stats()["size"] == 2
+    cache.get(paths[0])
+    assert cache.stats()["misses"] == 4
+    cache.invalidate()
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import replace
+
+import pytest
+
+from shift_scheduling_agent.config_io import config_to_dict, load_config, save_config
+from shift_scheduling_agent.constraint_specs import BUILTIN_SPECS, spec_from_dict
+from shift_scheduling_agent.constraints import ConstraintSuite, SpecCheck
+from shift_scheduling_agent.domain import Schedule
+from shift_scheduling_agent.incremental import IncrementalEvaluator
+from shift_scheduling_agent.snapshot import save_config_snapshot
+from shift_scheduling_agent.synthetic import synthetic_config
+
+CUSTOM = [
+    {"name": "weekly_hours", "kind": "max_hours", "params": {"limit": 24, "window_days": 7}},
+    {"name": "lead_on_shift", "kind": "min_skilled", "params": {"skill": "lead"}, "severity": "soft"},
+    {"name": "short_rest", "kind": "min_rest", "params": {"hours": 14}, "code": "REST_14H"},
+]
+
+
+def _random_schedules(config, n, seed):
+    rnd = random.Random(seed)
+    eids = list(config.employees) + ["ghost"]
+    sids = list(config.shifts)
+    out = []
+    for _ in range(n):
+        assignments = {sid: rnd.sample(eids, rnd.randint(0, 2)) for sid in sids if rnd.random() < 0.9}
+        if rnd.random() < 0.2:
+            assignments["nowhere"] = [rnd.choice(eids)]
+        out.append(Schedule(assignments=assignments))
+    return out
+
+
+def _with_custom(config):
+    return replace(config, constraints=tuple(spec_from_dict(raw) for raw in CUSTOM))
+
+
+@pytest.mark.parametrize("custom", [False, True])
+def test_fused_pass_matches_one_pass_per_spec(custom):
+    config = synthetic_config(15, 60, shifts_per_day=4, seed=4)
+    if custom:
+        config = _with_custom(config)
+    suite = ConstraintSuite.default()
+    for schedule in _random_schedules(config, 30, seed=2):
+        report = suite.validate(config, schedule)
+        entries = suite.entries(config)
+        hard = [v for _, fn in entries if fn.spec.severity == "hard" for v in fn(config, schedule)]
+        soft = [v for _, fn in entries if fn.spec.severity == "soft" for v in fn(config, schedule)]
+        assert (report.violations, report.warnings) == (hard, soft)
+
+
+def test_config_constraints_load_and_report(tmp_path):
+    raw = json.loads(open("configs/sample_week.json", encoding="utf-8").read())
+    raw["constraints"] = CUSTOM
+    (tmp_path / "c.json").write_text(json.dumps(raw), encoding="utf-8")
+    config = load_config(tmp_path / "c.json")
+    assert [s.name for s in config.constraints] == ["weekly_hours", "lead_on_shift", "short_rest"]
+
+    everyone = Schedule(assignments={sid: list(config.employees) for sid in config.shifts})
+    report = ConstraintSuite.default().validate(config, everyone)
+    codes = {v.code for v in report.violations}
+    assert {"MAX_HOURS", "REST_14H"} <= codes and "MIN_SKILLED" not in codes
+    assert all(w.code == "MIN_SKILLED" for w in report.warnings)
+
+    save_config(config, tmp_path / "round.json")
+    save_config_snapshot(config, tmp_path / "round.ssa")
+    assert load_config(tmp_path / "round.json").constraints == config.constraints
+    assert config_to_dict(load_config(tmp_path / "round.ssa")) == config_to_dict(config)
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError, match="unknown kind"):
+        spec_from_dict({"name": "x", "kind": "no_such_rule"})
+
+
+def test_incremental_counts_include_custom_hard_rules():
+    config = _with_custom(synthetic_config(12, 40, shifts_per_day=4, seed=5))
+    rnd = random.Random(7)
+    ev = IncrementalEvaluator(config, Schedule(assignments={}))
+    suite = ConstraintSuite.default()
+    n_shifts, n_emps = len(config.shifts), len(config.employees)
+    for _ in range(300):
+        s, e = rnd.randrange(n_shifts), rnd.randrange(n_emps)
+        if ev.state.contains(s, e):
+            ev.propose_remove(s, list(ev.state.members(s)).index(e))
+        else:
+            ev.propose_add(s, e)
+        if rnd.random() < 0.7:
+            ev.commit()
+        else:
+            ev.rollback()
+        assert ev.violations == len(suite.validate(config, ev.schedule).violations)
+
+
+def test_batch_fast_path_only_for_builtin_specs():
+    config = load_config("configs/sample_week.json")
+    assert all(isinstance(fn, SpecCheck) and fn.spec in BUILTIN_SPECS for _, fn in ConstraintSuite.default().entries(config))
+    custom = _with_custom(config)
+    schedule = Schedule(assignments={sid: list(custom.employees) for sid in custom.shifts})
+    result = ConstraintSuite.default().validate_batch(custom, [schedule])[0]
+    assert result.counts["MAX_HOURS"] == len(custom.employees)
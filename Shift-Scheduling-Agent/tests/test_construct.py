@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.construct import regret_construct
+from shift_scheduling_agent.domain import (
+    Config,
+    Employee,
+    Policies,
+    Preferences,
+    Shift,
+    SolverConfig,
+    TimeWindow,
+)
+from shift_scheduling_agent.solver import _greedy_construct, solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _rest_trap() -> Config:
+    # Greedy (seed 0) gives x both "a" and "b" (8h apart, min rest 10h) although y
+    # could take "b" (see test_search).
+    d = lambda day, h: datetime(2026, 2, day, h)  # noqa: E731
+    window = [TimeWindow(d(9, 0), d(12, 23))]
+    return Config(
+        employees={
+            "x": Employee("x", "X", {"cashier"}, window),
+            "y": Employee("y", "Y", {"cashier", "stock"}, window),
+        },
+        shifts={
+            "a": Shift("a", d(9, 14), d(9, 22), 1, {"cashier"}),
+            "b": Shift("b", d(10, 6), d(10, 14), 1, {"cashier"}),
+            "c": Shift("c", d(11, 9), d(11, 17), 1, {"stock"}),
+        },
+        policies=Policies(),
+        preferences=Preferences(),
+        solver=SolverConfig(max_iterations=50, random_seed=0, backtracking_limit=0),
+    )
+
+
+def test_regret_construction_avoids_the_rest_trap():
+    config = _rest_trap()
+    assert not ConstraintSuite.default().validate(config, _greedy_construct(config, random.Random(0))).ok
+    assert ConstraintSuite.default().validate(config, regret_construct(config, random.Random(0))).ok
+    assert solve(config).ok
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_regret_construction_only_leaves_shifts_short(seed):
+    config = synthetic_config(100, 300, shifts_per_day=8, available_days_ratio=0.8, tightness=0.5, seed=seed)
+    suite = ConstraintSuite.default()
+    regret = suite.validate(config, regret_construct(config, random.Random(seed)))
+    greedy = suite.validate(config, _greedy_construct(config, random.Random(seed)))
+    assert {v.code for v in regret.violations} <= {"UNDER_COVERAGE"}
+    assert len(regret.violations) * 5 < len(greedy.violations)
+
+
+def test_unknown_construction_is_rejected():
+    config = _rest_trap()
+    with pytest.raises(ValueError):
+        solve(replace(config, solver=replace(config.solver, construction="random")))
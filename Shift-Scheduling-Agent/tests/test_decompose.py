@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.decompose import components, solve_decomposed, windows
+from shift_scheduling_agent.synthetic import multi_site_config
+
+
+def _config(weeks=1):
+    return multi_site_config(3, 60, weeks * 7).with_solver(max_iterations=200, max_seconds=10.0)
+
+
+def test_components_follow_sites():
+    config = _config()
+    parts = components(config)
+    assert len(parts) == 3
+    for k, part in enumerate(parts):
+        assert all(eid.startswith(f"{k}:") for eid in part.employees)
+        assert all(sid.startswith(f"{k}:") for sid in part.shifts)
+    assert sorted(sid for p in parts for sid in p.shifts) == sorted(config.shifts)
+
+
+def test_unstaffable_shifts_form_their_own_part():
+    config = _config()
+    shifts = dict(config.shifts)
+    shifts["0:s0"] = replace(shifts["0:s0"], required_skills={"nobody-has-this"})
+    parts = components(replace(config, shifts=shifts))
+    assert parts[-1].employees == () and parts[-1].shifts == ("0:s0",)
+
+
+def test_decomposed_solve_is_valid():
+    config = _config()
+    result = solve_decomposed(config.with_solver(decompose=True), workers=1)
+    assert result.ok
+    assert ConstraintSuite.default().validate(config, result.schedule).ok
+    assert set(result.schedule.assignments) == set(config.shifts)
+
+
+def test_rolling_windows_cover_horizon_and_stay_valid():
+    config = _config(weeks=2).with_solver(decompose=True, window_days=7)
+    part = components(config)[0]
+    chunks = windows(config, part.shifts, 7)
+    assert len(chunks) == 2 and sorted(s for c in chunks for s in c) == sorted(part.shifts)
+    result = solve_decomposed(config, workers=1)
+    assert result.ok
+    assert ConstraintSuite.default().validate(config, result.schedule).ok
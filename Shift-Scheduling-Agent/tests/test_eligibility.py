@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from shift_scheduling_agent.domain import TimeWindow
+from shift_scheduling_agent.eligibility import AvailabilityWindows, EligibilityIndex
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def test_index_matches_brute_force_eligibility():
+    config = synthetic_config(60, 120, seed=1)
+    index = EligibilityIndex.for_config(config)
+    assert EligibilityIndex.for_config(config) is index
+
+    for sid, shift in config.shifts.items():
+        expected = [
+            eid
+            for eid, emp in config.employees.items()
+            if shift.required_skills.issubset(emp.skills)
+            and any(w.contains(shift.start, shift.end) for w in emp.availability)
+        ]
+        assert index.eligible(sid) == expected
+        assert index.eligible_count(sid) == len(expected)
+
+
+def test_nested_and_overlapping_windows_keep_single_window_semantics():
+    d = lambda h: datetime(2026, 2, 9, h)  # noqa: E731
+    aw = AvailabilityWindows([TimeWindow(d(8), d(14)), TimeWindow(d(9), d(10)), TimeWindow(d(12), d(18))])
+    assert aw.contains(d(9), d(13))
+    assert aw.contains(d(13), d(18))
+    # inside the union but not inside any single window
+    assert not aw.contains(d(10), d(16))
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import copy
+import json
+
+from shift_scheduling_agent.config_io import save_config
+from shift_scheduling_agent.evals.harness import load_cases, regressions, run_cases
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _dataset(tmp_path):
+    impossible = synthetic_config(3, 20, shifts_per_day=4, seed=0, tightness=1.0).with_solver(max_iterations=20)
+    save_config(impossible, tmp_path / "impossible.json")
+    rows = [
+        {"id": "week", "config_path": "configs/sample_week.json"},
+        {"id": "week-again", "config_path": "configs/sample_week.json", "seeds": [7, 8]},
+        {"id": "impossible", "config_path": "impossible.json", "expect_ok": False},
+    ]
+    path = tmp_path / "cases.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+    return path
+
+
+def test_run_cases_summarises_seeds_and_expectations(tmp_path):
+    cases = load_cases(_dataset(tmp_path), seeds=2)
+    assert [c.seeds for c in cases] == [[7, 8], [7, 8], [0, 1]]
+    results = run_cases(cases, workers=1, max_seconds=0.5)
+
+    week = results["week"]
+    assert week["passed"] and len(week["runs"]) == 2
+    assert week["violations_mean"] == 0 and week["score_var"] >= 0
+    assert set(week["runs"][0]["components"]) == {"fairness", "preferences"}
+    # identical (config, seed) runs are solved once
+    assert results["week-again"]["runs"] == week["runs"]
+    assert results["impossible"]["passed"] and results["impossible"]["violations_mean"] > 0
+
+
+def test_regressions_flag_quality_and_speed():
+    base = {"cases": {"a": {"passed": True, "violations_mean": 0, "score_mean": -1.0, "seconds_mean": 1.0}}}
+    assert regressions(base, base) == []
+    cur = copy.deepcopy(base)
+    cur["cases"]["a"].update(passed=False, violations_mean=2, score_mean=-2.0, seconds_mean=3.0)
+    found = regressions(base, cur)
+    assert len(found) == 4 and all(line.startswith("a: ") for line in found)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.constraint_specs import spec_from_dict
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.domain import (
+    Config,
+    Employee,
+    Policies,
+    Preferences,
+    Schedule,
+    Shift,
+    SolverConfig,
+    TimeWindow,
+)
+from shift_scheduling_agent.exact import exact_search
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _tiny(seed: int) -> Config:
+    rnd = random.Random(seed)
+    base = datetime(2026, 1, 5)
+    shifts = {}
+    for i in range(5):
+        start = base + timedelta(hours=rnd.choice([0, 6, 12, 18, 24, 30, 36, 42, 48]))
+        shifts[f"s{i}"] = Shift(
+            f"s{i}", start, start + timedelta(hours=rnd.choice([4, 8])), rnd.choice([1, 1, 2]), {rnd.choice("ab")}
+        )
+    window = [TimeWindow(base, base + timedelta(days=4))]
+    employees = {f"e{j}": Employee(f"e{j}", "", set(rnd.sample("ab", rnd.randint(1, 2))), window) for j in range(3)}
+    policies = Policies(
+        max_shifts_per_week=rnd.choice([1, 2, 3]),
+        max_consecutive_shifts=rnd.choice([1, 2]),
+        min_rest_hours=rnd.choice([0, 10]),
+    )
+    return Config(employees, shifts, policies, Preferences(), SolverConfig(backtracking_limit=100000, max_seconds=10))
+
+
+def test_agrees_with_brute_force_on_tiny_instances():
+    suite = ConstraintSuite.default()
+    for seed in range(60):
+        config = _tiny(seed)
+        sids = list(config.shifts)
+        crews = [itertools.combinations(config.employees, config.shifts[s].required_headcount) for s in sids]
+        feasible = any(
+            suite.validate(config, Schedule({s: list(c) for s, c in zip(sids, combo)})).ok
+            for combo in itertools.product(*map(list, crews))
+        )
+        result = exact_search(config)
+        assert result.status == ("feasible" if feasible else "infeasible"), seed
+        if feasible:
+            assert suite.validate(config, result.schedule).ok
+
+
+def test_sample_week_exact_strategy():
+    config = load_config("configs/sample_week.json").with_solver(strategy="exact")
+    result = solve(config)
+    assert result.ok
+    assert ConstraintSuite.default().validate(config, result.schedule).ok
+
+
+def test_exact_results_are_checked_against_custom_hard_rules():
+    # Exact search doesn't model custom rules, so its schedule is validated before
+    # being reported; one that breaks them is repaired by local search or reported invalid.
+    suite = ConstraintSuite.default()
+    base = load_config("configs/sample_week.json").with_solver(strategy="exact")
+    for days, ok in ((2, True), (3, False)):
+        spec = spec_from_dict({"name": "cap", "kind": "max_shifts", "params": {"limit": 1, "window_days": days}})
+        config = replace(base, constraints=(spec,))
+        assert not suite.validate(config, exact_search(config).schedule).ok
+        result = solve(config)
+        assert result.ok is ok and suite.validate(config, result.schedule).ok is ok
+        assert "custom rule" in result.notes[0]
+
+
+def test_infeasible_reports_conflicting_shift():
+    config = load_config("configs/sample_week.json")
+    shifts = dict(config.shifts)
+    s2 = shifts["s2"]
+    shifts["s2"] = Shift(s2.id, s2.start, s2.end, 3, s2.required_skills)
+    result = exact_search(Config(config.employees, shifts, config.policies, config.preferences, config.solver))
+    assert result.status == "infeasible"
+    assert [v.shift_id for v in result.conflicts] == ["s2"]
+
+
+def test_backtracking_limit_bounds_search():
+    # Proven infeasible after a few hundred backtracks; a tighter limit gives up instead.
+    config = synthetic_config(120, 400, shifts_per_day=12, seed=3).with_solver(max_seconds=10.0)
+    assert exact_search(config, backtracking_limit=100000).status == "infeasible"
+    limited = exact_search(config, backtracking_limit=10)
+    assert limited.status == "unknown"
+    assert limited.backtracks <= 11
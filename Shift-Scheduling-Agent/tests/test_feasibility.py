@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import random
+from collections import deque
+from dataclasses import replace
+
+from shift_scheduling_agent.eligibility import EligibilityIndex, iter_bits
+from shift_scheduling_agent.feasibility import coverage_bound
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _max_flow(config) -> int:
+    # Edmonds-Karp on source -> employee (cap) -> shift (1) -> sink (headcount).
+    masks = EligibilityIndex.for_config(config).eligible_by_shift
+    n_emp, n_shifts = len(config.employees), len(masks)
+    src, sink = 0, 1 + n_emp + n_shifts
+    cap = {}
+    adj = {v: set() for v in range(sink + 1)}
+
+    def edge(u, v, c):
+        cap[u, v] = cap.get((u, v), 0) + c
+        cap.setdefault((v, u), 0)
+        adj[u].add(v)
+        adj[v].add(u)
+
+    for e in range(n_emp):
+        edge(src, 1 + e, config.policies.max_shifts_per_week)
+    for s, (mask, sh) in enumerate(zip(masks, config.shifts.values())):
+        edge(1 + n_emp + s, sink, sh.required_headcount)
+        for e in iter_bits(mask):
+            edge(1 + e, 1 + n_emp + s, 1)
+    flow = 0
+    while True:
+        parent = {src: None}
+        queue = deque([src])
+        while queue and sink not in parent:
+            u = queue.popleft()
+            for v in adj[u]:
+                if v not in parent and cap[u, v] > 0:
+                    parent[v] = u
+                    queue.append(v)
+        if sink not in parent:
+            return flow
+        v = sink
+        while parent[v] is not None:
+            cap[parent[v], v] -= 1
+            cap[v, parent[v]] += 1
+            v = parent[v]
+        flow += 1
+
+
+def test_bound_matches_reference_max_flow():
+    for seed in range(12):
+        rnd = random.Random(seed)
+        config = synthetic_config(rnd.randint(3, 12), rnd.randint(4, 20), shifts_per_day=4, seed=seed, tightness=1.0)
+        config = replace(config, policies=replace(config.policies, max_shifts_per_week=rnd.randint(1, 4)))
+        assert coverage_bound(config).max_coverage == _max_flow(config), seed
+
+
+def test_bottleneck_is_a_cut_certificate():
+    config = synthetic_config(20, 60, shifts_per_day=4, seed=2, tightness=1.5)
+    bound = coverage_bound(config)
+    assert not bound.feasible and bound.short
+    # Independent capacity of the bottleneck shifts: each employee covers at most the
+    # cap (if eligible elsewhere in the region too) or the region shifts it fits.
+    masks = dict(zip(config.shifts, EligibilityIndex.for_config(config).eligible_by_shift))
+    region = set(bound.bottleneck)
+    cut = set(bound.employees)
+    capacity = 0
+    for e, eid in enumerate(config.employees):
+        degree = sum(1 for sid in region if masks[sid] >> e & 1)
+        capacity += min(config.policies.max_shifts_per_week, degree) if eid in cut else degree
+    demand = sum(config.shifts[sid].required_headcount for sid in region)
+    assert capacity == bound.bottleneck_capacity < demand == bound.bottleneck_demand
+    assert set(bound.short) <= region
+
+
+def test_solve_short_circuits_on_impossible_coverage():
+    config = synthetic_config(20, 60, shifts_per_day=4, seed=2, tightness=1.5).with_solver(max_seconds=30.0)
+    result = solve(config)
+    assert not result.ok and result.iterations == 0 and result.seconds < 5.0
+    assert result.notes[0].startswith("Coverage is impossible")
+    assert any(n.startswith("Bottleneck:") for n in result.notes)
+    assert coverage_bound(synthetic_config(60, 40, shifts_per_day=4, seed=3)).feasible
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.feasibility import coverage_bound
+from shift_scheduling_agent.flow import MinCostStaffing
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _with_preferences(config, seed):
+    rnd = random.Random(seed)
+    shift_ids = list(config.shifts)
+    prefs = {
+        eid: {
+            "prefer_skill": ["cashier"],
+            "prefer_shift": rnd.sample(shift_ids, 2),
+            "avoid_shift": rnd.sample(shift_ids, 2),
+        }
+        for eid in config.employees
+    }
+    return replace(config, preferences=replace(config.preferences, employee_shift_preferences=prefs))
+
+
+def _reference(flow):
+    # Bellman-Ford successive shortest paths from a super source: (max flow, its min cost).
+    S, E, sink = flow.n_shifts, flow.n_emp, flow.sink
+    src = sink + 1
+    arcs, out = [], [[] for _ in range(src + 1)]
+
+    def arc(u, v, cap, cost):
+        out[u].append(len(arcs))
+        arcs.append([v, cap, cost])
+        out[v].append(len(arcs))
+        arcs.append([u, 0, -cost])
+
+    for s in range(S):
+        arc(src, s, flow.required[s], 0)
+        for e in flow.eligible[s]:
+            arc(s, S + e, 1, flow.cost(s, e))
+    for e in range(E):
+        for k in range(1, flow.cap + 1):
+            arc(S + e, sink, 1, flow.fair_unit * (2 * k - 1))
+    units = total = 0
+    while True:
+        dist, via = {src: 0}, {}
+        for _ in range(src + 1):
+            changed = False
+            for u in list(dist):
+                for a in out[u]:
+                    v, cap, cost = arcs[a]
+                    if cap > 0 and dist[u] + cost < dist.get(v, float("inf")):
+                        dist[v], via[v], changed = dist[u] + cost, a, True
+            if not changed:
+                break
+        if sink not in dist:
+            return units, total
+        v = sink
+        while v != src:
+            a = via[v]
+            arcs[a][1] -= 1
+            arcs[a ^ 1][1] += 1
+            v = arcs[a ^ 1][0]
+        units, total = units + 1, total + dist[sink]
+
+
+def _cost(flow):
+    assigned = sum(flow.cost(s, e) for s in range(flow.n_shifts) for e in flow.crew[s])
+    return sum(flow.load), assigned + sum(flow.fair_unit * n * n for n in flow.load)
+
+
+def test_matches_reference_min_cost_flow():
+    for seed in range(10):
+        rnd = random.Random(seed)
+        config = synthetic_config(rnd.randint(3, 9), rnd.randint(4, 12), shifts_per_day=4, seed=seed)
+        config = _with_preferences(config, seed)
+        config = replace(config, policies=replace(config.policies, max_shifts_per_week=rnd.randint(1, 4)))
+        flow = MinCostStaffing(config).solve()
+        assert _cost(flow) == _reference(MinCostStaffing(config)), seed
+        assert sum(flow.load) == coverage_bound(config).max_coverage
+        assert sum(flow.short.values()) == coverage_bound(config).deficit
+
+
+def test_flow_construction_solves_sample_and_synthetic():
+    config = load_config("configs/sample_week.json").with_solver(construction="flow", max_iterations=50)
+    assert solve(config).ok
+
+    config = _with_preferences(synthetic_config(60, 40, shifts_per_day=4, seed=3), 0)
+    result = solve(config.with_solver(construction="flow", max_iterations=0))
+    assert result.ok
+    assert ConstraintSuite.default().validate(config, result.schedule).ok
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.domain import Schedule
+from shift_scheduling_agent.incremental import IncrementalEvaluator
+from shift_scheduling_agent.scoring import score_schedule
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+@pytest.mark.parametrize(
+    "config",
+    [load_config("configs/sample_week.json"), synthetic_config(12, 40, shifts_per_day=4, seed=2)],
+    ids=["sample_week", "synthetic"],
+)
+def test_swap_deltas_match_full_evaluation(config):
+    rnd = random.Random(3)
+    eids = list(config.employees)
+    sch = Schedule(assignments={sid: [rnd.choice(eids)] for sid in config.shifts})
+    ev = IncrementalEvaluator(config, sch)
+    suite = ConstraintSuite.default()
+
+    for _ in range(300):
+        s1, s2 = rnd.sample(range(len(config.shifts)), 2)
+        e1 = ev.state.get(s1, 0)
+        e2 = ev.state.get(s2, 0)
+        before = score_schedule(config, ev.schedule).total
+        move = ev.propose_swap(s1, e1, s2, e2)
+
+        assert move.violations == len(suite.validate(config, ev.schedule).violations)
+        after = score_schedule(config, ev.schedule).total
+        assert move.score_delta == pytest.approx(after - before)
+
+        if rnd.random() < 0.5:
+            ev.commit()
+        else:
+            ev.rollback()
+            assert ev.state.get(s1, 0) == e1
+        assert ev.violations == len(suite.validate(config, ev.schedule).violations)
+        assert ev.score == pytest.approx(score_schedule(config, ev.schedule).total)
+
+
+def test_rejects_unknown_ids():
+    config = load_config("configs/sample_week.json")
+    with pytest.raises(ValueError):
+        IncrementalEvaluator(config, Schedule(assignments={"s1": ["nobody"]}))
+
+
+def test_add_remove_reassign_deltas_match_full_evaluation():
+    config = synthetic_config(12, 40, shifts_per_day=4, seed=5)
+    rnd = random.Random(11)
+    ev = IncrementalEvaluator(config, Schedule(assignments={}))
+    suite = ConstraintSuite.default()
+    n_shifts, n_emps = len(config.shifts), len(config.employees)
+
+    for _ in range(400):
+        s = rnd.randrange(n_shifts)
+        e = rnd.randrange(n_emps)
+        n = ev.state.count(s)
+        if n and rnd.random() < 0.3:
+            move = ev.propose_remove(s, rnd.randrange(n))
+        elif n and rnd.random() < 0.5:
+            move = ev.propose_reassign(s, rnd.randrange(n), e)
+        else:
+            move = ev.propose_add(s, e)
+        assert move.violations == len(suite.validate(config, ev.schedule).violations)
+        assert len(ev.under_covered) == sum(
+            len(ev.schedule.assignments[sid]) < sh.required_headcount for sid, sh in config.shifts.items()
+        )
+        if rnd.random() < 0.6:
+            ev.commit()
+        else:
+            ev.rollback()
+        assert ev.violations == len(suite.validate(config, ev.schedule).violations)
+        assert ev.score == pytest.approx(score_schedule(config, ev.schedule).total)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.portfolio import solve_portfolio
+from shift_scheduling_agent.solver import solve
+
+
+def _config():
+    # Iteration-bound (not time-bound) so the run is reproducible.
+    return load_config("configs/sample_week.json").with_solver(max_seconds=30.0, max_iterations=40)
+
+
+def test_portfolio_is_deterministic_for_seed_set_and_worker_count():
+    a = solve_portfolio(_config(), workers=2, seeds=[1, 2, 3], share_rounds=2)
+    b = solve_portfolio(_config(), workers=2, seeds=[1, 2, 3], share_rounds=2)
+    assert a.best.ok
+    assert a.best_member == b.best_member
+    assert a.best.schedule.assignments == b.best.schedule.assignments
+    assert [(w.seed, w.strategy) for w in a.workers] == [(1, "swap"), (2, "anneal"), (3, "tabu")]
+
+
+def test_configured_strategy_leads_the_portfolio():
+    config = _config().with_solver(strategy="tabu")
+    result = solve_portfolio(config, workers=2, seeds=[1, 2, 3])
+    assert [w.strategy for w in result.workers] == ["tabu", "anneal", "tabu"]
+
+
+def test_single_worker_runs_in_process():
+    result = solve_portfolio(_config(), workers=1, seeds=[7], strategies=["swap"])
+    assert result.best.ok
+    assert len(result.workers) == 1
+
+
+def test_exact_members_carry_the_incumbent_after_the_first_round():
+    config = _config().with_solver(strategy="exact")
+    result = solve_portfolio(config, workers=1, seeds=[1], share_rounds=3)
+    single = solve(config)
+    assert result.best.schedule.assignments == single.schedule.assignments
+    assert result.workers[0].iterations == single.iterations  # no search after round one
+    assert any("exact member kept the shared incumbent" in n for n in result.best.notes)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.profiling import active, profiled
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def test_solve_without_profiler_has_no_profile():
+    config = load_config("configs/sample_week.json").with_solver(max_iterations=20)
+    assert active() is None
+    assert solve(config).profile is None
+
+
+def test_profiled_solve_records_phases_moves_and_score(tmp_path):
+    config = synthetic_config(60, 40, shifts_per_day=4, seed=2).with_solver(
+        strategy="anneal", max_iterations=50, max_seconds=2.0
+    )
+    with profiled() as prof:
+        result = solve(config)
+    assert result.profile is prof and active() is None
+
+    data = prof.to_dict()
+    for name in ("solve", "solve.construct", "solve.improve", "constraint.coverage", "constraint.min_rest_hours"):
+        assert data["phases"][name]["calls"] >= 1
+    counters = data["counters"]
+    assert counters["moves.proposed"] == result.moves > 0
+    decided = sum(n for k, n in counters.items() if k.startswith(("moves.accepted", "moves.rejected")))
+    assert decided == result.moves
+    assert len(data["series"]["score"]) == len(result.trace)
+
+    summary, trace = prof.save(tmp_path / "p.json")
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert {e["ph"] for e in events} == {"X", "C"}
+    assert json.loads(summary.read_text())["counters"] == counters
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+
+from shift_scheduling_agent.domain import (
+    Config,
+    Employee,
+    Policies,
+    Preferences,
+    Schedule,
+    Shift,
+    SolverConfig,
+    TimeWindow,
+)
+from shift_scheduling_agent.incremental import IncrementalEvaluator
+from shift_scheduling_agent.scoring import ScoreModel, score_schedule
+from shift_scheduling_agent.solver import _greedy_construct
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _config(prefs) -> Config:
+    d = lambda day, h: datetime(2026, 2, day, h)  # noqa: E731
+    window = [TimeWindow(d(9, 0), d(15, 23))]
+    return Config(
+        employees={"x": Employee("x", "X", {"cashier"}, window), "y": Employee("y", "Y", {"cashier"}, window)},
+        shifts={
+            "mon-am": Shift("mon-am", d(9, 6), d(9, 14), 1, {"cashier"}),  # Monday
+            "tue-pm": Shift("tue-pm", d(10, 14), d(10, 22), 1, {"cashier"}),
+            "sat-am": Shift("sat-am", d(14, 6), d(14, 14), 1, {"cashier"}),
+        },
+        policies=Policies(),
+        preferences=Preferences(fairness_weight=0.0, preference_weight=1.0, employee_shift_preferences=prefs),
+        solver=SolverConfig(),
+    )
+
+
+def _points(prefs, assignments) -> float:
+    return score_schedule(_config(prefs), Schedule(assignments=assignments)).components["preferences"]
+
+
+def test_preference_kinds():
+    x_everywhere = {"mon-am": ["x"], "tue-pm": ["x"], "sat-am": ["x"]}
+    assert _points({"x": {"prefer_skill": ["cashier"]}}, x_everywhere) == 3.0
+    assert _points({"x": {"prefer_shift": ["tue-pm"], "avoid_shift": ["mon-am"]}}, x_everywhere) == 0.0
+    assert _points({"x": {"prefer_time": ["morning"]}}, x_everywhere) == 2.0
+    assert _points({"x": {"avoid_time": ["13-23"]}}, x_everywhere) == -1.0
+    assert _points({"x": {"days_off": ["saturday", "2026-02-09"]}}, x_everywhere) == -2.0
+    assert _points({"y": {"days_off": ["sat"]}}, x_everywhere) == 0.0
+
+
+def test_bad_preference_is_rejected():
+    with pytest.raises(ValueError):
+        ScoreModel(_config({"x": {"prefer_time": ["brunch"]}}))
+    with pytest.raises(ValueError):
+        ScoreModel(_config({"x": {"days_off": ["someday"]}}))
+
+
+def test_evaluator_matches_full_score_with_rich_preferences():
+    rnd = random.Random(1)
+    config = synthetic_config(30, 60, shifts_per_day=4, seed=1)
+    sids = list(config.shifts)
+    prefs = {
+        eid: {
+            "prefer_skill": ["cashier"],
+            "prefer_shift": rnd.sample(sids, 4),
+            "avoid_shift": rnd.sample(sids, 4),
+            "prefer_time": ["evening"],
+            "days_off": ["sun"],
+        }
+        for eid in list(config.employees)[::2]
+    }
+    config = replace(config, preferences=replace(config.preferences, employee_shift_preferences=prefs))
+    ev = IncrementalEvaluator(config, _greedy_construct(config, random.Random(0)))
+    state = ev.state
+    for _ in range(300):
+        s1, s2 = rnd.randrange(len(sids)), rnd.randrange(len(sids))
+        if s1 == s2 or not state.count(s1) or not state.count(s2):
+            continue
+        e1, e2 = state.get(s1, 0), state.get(s2, 0)
+        if e1 != e2:
+            ev.propose_swap(s1, e1, s2, e2)
+            ev.commit()
+    assert ev.score == pytest.approx(score_schedule(config, ev.schedule).total)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from shift_scheduling_agent.server import SchedulingServer
+
+
+async def _request(port, method, path, payload=None, headers=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    extra = "".join(f"{k}: {v}\r\n" for k, v in (headers or {}).items())
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\n{extra}Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+def _run(scenario):
+    async def main():
+        server = SchedulingServer(workers=1, default_timeout=30.0)
+        srv = await server.start("127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        try:
+            return await scenario(server, port)
+        finally:
+            srv.close()
+            server.close()
+
+    return asyncio.run(main())
+
+
+def test_tools_over_http():
+    schedule = {"assignments": {"s1": ["e1"]}}
+
+    async def scenario(server, port):
+        assert await _request(port, "GET", "/health") == (200, {"ok": True})
+        body = {"config_path": "configs/sample_week.json", "schedule": schedule}
+        first = await _request(port, "POST", "/tools/schedule_validate", body)
+        second = await _request(port, "POST", "/tools/schedule_validate", body)
+        assert first == second and first[0] == 200 and "ok" in first[1]
+
+        status, out = await _request(port, "POST", "/tools/schedule_generate?timeout=20", {"config_path": "configs/sample_week.json"})
+        assert status == 200 and out["schedule"]["assignments"]
+
+        assert (await _request(port, "POST", "/tools/nope", {}))[0] == 404
+        assert (await _request(port, "POST", "/tools/schedule_score", {"bogus": 1}))[0] == 400
+        status, stats = await _request(port, "GET", "/stats")
+        assert stats["config_cache"]["hits"] >= 1 and stats["inflight"] == 0
+
+    _run(scenario)
+
+
+def test_cancel_request():
+    async def scenario(server, port):
+        gate = asyncio.Event()
+
+        def slow(**kwargs):
+            asyncio.run_coroutine_threadsafe(gate.wait(), loop).result(5)
+            return {}
+
+        loop = asyncio.get_running_loop()
+        server.registry.register("slow", slow)
+        call = asyncio.ensure_future(_request(port, "POST", "/tools/slow", {}, {"X-Request-Id": "r1"}))
+        while "r1" not in server._inflight:
+            await asyncio.sleep(0.01)
+        assert (await _request(port, "DELETE", "/requests/r1"))[0] == 200
+        status, out = await call
+        gate.set()
+        assert status == 499 and out["request_id"] == "r1"
+
+    _run(scenario)
+
+
+def test_tool_key_error_is_not_a_missing_tool():
+    async def scenario(server, port):
+        def broken(**kwargs):
+            return {}["missing"]
+
+        server.registry.register("broken", broken)
+        status, out = await _request(port, "POST", "/tools/broken", {})
+        assert status == 500 and "KeyError" in out["error"]
+        assert await _request(port, "POST", "/tools/nope", {}) == (404, {"error": "Tool not found: nope"})
+
+    _run(scenario)
+
+
+async def _raw(port, head):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head.encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    status_line, _, data = raw.partition(b"\r\n\r\n")
+    return int(status_line.split()[1]), json.loads(data)
+
+
+def test_unreadable_requests_get_a_response():
+    async def scenario(server, port):
+        post = "POST /tools/schedule_validate HTTP/1.1\r\nHost: x\r\n"
+        status, out = await _raw(port, post + "Content-Length: abc\r\n\r\n")
+        assert status == 400 and "Content-Length" in out["error"]
+        assert (await _raw(port, post + f"Content-Length: {100 * 1024 * 1024}\r\n\r\n"))[0] == 413
+
+    _run(scenario)
+
+
+def test_duplicate_request_id_is_refused():
+    async def scenario(server, port):
+        gate = asyncio.Event()
+
+        def slow(**kwargs):
+            asyncio.run_coroutine_threadsafe(gate.wait(), loop).result(5)
+            return {"done": True}
+
+        loop = asyncio.get_running_loop()
+        server.registry.register("slow", slow)
+        first = asyncio.ensure_future(_request(port, "POST", "/tools/slow", {}, {"X-Request-Id": "r1"}))
+        while "r1" not in server._inflight:
+            await asyncio.sleep(0.01)
+        assert (await _request(port, "POST", "/tools/slow", {}, {"X-Request-Id": "r1"}))[0] == 409
+        gate.set()
+        assert await first == (200, {"done": True})
+
+    _run(scenario)
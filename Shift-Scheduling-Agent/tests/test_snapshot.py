@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+import pickle
+from pathlib import Path
+
+from shift_scheduling_agent.config_io import config_to_dict, load_config, load_schedule
+from shift_scheduling_agent.scoring import score_schedule
+from shift_scheduling_agent.snapshot import save_config_snapshot, save_schedule_snapshot
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def test_config_round_trip(tmp_path):
+    # >64 skills exercises multi-word skill bitsets
+    config = synthetic_config(20, 80, skills=[f"k{i}" for i in range(70)], seed=2)
+    save_config_snapshot(config, tmp_path / "c.ssa")
+    loaded = load_config(tmp_path / "c.ssa")
+    assert config_to_dict(loaded) == config_to_dict(config)
+    assert config_to_dict(pickle.loads(pickle.dumps(loaded))) == config_to_dict(config)
+
+
+def test_solve_and_schedule_round_trip(tmp_path):
+    config = load_config("configs/sample_week.json")
+    save_config_snapshot(config, tmp_path / "week.ssa")
+    result = solve(load_config(tmp_path / "week.ssa"))
+    assert result.schedule.assignments == solve(config).schedule.assignments
+
+    save_schedule_snapshot(result.schedule, tmp_path / "s.ssa")
+    assert load_schedule(tmp_path / "s.ssa").assignments == result.schedule.assignments
+
+
+def test_offset_aware_config_round_trip(tmp_path):
+    # Scoring reads local time of day, so offsets must survive the snapshot.
+    raw = json.loads(Path("configs/sample_week.json").read_text())
+    for k, item in enumerate(raw["shifts"] + [w for e in raw["employees"] for w in e["availability"]]):
+        offset = "+05:00" if k % 3 else "-02:30"
+        item["start"] += offset
+        item["end"] += offset
+    raw["preferences"]["employee_shift_preferences"]["e1"] = {"prefer_time": ["morning"]}
+    (tmp_path / "c.json").write_text(json.dumps(raw))
+    config = load_config(tmp_path / "c.json")
+    save_config_snapshot(config, tmp_path / "c.ssa")
+    loaded = load_config(tmp_path / "c.ssa")
+    assert config_to_dict(loaded) == config_to_dict(config)
+
+    schedule = solve(config).schedule
+    assert score_schedule(loaded, schedule).total == score_schedule(config, schedule).total
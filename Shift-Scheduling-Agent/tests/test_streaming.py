@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+from shift_scheduling_agent.config_io import config_to_dict, load_config, save_config
+from shift_scheduling_agent.streaming import iter_config_items
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _same(a, b):
+    assert config_to_dict(a) == config_to_dict(b)
+
+
+def test_streaming_matches_eager_load(tmp_path):
+    path = tmp_path / "roster.json"
+    save_config(synthetic_config(30, 200, seed=3), path)
+    eager = load_config(path, stream=False)
+    streamed = load_config(path, stream=True)
+    _same(eager, streamed)
+    # shared records: one datetime per distinct timestamp, one frozenset per skill set
+    shifts = list(streamed.shifts.values())
+    same_start = [sh for sh in shifts if sh.start == shifts[0].start]
+    assert len(same_start) > 1 and all(sh.start is shifts[0].start for sh in same_start)
+    assert len({id(sh.required_skills) for sh in shifts}) == len({sh.required_skills for sh in shifts})
+
+
+def test_chunk_boundaries():
+    doc = {"meta": {"n": 12345}, "employees": [], "shifts": [{"id": f"s{i}", "n": i * 1001} for i in range(50)]}
+    text = json.dumps(doc)
+
+    class Tiny(io.StringIO):
+        def read(self, n=-1):
+            return super().read(7)
+
+    items = list(iter_config_items(Tiny(text)))
+    assert items[0] == ("meta", {"n": 12345})
+    assert [v for k, v in items if k == "shifts"] == doc["shifts"]
+
+
+def test_side_files(tmp_path):
+    config = synthetic_config(10, 40, seed=1)
+    data = config_to_dict(config)
+    with (tmp_path / "shifts.csv").open("w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["id", "start", "end", "required_headcount", "required_skills"])
+        for s in data.pop("shifts"):
+            w.writerow([s["id"], s["start"], s["end"], s["required_headcount"], ";".join(s["required_skills"])])
+    with (tmp_path / "availability.jsonl").open("w") as f:
+        for e in data["employees"]:
+            for win in e.pop("availability"):
+                f.write(json.dumps({"employee_id": e["id"], **win}) + "\n")
+    data["shifts_path"] = "shifts.csv"
+    data["availability_path"] = "availability.jsonl"
+    (tmp_path / "config.json").write_text(json.dumps(data))
+
+    _same(load_config(tmp_path / "config.json"), config)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import replace
+from datetime import datetime
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.domain import (
+    Config,
+    Employee,
+    Policies,
+    Preferences,
+    Schedule,
+    Shift,
+    SolverConfig,
+    TimeWindow,
+)
+from shift_scheduling_agent.exact import exact_search
+from shift_scheduling_agent.profiling import profiled
+from shift_scheduling_agent.solver import _improve, solve
+from shift_scheduling_agent.symmetry import EmployeeClasses
+from shift_scheduling_agent.synthetic import synthetic_config
+
+
+def _always_available(config):
+    # only skills tell employees apart; caps, rest and runs decide feasibility
+    always = [TimeWindow(datetime(2026, 1, 1), datetime(2026, 3, 1))]
+    return replace(config, employees={k: replace(e, availability=always) for k, e in config.employees.items()})
+
+
+def _redundant(seed):
+    rnd = random.Random(seed)
+    config = synthetic_config(rnd.randint(6, 12), rnd.randint(8, 20), shifts_per_day=4, skills=("a", "b"), seed=seed)
+    policies = replace(config.policies, max_shifts_per_week=rnd.randint(2, 4), max_consecutive_shifts=rnd.randint(1, 3))
+    return replace(_always_available(config), policies=policies)
+
+
+def test_classes_follow_skills_eligibility_and_preferences():
+    config = synthetic_config(120, 80, shifts_per_day=4, profiles=5, seed=1)
+    classes = EmployeeClasses.for_config(config)
+    assert len(classes) <= 5 and sum(map(len, classes.members)) == 120
+    for members in classes.members:
+        assert len({frozenset(config.employees[f"e{e}"].skills) for e in members}) == 1
+
+    prefs = {"e0": {"prefer_shift": ["s1"]}}
+    picky = replace(config, preferences=replace(config.preferences, employee_shift_preferences=prefs))
+    assert len(EmployeeClasses.for_config(picky)) == len(classes) + 1
+    assert len(EmployeeClasses.for_config(picky, preferences=False)) == len(classes)
+
+    sample = load_config("configs/sample_week.json")
+    assert len(EmployeeClasses.for_config(sample)) == len(sample.employees)
+
+
+def test_exact_search_skips_symmetric_branches_without_losing_solutions():
+    suite = ConstraintSuite.default()
+    nodes = {True: 0, False: 0}
+    proved = {True: 0, False: 0}
+    for seed in range(20):
+        config = _redundant(seed)
+        status = {}
+        for symmetry in (True, False):
+            result = exact_search(config.with_solver(symmetry=symmetry, backtracking_limit=20_000))
+            status[symmetry] = result.status
+            nodes[symmetry] += result.nodes
+            proved[symmetry] += result.status != "unknown"
+            assert (result.symmetric > 0) == symmetry
+            if result.status == "feasible":
+                assert suite.validate(config, result.schedule).ok
+        assert "unknown" in status.values() or status[True] == status[False], seed
+    assert proved[True] > proved[False] and nodes[True] < nodes[False]
+
+
+def test_swap_climber_skips_intra_class_swaps():
+    config = _always_available(synthetic_config(40, 40, shifts_per_day=4, skills=("a", "b"), profiles=4, seed=3))
+    with profiled() as prof:
+        result = solve(config.with_solver(max_iterations=200))
+    assert result.ok and prof.to_dict()["counters"]["moves.skipped.symmetric"] > 0
+
+
+def test_swap_within_a_class_can_still_repair_rest():
+    # x and y are interchangeable, but x holds "a" and "b" 8h apart; only moving "b"
+    # to y (swapping it with "c") repairs the rest rule.
+    d = lambda day, h: datetime(2026, 2, day, h)  # noqa: E731
+    window = [TimeWindow(d(9, 0), d(12, 23))]
+    config = Config(
+        employees={eid: Employee(eid, eid.upper(), {"cashier"}, window) for eid in ("x", "y")},
+        shifts={
+            "a": Shift("a", d(9, 14), d(9, 22), 1, {"cashier"}),
+            "b": Shift("b", d(10, 6), d(10, 14), 1, {"cashier"}),
+            "c": Shift("c", d(12, 9), d(12, 17), 1, {"cashier"}),
+        },
+        policies=Policies(),
+        preferences=Preferences(),
+        solver=SolverConfig(max_seconds=1.0, max_iterations=50, random_seed=0, backtracking_limit=0),
+    )
+    assert len(EmployeeClasses.for_config(config)) == 1
+    start = Schedule(assignments={"a": ["x"], "b": ["x"], "c": ["y"]})
+    for symmetry in (True, False):
+        result = _improve(config.with_solver(symmetry=symmetry), start, random.Random(0), time.time())
+        assert result.ok, symmetry
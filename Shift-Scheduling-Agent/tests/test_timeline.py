@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.constraints import ConstraintSuite
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.timeline import IntervalIndex, Timeline, TimelineRules, epoch_seconds
+
+
+def _brute(rules, shifts):
+    tl = sorted(shifts, key=rules.key.__getitem__)
+    rests = runs = streak = 0
+    for a, b in zip(tl, tl[1:]):
+        gap = rules.start[b] - rules.end[a]
+        rests += gap < rules.min_rest
+        streak = streak + 1 if gap <= rules.consecutive_gap else 0
+        runs += streak >= rules.max_run
+    return tl, rests, runs
+
+
+@pytest.mark.parametrize("max_run", [0, 1, 3])
+def test_counts_match_full_walk_under_random_edits(max_run):
+    rnd = random.Random(max_run)
+    n = 200
+    start = sorted(rnd.randrange(0, 60 * 86400, 1800) for _ in range(n))
+    end = [s + rnd.choice((6, 8, 10)) * 3600 for s in start]
+    rules = TimelineRules([s * n + i for i, s in enumerate(start)], start, end, 10 * 3600, max_run)
+
+    members = set(rnd.sample(range(n), 40))
+    tl = Timeline(rules, members)
+    for _ in range(500):
+        s = rnd.randrange(n)
+        if s in members:
+            members.discard(s)
+            tl.remove(s)
+        else:
+            members.add(s)
+            tl.insert(s)
+        assert (tl.shifts, tl.short_rests, tl.long_runs) == _brute(rules, members)
+
+
+def test_neighbour_queries_for_hypothetical_insertions():
+    hour = 3600
+    start = [0, 9 * hour, 20 * hour, 40 * hour]
+    end = [s + 8 * hour for s in start]
+    rules = TimelineRules(start, start, end, min_rest=10 * hour, max_run=2)
+    tl = Timeline(rules, [0, 3])
+    assert tl.neighbours(2) == (0, 3)
+    assert not tl.rest_ok(1)  # 1h after shift 0
+    assert tl.rest_ok(2)
+    assert tl.run_through(2) == 3  # 0 -> 2 -> 3 within 18h gaps
+    assert len(tl) == 2 and tl.long_runs == 0
+
+    with pytest.raises(ValueError):
+        tl.remove(1)
+
+
+def test_interval_index_keeps_single_window_semantics():
+    index = IntervalIndex([(8, 14), (9, 10), (12, 18)])
+    assert (index.starts, index.ends) == ([8, 12], [14, 18])
+    assert index.contains(9, 13) and index.contains(13, 18)
+    assert not index.contains(10, 16)
+    assert not index.contains(7, 9)
+
+
+def test_offset_aware_config_validates_and_solves(tmp_path):
+    raw = json.loads(Path("configs/sample_week.json").read_text())
+    for item in raw["employees"]:
+        for w in item["availability"]:
+            w["start"] += "+01:00"
+            w["end"] += "+01:00"
+    for item in raw["shifts"]:
+        item["start"] += "+01:00"
+        item["end"] += "+01:00"
+    (tmp_path / "week.json").write_text(json.dumps(raw))
+    config = load_config(tmp_path / "week.json")
+    naive = load_config("configs/sample_week.json")
+    shift = next(iter(config.shifts.values()))
+    assert epoch_seconds(shift.start) == epoch_seconds(naive.shifts[shift.id].start) - 3600
+
+    result = solve(config)
+    assert result.ok
+    assert result.schedule.assignments == solve(naive).schedule.assignments
+    assert ConstraintSuite.default().validate(config, result.schedule).ok
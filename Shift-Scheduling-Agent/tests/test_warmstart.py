@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import dataclasses
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+from shift_scheduling_agent.config_io import load_config
+from shift_scheduling_agent.domain import Schedule
+from shift_scheduling_agent.incremental import IncrementalEvaluator
+from shift_scheduling_agent.scoring import churn, score_schedule
+from shift_scheduling_agent.solver import solve
+from shift_scheduling_agent.synthetic import synthetic_config
+from shift_scheduling_agent.warmstart import started_before
+
+
+def _published():
+    config = synthetic_config(60, 120, shifts_per_day=4, available_days_ratio=0.8, seed=4).with_solver(
+        max_iterations=100, max_seconds=5.0
+    )
+    result = solve(config)
+    assert result.ok
+    return config, result.schedule
+
+
+def _call_in_sick(config, eid):
+    employees = dict(config.employees)
+    employees[eid] = dataclasses.replace(employees[eid], availability=[])
+    return dataclasses.replace(config, employees=employees)
+
+
+def test_sick_call_repairs_only_affected_shifts():
+    config, published = _published()
+    sick = next(iter(published.assignments["s0"]))
+    theirs = {sid for sid, eids in published.assignments.items() if sick in eids}
+
+    result = solve(_call_in_sick(config, sick), initial=published)
+    assert result.ok and result.iterations == 0
+    assert result.churn == churn(result.schedule, published) == 2 * len(theirs)
+    for sid, eids in published.assignments.items():
+        if sid in theirs:
+            assert sick not in result.schedule.assignments[sid]
+        else:
+            assert result.schedule.assignments[sid] == eids
+
+
+def test_frozen_shifts_are_kept_verbatim():
+    config, published = _published()
+    sick = next(iter(published.assignments["s0"]))
+    result = solve(_call_in_sick(config, sick), initial=published, frozen=["s0"])
+    assert result.schedule.assignments["s0"] == published.assignments["s0"]
+    assert not result.ok  # the frozen past still records the absence
+
+
+def test_headcount_increase_is_staffed():
+    config, published = _published()
+    shifts = dict(config.shifts)
+    shifts["s5"] = dataclasses.replace(shifts["s5"], required_headcount=shifts["s5"].required_headcount + 1)
+    result = solve(dataclasses.replace(config, shifts=shifts), initial=published)
+    assert result.ok and result.churn == 1
+
+
+def test_churn_penalty_matches_full_score():
+    config, published = _published()
+    ev = IncrementalEvaluator(config, published, baseline=published)
+    rnd = random.Random(0)
+    for _ in range(50):
+        s1, s2 = rnd.sample(range(len(config.shifts)), 2)
+        if ev.state.count(s1) and ev.state.count(s2):
+            ev.propose_swap(s1, ev.state.get(s1, 0), s2, ev.state.get(s2, 0))
+            ev.commit()
+    full = score_schedule(config, ev.schedule, baseline=published)
+    assert full.components["churn"] == -ev.churn
+    assert abs(full.total - ev.score) < 1e-9
+    assert score_schedule(config, published, baseline=Schedule(assignments={})).components["churn"] < 0
+
+
+def test_freeze_cutoff_on_offset_aware_shifts():
+    config = load_config("configs/sample_week.json")
+    tz = timezone(timedelta(hours=5))
+    shifts = {
+        sid: dataclasses.replace(sh, start=sh.start.replace(tzinfo=tz), end=sh.end.replace(tzinfo=tz))
+        for sid, sh in config.shifts.items()
+    }
+    aware = dataclasses.replace(config, shifts=shifts)
+    # a naive cutoff is local time; an aware one is an instant (03:00Z is 08:00 local)
+    assert started_before(aware, datetime(2026, 2, 10, 10)) == started_before(config, datetime(2026, 2, 10, 10))
+    assert started_before(aware, datetime(2026, 2, 10, 3, tzinfo=timezone.utc)) == ["s1", "s2"]
+
+    cmd = [sys.executable, "-m", "shift_scheduling_agent.cli", "generate", "--config", "configs/sample_week.json"]
+    proc = subprocess.run([*cmd, "--freeze-before", "2026-02-10T00:00"], capture_output=True, text=True)
+    assert proc.returncode == 2 and "--initial" in proc.stderr